@@ -7,74 +7,393 @@ Verwendung:
     python3 app.py              # Generiert aktuellen + 2 weitere Monate
     python3 app.py 2026 2       # Generiert ab Februar 2026 (3 Monate)
     python3 app.py 2026 2 6     # Generiert 6 Monate ab Februar 2026
+    python3 app.py --archiv 2020 2025      # Archiv aller Monate von Januar 2020 bis Dezember 2025
+    python3 app.py --archiv 2020-03 2021-06  # Archiv von März 2020 bis Juni 2021
+
+Optionen:
+    --no-browser                # Ergebnis nicht im Browser öffnen
+    --parallel=N                # Maximal N parallele Abrufe (Standard: 10)
+    --pro-host=N                # Maximal N parallele Abrufe pro Host (Standard: 4)
+    --no-drossel                # Pro Host fest --pro-host Abrufe statt nach Latenz und Fehlern anzupassen
+    --pool=N                    # Verbindungen pro Host im Pool (Standard: wie --pro-host)
+    --no-keepalive              # Verbindungen nicht wiederverwenden
+    --no-cache                  # HTTP- und Parse-Cache (.cache/) nicht verwenden
+    --cache-ttl=MIN             # Antworten ohne ETag/Last-Modified MIN Minuten wiederverwenden
+    --async                     # asyncio-Engine statt Threads (benötigt httpx, Standard: --parallel=200)
+    --parser=N                  # In N Prozessen parsen, parallel zu den Abrufen (Standard: 0 = im Abruf-Thread)
+    --json                      # Zusätzlich termine_JJJJ_MM.json pro Monat schreiben
+    --client                    # Termine im Browser aus dem JSON rendern (impliziert --json, braucht HTTP-Server)
+    --suche                     # Suchindex über alle Monate in suche/ pflegen, Suchfeld auf den Seiten
+                                # (impliziert --json, braucht HTTP-Server)
+    --komprimiert               # Geänderte Dateien minifizieren und .gz/.br daneben schreiben
+    --no-speicher               # Termine nicht in termine.sqlite speichern, Ausfälle nicht daraus ergänzen
+    --wiederholungen=N          # Fehlgeschlagene Abrufe N-mal im Hintergrund wiederholen (Standard: 2)
+    --versuche=N                # Einzelne Requests bei Timeouts/429/5xx bis zu N-mal versuchen (Standard: 3)
+    --zeitbudget=S              # Höchstens S Sekunden pro Stadt und Monat inkl. Wiederholungen (Standard: 45, 0 = unbegrenzt)
+    --hedge[=S]                 # Bleiben die Antwort-Header S Sekunden aus, einen zweiten, identischen
+                                # Request starten (Standard: aus; ohne S: 2)
+    --protokoll[=DATEI]         # Zeiten/Bytes pro Stadt und Monat als JSON Lines (Standard: .cache/laufprotokoll.jsonl)
+    --record=DIR                # Alle HTTP-Antworten in DIR aufzeichnen (impliziert --no-cache)
+    --replay=DIR                # Lauf offline aus DIR abspielen (impliziert --no-cache und --no-speicher;
+                                # ohne Jahr/Monat mit den Parametern der Aufzeichnung, Seiten nach DIR/ausgabe)
+    --replay-latenz             # Beim Abspielen so lange warten wie die aufgezeichneten Abrufe
+    --fenster=N                 # Archivmodus: N Monate gemeinsam abrufen und im Speicher halten (Standard: 6)
+    --ausgabe=DIR               # Seiten, Assets, feed.xml und suche/ nach DIR schreiben (Standard: neben app.py)
 """
 
 import os
+import re
+import gzip
+import json
+import hashlib
+import functools
+import tempfile
+import time
 import webbrowser
 import calendar
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from string import Template
+from typing import Callable
 from urllib.parse import quote
 
 from email.utils import format_datetime
 from zoneinfo import ZoneInfo
 
-from config import STAEDTE, SystemTyp, Kreis, get_staedte_nach_typ
-from scraper import SessionNetScraper, RatsinfoScraper, AllrisScraper, GremienInfoScraper, Termin
+try:
+    import brotli
+except ImportError:  # Optional, nur für .br-Dateien (--komprimiert)
+    brotli = None
 
+from config import (STAEDTE, SystemTyp, Kreis, MAX_PARALLEL, MAX_PRO_HOST, MAX_PARALLEL_ASYNC,
+                    PARSE_PROZESSE, WIEDERHOLUNGEN, WIEDERHOLUNG_PAUSE, REQUEST_VERSUCHE, REQUEST_PAUSE,
+                    ZEITBUDGET, HEDGE_AB, HEDGE_AB_OPTION, ARCHIV_FENSTER, get_staedte_nach_typ)
+from scraper import (SessionNetScraper, RatsinfoScraper, AllrisScraper, GremienInfoScraper,
+                     Termin, BaseScraper, AbrufPlaner, AsyncAbrufPlaner, termin_schluessel)
+from scraper.archiv import Archiv
+from scraper.base import konfiguriere_http
+from scraper.cache import HttpCache, ParseCache
+from scraper.messung import Laufprotokoll
+from scraper.politik import AbrufPolitik
+from scraper.speicher import TerminSpeicher
+from scraper.suchindex import SuchIndex
 
-def dateiname_fuer_monat(jahr: int, monat: int) -> str:
-    """Generiert den Dateinamen für einen Monat."""
-    return f"termine_{jahr}_{monat:02d}.html"
 
+# Verzeichnis für persistente Caches zwischen den Läufen
+CACHE_PFAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
 
-def hole_alle_termine(jahr: int, monat: int) -> tuple[list[Termin], list[str]]:
-    """Holt Termine von allen unterstützten Städten parallel.
+# SQLite-Speicher aller abgerufenen Termine (letzter bekannter Stand je Stadt und Monat)
+DATENBANK_PFAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'termine.sqlite')
+
+# Seitenvorlage und statische Assets; style.css/app.js werden neben die
+# generierten Seiten kopiert und von allen Monaten gemeinsam genutzt
+VORLAGEN_PFAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vorlagen')
+ASSETS = ('style.css', 'app.js', 'client.js', 'suche.js')
+# Verzeichnis des Suchindex (--suche) neben den Seiten
+SUCHE_VERZEICHNIS = 'suche'
+
+# Basis-URL des KI-Analyse-Tools (später: https://ki-ms.reporter.ruhr)
+KI_URL = "https://claimed-affair-contributing-partnerships.trycloudflare.com/?url="
+
+
+def dateiname_fuer_monat(jahr: int, monat: int, endung: str = 'html') -> str:
+    """Generiert den Dateinamen für einen Monat (Seite oder JSON-Export)."""
+    return f"termine_{jahr}_{monat:02d}.{endung}"
+
+
+MONATSSEITE_MUSTER = re.compile(r'termine_(\d{4})_(\d{2})\.html')
 
-    Returns:
-        Tuple aus (Termine-Liste, Liste fehlgeschlagener Städtenamen)
-    """
-    termine = []
-    fehler_staedte = []
-    scraper_aufgaben = []
+
+def vorhandene_monate(verzeichnis: str) -> set[tuple[int, int]]:
+    """Gibt die Monate zurück, deren Seite bereits in verzeichnis liegt."""
+    try:
+        namen = os.listdir(verzeichnis)
+    except OSError:
+        return set()
+    return {(int(m.group(1)), int(m.group(2))) for m in map(MONATSSEITE_MUSTER.fullmatch, namen) if m}
+
+
+def erstelle_scraper() -> list[BaseScraper]:
+    """Erstellt je einen Scraper für alle unterstützten Städte."""
+    scraper_liste = []
 
     # SessionNet-Städte
     for stadt in get_staedte_nach_typ(SystemTyp.SESSIONNET):
-        scraper_aufgaben.append((SessionNetScraper(stadt.name, stadt.url), jahr, monat))
+        scraper_liste.append(SessionNetScraper(stadt.name, stadt.url))
 
     # Ratsinfomanagement-Städte
     for stadt in get_staedte_nach_typ(SystemTyp.RATSINFO):
-        scraper_aufgaben.append((RatsinfoScraper(stadt.name, stadt.url), jahr, monat))
+        scraper_liste.append(RatsinfoScraper(stadt.name, stadt.url))
 
     # ALLRIS-Städte
     for stadt in get_staedte_nach_typ(SystemTyp.ALLRIS):
-        scraper_aufgaben.append((AllrisScraper(stadt.name, stadt.url), jahr, monat))
+        scraper_liste.append(AllrisScraper(stadt.name, stadt.url))
 
     # GremienInfo-Städte (more!rubin auf gremien.info)
     for stadt in get_staedte_nach_typ(SystemTyp.GREMIENINFO):
-        scraper_aufgaben.append((GremienInfoScraper(stadt.name, stadt.url), jahr, monat))
+        scraper_liste.append(GremienInfoScraper(stadt.name, stadt.url))
 
-    # Parallel abrufen
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = {
-            executor.submit(scraper.hole_termine, j, m): scraper
-            for scraper, j, m in scraper_aufgaben
-        }
+    return scraper_liste
 
-        for future in as_completed(futures):
-            scraper = futures[future]
-            try:
-                result = future.result()
-                termine.extend(result)
-                if result:
-                    print(f"  {scraper.stadt_name}: {len(result)} Termine")
-            except Exception as e:
-                print(f"  Fehler bei {scraper.stadt_name}: {e}")
-                fehler_staedte.append(scraper.stadt_name)
 
-    # Nach Datum sortieren
-    termine.sort()
-    return termine, fehler_staedte
+def hole_archiv(scraper_liste: list[BaseScraper], monate: list[tuple[int, int]],
+                erstelle_planer: Callable[[list[BaseScraper], list[tuple[int, int]]], AbrufPlaner],
+                bei_monat_fertig: Callable[[int, int, list[Termin], list[str]], None],
+                fenster: int = ARCHIV_FENSTER) -> list[str]:
+    """Holt einen langen Zeitraum (--archiv) mit begrenztem Speicherbedarf.
+
+    Alle Scraper laufen in Fenstern von `fenster` Monaten mit je einem
+    eigenen Planer; jeder Monat wird an bei_monat_fertig gemeldet und ist
+    mit dem Ende seines Fensters freigegeben, sodass der Speicher mit dem
+    Fenster wächst, nicht mit dem Zeitraum. Scraper mit Bereichsabruf
+    (iCal-Feeds) laden ihren Feed trotzdem nur einmal: Antworten dieses
+    Laufs gelten im HTTP-Cache als frisch (ohne Cache in einem temporären),
+    jedes weitere Fenster liest nur seine Monate aus der Cache-Datei.
+
+    Returns:
+        Liste der Städte, die auch nach allen Wiederholungen fehlen
+    """
+    vorher = BaseScraper.http_cache
+    alle_fehler = []
+    with tempfile.TemporaryDirectory(prefix='archiv-') as verzeichnis:
+        http_cache = BaseScraper.http_cache = vorher or HttpCache(verzeichnis)
+        http_cache.frisch_ab = time.time()
+        try:
+            for start in range(0, len(monate), max(1, fenster)):
+                teil = monate[start:start + max(1, fenster)]
+                alle_fehler += erstelle_planer(scraper_liste, teil).ausfuehren(bei_monat_fertig)
+        finally:
+            http_cache.frisch_ab = None
+            BaseScraper.http_cache = vorher
+    return sorted(set(alle_fehler))
+
+
+def ergaenze_aus_speicher(speicher: TerminSpeicher, jahr: int, monat: int, termine: list[Termin],
+                          staedte: list[str], fehler_staedte: list[str]
+                          ) -> tuple[list[Termin], dict[str, datetime]]:
+    """Speichert die erfolgreichen Abrufe eines Monats und ergänzt ausgefallene Städte.
+
+    Für jede Stadt, deren Abruf fehlgeschlagen ist, werden die Termine aus
+    ihrem letzten erfolgreichen Abruf dieses Monats übernommen, statt die
+    Stadt stillschweigend wegzulassen (stale-while-revalidate).
+
+    Returns:
+        Tuple aus (sortierte Termine inklusive des letzten Stands ausgefallener
+        Städte, Dict von Stadt auf den Zeitpunkt dieses Stands)
+    """
+    termine_pro_stadt = {stadt: [] for stadt in staedte if stadt not in fehler_staedte}
+    for t in termine:
+        termine_pro_stadt.setdefault(t.stadt, []).append(t)
+    speicher.speichere_monat(jahr, monat, termine_pro_stadt)
+
+    ergaenzt = list(termine)
+    veraltet = {}
+    for stadt in fehler_staedte:
+        stand = speicher.letzter_stand(stadt, jahr, monat)
+        if stand is None:
+            continue
+        veraltet[stadt] = speicher.letzter_abruf(stadt, jahr, monat)
+        print(f"  {stadt}: {len(stand)} Termine aus dem Speicher (Stand {veraltet[stadt]:%d.%m.%Y %H:%M})")
+        ergaenzt.extend(stand)
+    ergaenzt.sort(key=termin_schluessel)
+    return ergaenzt, veraltet
+
+
+# Erhöhen, wenn sich Aufbau oder Inhalt der generierten Seiten ändern, damit
+# alle Monate beim nächsten Lauf neu geschrieben werden
+LAYOUT_VERSION = 4
+
+FINGERPRINT_MUSTER = re.compile(r'name="termine-fingerprint" content="([0-9a-f]+)"'
+                                r'|<!-- termine-fingerprint: ([0-9a-f]+) -->'
+                                r'|^\{"fingerprint":"([0-9a-f]+)"')
+
+
+def berechne_fingerprint(art: str, termine: list[Termin], jahr: int, monat: int,
+                         verfuegbare_monate: list[tuple[int, int]] | None = None,
+                         veraltet: dict[str, datetime] | None = None) -> str:
+    """Berechnet einen Fingerprint über alle Eingaben einer generierten Datei.
+
+    Berücksichtigt die sortierten Termine, die Navigation (ob Vor-/Folgemonat
+    verfügbar sind) und den Stand veralteter Städte, aber nicht den
+    Generierungszeitpunkt. Solange eine Stadt ausfällt, bleibt ihr Stand und
+    damit die Datei unverändert.
+    """
+    h = hashlib.sha256()
+    h.update(f"{art}|{LAYOUT_VERSION}|{jahr}-{monat}\n".encode('utf-8'))
+    if art.startswith('html'):
+        # Die Seiten verlinken die Assets mit Versions-Parameter
+        h.update(f"assets|{asset_version()}\n".encode('utf-8'))
+    if verfuegbare_monate is not None:
+        prev_key = (jahr, monat - 1) if monat > 1 else (jahr - 1, 12)
+        next_key = (jahr, monat + 1) if monat < 12 else (jahr + 1, 1)
+        h.update(f"nav|{prev_key in verfuegbare_monate}|{next_key in verfuegbare_monate}\n".encode('utf-8'))
+    for stadt, stand in sorted((veraltet or {}).items()):
+        h.update(f"veraltet|{stadt}|{stand.isoformat()}\n".encode('utf-8'))
+    zeilen = sorted((t.datum.isoformat(), t.uhrzeit, t.stadt, t.gremium, t.ort, t.link) for t in termine)
+    for zeile in zeilen:
+        h.update('\x1f'.join(zeile).encode('utf-8'))
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+def lies_fingerprint(pfad: str) -> str | None:
+    """Liest den Fingerprint aus einer zuvor generierten Datei (None, falls keiner vorhanden)."""
+    try:
+        with open(pfad, encoding='utf-8') as f:
+            kopf = f.read(4096)
+    except OSError:
+        return None
+    match = FINGERPRINT_MUSTER.search(kopf)
+    if not match:
+        return None
+    return next(g for g in match.groups() if g)
+
+
+def schreibe_wenn_geaendert(pfad: str, fingerprint: str, generiere) -> bool:
+    """Schreibt die von generiere() gelieferten Textstücke nach pfad, außer die
+    Datei hat bereits diesen Fingerprint.
+
+    Die Stücke werden direkt in eine temporäre Datei gestreamt, die erst am
+    Ende die alte Datei ersetzt.
+
+    Returns:
+        True, wenn die Datei geschrieben wurde
+    """
+    if lies_fingerprint(pfad) == fingerprint:
+        return False
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(pfad) or '.', prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(generiere())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, pfad)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return True
+
+
+@functools.cache
+def lade_vorlage(name: str) -> str:
+    """Liest eine Datei aus dem Vorlagen-Verzeichnis (einmal pro Lauf)."""
+    with open(os.path.join(VORLAGEN_PFAD, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.cache
+def seiten_vorlage() -> tuple[Template, Template]:
+    """Die Seitenvorlage, geteilt an der Stelle der Terminliste ($termine)."""
+    kopf, fuss = lade_vorlage('seite.html').split('$termine')
+    return Template(kopf), Template(fuss)
+
+
+@functools.cache
+def asset_version() -> str:
+    """Kurzer Hash über alle Assets (Cache-Busting der Links und Teil des Fingerprints)."""
+    h = hashlib.sha256()
+    for name in ASSETS:
+        h.update(lade_vorlage(name).encode('utf-8'))
+    return h.hexdigest()[:10]
+
+
+def schreibe_assets(ziel_pfad: str) -> list[str]:
+    """Kopiert die Assets (style.css, app.js, client.js, suche.js) ins Ausgabeverzeichnis, falls sie sich geändert haben.
+
+    Returns:
+        Liste der geschriebenen Dateien
+    """
+    geschrieben = []
+    for name in ASSETS:
+        pfad = os.path.join(ziel_pfad, name)
+        inhalt = lade_vorlage(name)
+        try:
+            with open(pfad, encoding='utf-8') as f:
+                if f.read() == inhalt:
+                    continue
+        except OSError:
+            pass
+        with open(pfad, 'w', encoding='utf-8') as f:
+            f.write(inhalt)
+        geschrieben.append(pfad)
+    return geschrieben
+
+
+# Leerraum mit Zeilenumbruch (Einrückung, Leerzeilen, Leerzeichen am Zeilenende)
+MINIFY_MUSTER = re.compile(r'[ \t]*\n\s*')
+MINIFY_ENDUNGEN = ('.html', '.xml')
+
+
+def minifiziere(text: str) -> str:
+    """Entfernt Einrückung, Leerzeilen und Leerzeichen am Zeilenende aus HTML/XML.
+
+    Jede solche Folge wird zu genau einem Zeilenumbruch. HTML behandelt sie
+    ohnehin wie ein Leerzeichen, die Darstellung ändert sich also nicht;
+    Fingerprint-Meta-Tag und -Kommentar bleiben erhalten.
+    """
+    return MINIFY_MUSTER.sub('\n', text)
+
+
+def komprimiere_ausgabe(pfade: list[str], geaendert: set[str]) -> dict[str, int]:
+    """Minifiziert geänderte HTML/XML-Dateien und schreibt .gz/.br-Dateien daneben.
+
+    Bearbeitet werden nur Dateien, die in diesem Lauf geschrieben wurden
+    oder neuer als ihre komprimierten Geschwister sind. Ohne das optionale
+    brotli-Paket entfallen die .br-Dateien.
+
+    Returns:
+        Anzahl der Dateien und Byte-Summen: original, minifiziert, gzip, brotli
+    """
+    endungen = ('.gz', '.br') if brotli else ('.gz',)
+    statistik = dict.fromkeys(('dateien', 'original', 'minifiziert', 'gzip', 'brotli'), 0)
+
+    for pfad in pfade:
+        if pfad not in geaendert:
+            try:
+                stand = os.path.getmtime(pfad)
+                if all(os.path.getmtime(pfad + e) >= stand for e in endungen):
+                    continue
+            except OSError:
+                pass  # Datei oder Geschwister fehlen
+
+        try:
+            with open(pfad, 'rb') as f:
+                daten = f.read()
+        except OSError:
+            continue
+        statistik['dateien'] += 1
+        statistik['original'] += len(daten)
+
+        if pfad in geaendert and pfad.endswith(MINIFY_ENDUNGEN):
+            minifiziert = minifiziere(daten.decode('utf-8')).encode('utf-8')
+            if minifiziert != daten:
+                daten = minifiziert
+                with open(pfad, 'wb') as f:
+                    f.write(daten)
+        statistik['minifiziert'] += len(daten)
+
+        # mtime=0: gleiche Eingabe ergibt byte-gleiche .gz-Dateien
+        gz_daten = gzip.compress(daten, compresslevel=9, mtime=0)
+        with open(pfad + '.gz', 'wb') as f:
+            f.write(gz_daten)
+        statistik['gzip'] += len(gz_daten)
+        if brotli:
+            br_daten = brotli.compress(daten, quality=11)
+            with open(pfad + '.br', 'wb') as f:
+                f.write(br_daten)
+            statistik['brotli'] += len(br_daten)
+
+    return statistik
+
+
+def formatiere_bytes(anzahl: int) -> str:
+    """Formatiert eine Byte-Anzahl lesbar (B, KB, MB)."""
+    if anzahl < 1024:
+        return f"{anzahl} B"
+    if anzahl < 1024 * 1024:
+        return f"{anzahl / 1024:.1f} KB"
+    return f"{anzahl / (1024 * 1024):.2f} MB"
 
 
 def generiere_kalender(jahr: int, monat: int, tage_mit_terminen: set[int]) -> str:
@@ -82,38 +401,106 @@ def generiere_kalender(jahr: int, monat: int, tage_mit_terminen: set[int]) -> st
     cal = calendar.Calendar(firstweekday=0)  # Montag = 0
     wochen = cal.monthdayscalendar(jahr, monat)
 
-    html = '<table class="kalender" id="kalender">\n'
-    html += '<tr>'
-    for tag_name in ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']:
-        html += f'<th>{tag_name}</th>'
-    html += '</tr>\n'
+    teile = ['<table class="kalender" id="kalender">\n<tr>']
+    teile.extend(f'<th>{tag_name}</th>' for tag_name in ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So'])
+    teile.append('</tr>\n')
 
     for woche in wochen:
-        html += '<tr>'
+        teile.append('<tr>')
         for tag in woche:
             if tag == 0:
-                html += '<td></td>'
+                teile.append('<td></td>')
             elif tag in tage_mit_terminen:
                 datum_key = f"{jahr}-{monat:02d}-{tag:02d}"
-                html += f'<td><a href="#datum-{datum_key}" class="kal-link">{tag}</a></td>'
+                teile.append(f'<td><a href="#datum-{datum_key}" class="kal-link">{tag}</a></td>')
             else:
-                html += f'<td class="kal-leer">{tag}</td>'
-        html += '</tr>\n'
+                teile.append(f'<td class="kal-leer">{tag}</td>')
+        teile.append('</tr>\n')
 
-    html += '</table>'
-    return html
+    teile.append('</table>')
+    return ''.join(teile)
 
 
-def generiere_html(termine: list[Termin], jahr: int, monat: int,
-                   verfuegbare_monate: list[tuple[int, int]]) -> str:
-    """Generiert das HTML-Dashboard.
+def rendere_termine(termine_nach_datum: dict[str, list[Termin]]):
+    """Liefert das HTML der Terminliste Stück für Stück, eine Datumsgruppe pro Stück."""
+    for datum_key in sorted(termine_nach_datum.keys()):
+        tage_termine = termine_nach_datum[datum_key]
+        teile = [
+            f'<div class="datum-gruppe" id="datum-{datum_key}">\n'
+            f'<div class="datum-header">{tage_termine[0].datum_formatiert()}</div>\n'
+            '<div class="termine-liste">\n'
+        ]
+
+        for t in sorted(tage_termine, key=lambda x: x.uhrzeit):
+            abgesagt_class = ' abgesagt' if '[ABGESAGT]' in t.gremium else ''
+            gremium_clean = t.gremium.replace('[ABGESAGT]', '').strip()
+
+            # KI-Analyse-Button nur bei Terminen mit Link
+            ki_button = ''
+            if t.link and t.link.strip():
+                ki_url = f"{KI_URL}{quote(t.link)}"
+                ki_button = f' <a href="{ki_url}" class="ki-btn" title="Dokumente mit KI analysieren" target="_blank">🔍</a>'
+            ort_html = f'<div class="termin-ort">{t.ort}</div>' if t.ort else ''
+
+            # Eine Zeile pro Termin: Einrückung würde bei tausenden Terminen
+            # einen Großteil der Seite ausmachen
+            teile.append(
+                f'<div class="termin{abgesagt_class}" data-stadt="{t.stadt}">'
+                f'<div class="termin-zeit">{t.uhrzeit}</div><div class="termin-info">'
+                f'<div class="termin-gremium"><a href="{t.link}" target="_blank">{gremium_clean}</a>{ki_button}</div>'
+                f'<div class="termin-stadt">{t.stadt}</div>{ort_html}</div></div>\n'
+            )
+
+        teile.append('</div>\n<div class="zurueck-link"><a href="#kalender">↑ Kalender</a></div>\n</div>\n')
+        yield ''.join(teile)
+
+
+def generiere_suchfeld(suche: bool) -> str:
+    """Suchfeld für die Suche über alle Monate (suche.js), nur mit Suchindex."""
+    if not suche:
+        return ''
+    return (f'<div class="suche-container" data-index="{SUCHE_VERZEICHNIS}/">\n'
+            '    <input type="search" id="suche-eingabe" class="suche-eingabe" autocomplete="off"'
+            ' placeholder="In allen Monaten suchen: Gremium, Kommune, Ort …">\n'
+            '    <div id="suche-ergebnisse" class="suche-ergebnisse"></div>\n'
+            '</div>')
+
+
+def generiere_veraltet_hinweis(veraltet: dict[str, datetime]) -> str:
+    """Hinweis auf Städte, deren Termine aus dem letzten erfolgreichen Abruf stammen."""
+    if not veraltet:
+        return ''
+    staedte = ', '.join(f"{stadt} (Stand {stand:%d.%m.%Y %H:%M})" for stadt, stand in sorted(veraltet.items()))
+    return f'<div class="veraltet-hinweis">Derzeit nicht erreichbar, letzter bekannter Stand: {staedte}</div>'
+
+
+def seiten_art(client: bool, suche: bool) -> str:
+    """Art einer Monatsseite für berechne_fingerprint (Client-Rendering, Suchfeld)."""
+    return ('html-client' if client else 'html') + ('-suche' if suche else '')
+
+
+def rendere_html(termine: list[Termin], jahr: int, monat: int,
+                 verfuegbare_monate: list[tuple[int, int]], client: bool = False,
+                 veraltet: dict[str, datetime] | None = None, suche: bool = False):
+    """Liefert das HTML-Dashboard Stück für Stück (zum Streamen in eine Datei).
+
+    Der Seitenrahmen kommt aus vorlagen/seite.html; CSS und JavaScript sind
+    als style.css/app.js ausgelagert und werden nur verlinkt.
 
     Args:
         termine: Liste der Termine
         jahr: Aktuelles Jahr
         monat: Aktueller Monat
         verfuegbare_monate: Liste von (jahr, monat) Tupeln für die Navigation
+        client: Terminliste nicht einbetten, sondern im Browser aus
+            termine_JJJJ_MM.json rendern (client.js)
+        veraltet: Städte, deren Termine aus dem Speicher stammen, mit dem
+            Zeitpunkt ihres letzten erfolgreichen Abrufs
+        suche: Suchfeld für die Suche über alle Monate einbinden (suche.js,
+            Index in suche/)
     """
+    fingerprint = berechne_fingerprint(seiten_art(client, suche), termine, jahr, monat,
+                                       verfuegbare_monate, veraltet)
     monatsnamen = [
         '', 'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
         'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'
@@ -138,56 +525,11 @@ def generiere_html(termine: list[Termin], jahr: int, monat: int,
         if kreis:
             kreis_staedte[kreis].append(stadt)
 
-    # Termine-HTML generieren
-    termine_html = ""
-    for datum_key in sorted(termine_nach_datum.keys()):
-        tage_termine = termine_nach_datum[datum_key]
-        datum_obj = datetime.strptime(datum_key, '%Y-%m-%d')
-        datum_formatiert = tage_termine[0].datum_formatiert()
-
-        termine_html += f'''
-        <div class="datum-gruppe" id="datum-{datum_key}">
-            <div class="datum-header">{datum_formatiert}</div>
-            <div class="termine-liste">
-        '''
-
-        for t in sorted(tage_termine, key=lambda x: x.uhrzeit):
-            abgesagt_class = ' abgesagt' if '[ABGESAGT]' in t.gremium else ''
-            gremium_clean = t.gremium.replace('[ABGESAGT]', '').strip()
-
-            # KI-Analyse-Button nur bei Terminen mit Link
-            ki_button = ''
-            if t.link and t.link.strip():
-                # URL für KI-Tool (später: https://ki-ms.reporter.ruhr)
-                ki_url = f"https://claimed-affair-contributing-partnerships.trycloudflare.com/?url={quote(t.link)}"
-                ki_button = f'<a href="{ki_url}" class="ki-btn" title="Dokumente mit KI analysieren" target="_blank">🔍</a>'
-
-            termine_html += f'''
-                <div class="termin{abgesagt_class}" data-stadt="{t.stadt}">
-                    <div class="termin-zeit">{t.uhrzeit}</div>
-                    <div class="termin-info">
-                        <div class="termin-gremium">
-                            <a href="{t.link}" target="_blank">{gremium_clean}</a>
-                            {ki_button}
-                        </div>
-                        <div class="termin-stadt">{t.stadt}</div>
-                        {f'<div class="termin-ort">{t.ort}</div>' if t.ort else ''}
-                    </div>
-                </div>
-            '''
-
-        termine_html += '''
-            </div>
-            <div class="zurueck-link"><a href="#kalender">↑ Kalender</a></div>
-        </div>
-        '''
-
     # Filter-Optionen pro Kreis generieren
     def generiere_dropdown(label: str, staedte: list[str], dropdown_id: str) -> str:
         """Generiert ein einzelnes Filter-Dropdown."""
-        options = f'<option value="">{label}</option>'
-        for stadt in sorted(staedte):
-            options += f'<option value="{stadt}">{stadt}</option>'
+        options = f'<option value="">{label}</option>' + ''.join(
+            f'<option value="{stadt}">{stadt}</option>' for stadt in sorted(staedte))
         return f'''
             <div class="filter-group">
                 <label class="filter-label">{label}</label>
@@ -197,13 +539,9 @@ def generiere_html(termine: list[Termin], jahr: int, monat: int,
             </div>'''
 
     # Dropdowns pro Kreis generieren
-    filter_dropdowns = ""
-    for kreis in Kreis:
-        staedte_im_kreis = kreis_staedte.get(kreis, [])
-        if staedte_im_kreis:
-            label = kreis.value
-            dropdown_id = f"filter-{kreis.name.lower()}"
-            filter_dropdowns += generiere_dropdown(label, staedte_im_kreis, dropdown_id)
+    filter_dropdowns = ''.join(
+        generiere_dropdown(kreis.value, kreis_staedte[kreis], f"filter-{kreis.name.lower()}")
+        for kreis in Kreis if kreis_staedte.get(kreis))
 
     # Monatsnavigation
     prev_monat = monat - 1 if monat > 1 else 12
@@ -215,507 +553,100 @@ def generiere_html(termine: list[Termin], jahr: int, monat: int,
     prev_verfuegbar = (prev_jahr, prev_monat) in verfuegbare_monate
     next_verfuegbar = (next_jahr, next_monat) in verfuegbare_monate
 
-    prev_link = dateiname_fuer_monat(prev_jahr, prev_monat) if prev_verfuegbar else "#"
-    next_link = dateiname_fuer_monat(next_jahr, next_monat) if next_verfuegbar else "#"
-
-    prev_class = "" if prev_verfuegbar else " disabled"
-    next_class = "" if next_verfuegbar else " disabled"
-
     # Kalenderblatt generieren
     tage_mit_terminen = set(int(k.split('-')[2]) for k in termine_nach_datum.keys())
-    kalender_html = generiere_kalender(jahr, monat, tage_mit_terminen)
-
-    html = f'''<!DOCTYPE html>
-<html lang="de">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Ratstermine {monatsnamen[monat]} {jahr}</title>
-    <link rel="alternate" type="application/rss+xml" title="Ratstermine Münsterland" href="feed.xml">
-    <style>
-        :root {{
-            --bg-color: #f5f5f7;
-            --card-bg: #ffffff;
-            --text-color: #1d1d1f;
-            --text-secondary: #86868b;
-            --border-color: #d2d2d7;
-            --accent-color: #0066cc;
-            --hover-color: #f0f0f5;
-        }}
-
-        @media (prefers-color-scheme: dark) {{
-            :root {{
-                --bg-color: #1d1d1f;
-                --card-bg: #2d2d2f;
-                --text-color: #f5f5f7;
-                --text-secondary: #a1a1a6;
-                --border-color: #424245;
-                --accent-color: #2997ff;
-                --hover-color: #3a3a3c;
-            }}
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: var(--bg-color);
-            color: var(--text-color);
-            line-height: 1.5;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 900px;
-            margin: 0 auto;
-        }}
-
-        header {{
-            text-align: center;
-            margin-bottom: 30px;
-        }}
-
-        h1 {{
-            font-size: 2rem;
-            font-weight: 600;
-            margin-bottom: 10px;
-        }}
-
-        .nav {{
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            gap: 20px;
-            margin-bottom: 20px;
-        }}
-
-        .nav-btn {{
-            background: var(--card-bg);
-            border: 1px solid var(--border-color);
-            color: var(--accent-color);
-            padding: 8px 16px;
-            border-radius: 8px;
-            cursor: pointer;
-            font-size: 14px;
-            text-decoration: none;
-        }}
-
-        .nav-btn:hover {{
-            background: var(--hover-color);
-        }}
-
-        .nav-btn.disabled {{
-            opacity: 0.3;
-            pointer-events: none;
-            cursor: default;
-        }}
-
-        .monat-titel {{
-            font-size: 1.2rem;
-            font-weight: 500;
-        }}
-
-        .filter-container {{
-            display: flex;
-            flex-direction: column;
-            gap: 12px;
-            margin-bottom: 20px;
-            padding: 15px;
-            background: var(--card-bg);
-            border-radius: 10px;
-            border: 1px solid var(--border-color);
-        }}
-
-        .filter-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 5px;
-        }}
-
-        .filter-header h3 {{
-            font-size: 14px;
-            font-weight: 600;
-            color: var(--text-color);
-        }}
-
-        .filter-reset {{
-            background: none;
-            border: none;
-            color: var(--accent-color);
-            font-size: 13px;
-            cursor: pointer;
-            padding: 4px 8px;
-        }}
-
-        .filter-reset:hover {{
-            text-decoration: underline;
-        }}
-
-        .filter-dropdowns {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-        }}
-
-        .filter-group {{
-            display: flex;
-            flex-direction: column;
-            gap: 4px;
-            flex: 1;
-            min-width: 140px;
-        }}
-
-        .filter-label {{
-            font-size: 11px;
-            font-weight: 500;
-            color: var(--text-secondary);
-        }}
-
-        .kreis-filter {{
-            width: 100%;
-            padding: 6px 8px;
-            border: 1px solid var(--border-color);
-            border-radius: 6px;
-            background: var(--bg-color);
-            color: var(--text-color);
-            font-size: 13px;
-        }}
-
-        .filter-stats {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding-top: 10px;
-            border-top: 1px solid var(--border-color);
-            margin-top: 5px;
-        }}
-
-        .stats {{
-            font-size: 13px;
-            color: var(--text-secondary);
-        }}
-
-        .active-filters {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 6px;
-        }}
-
-        .filter-tag {{
-            display: inline-flex;
-            align-items: center;
-            gap: 4px;
-            padding: 3px 8px;
-            background: var(--accent-color);
-            color: white;
-            border-radius: 12px;
-            font-size: 12px;
-        }}
-
-        .filter-tag button {{
-            background: none;
-            border: none;
-            color: white;
-            cursor: pointer;
-            font-size: 14px;
-            line-height: 1;
-            padding: 0;
-            margin-left: 2px;
-        }}
-
-        .datum-gruppe {{
-            margin-bottom: 20px;
-        }}
-
-        .datum-header {{
-            font-weight: 600;
-            font-size: 1rem;
-            padding: 10px 15px;
-            background: var(--accent-color);
-            color: white;
-            border-radius: 10px 10px 0 0;
-        }}
-
-        .termine-liste {{
-            background: var(--card-bg);
-            border: 1px solid var(--border-color);
-            border-top: none;
-            border-radius: 0 0 10px 10px;
-        }}
-
-        .termin {{
-            display: flex;
-            padding: 12px 15px;
-            border-bottom: 1px solid var(--border-color);
-            transition: background 0.2s;
-        }}
-
-        .termin:last-child {{
-            border-bottom: none;
-        }}
-
-        .termin:hover {{
-            background: var(--hover-color);
-        }}
-
-        .termin.abgesagt {{
-            opacity: 0.5;
-            text-decoration: line-through;
-        }}
-
-        .termin-zeit {{
-            width: 80px;
-            font-weight: 500;
-            color: var(--accent-color);
-            flex-shrink: 0;
-        }}
-
-        .termin-info {{
-            flex: 1;
-        }}
-
-        .termin-gremium {{
-            font-weight: 500;
-            margin-bottom: 2px;
-        }}
-
-        .termin-gremium a {{
-            color: var(--text-color);
-            text-decoration: none;
-        }}
-
-        .termin-gremium a:hover {{
-            color: var(--accent-color);
-            text-decoration: underline;
-        }}
-
-        .ki-btn {{
-            margin-left: 8px;
-            text-decoration: none;
-            font-size: 0.9em;
-            opacity: 0.6;
-            transition: opacity 0.2s, transform 0.2s;
-            display: inline-block;
-        }}
-
-        .ki-btn:hover {{
-            opacity: 1;
-            transform: scale(1.2);
-            text-decoration: none;
-        }}
-
-        .termin-stadt {{
-            font-size: 13px;
-            color: var(--text-secondary);
-        }}
-
-        .termin-ort {{
-            font-size: 12px;
-            color: var(--text-secondary);
-            font-style: italic;
-        }}
-
-        .kalender {{
-            width: 100%;
-            max-width: 400px;
-            margin: 0 auto 25px;
-            border-collapse: collapse;
-            text-align: center;
-        }}
-
-        .kalender th {{
-            padding: 6px;
-            font-size: 13px;
-            color: var(--text-secondary);
-            font-weight: 500;
-        }}
-
-        .kalender td {{
-            padding: 6px;
-            font-size: 14px;
-            border-radius: 6px;
-        }}
-
-        .kalender .kal-leer {{
-            color: var(--text-secondary);
-            opacity: 0.5;
-        }}
-
-        .kalender .kal-link {{
-            display: inline-block;
-            width: 32px;
-            height: 32px;
-            line-height: 32px;
-            border-radius: 50%;
-            background: var(--accent-color);
-            color: white;
-            text-decoration: none;
-            font-weight: 600;
-        }}
-
-        .kalender .kal-link:hover {{
-            opacity: 0.8;
-        }}
-
-        .zurueck-link {{
-            text-align: right;
-            padding: 6px 15px;
-            font-size: 13px;
-        }}
-
-        .zurueck-link a {{
-            color: var(--accent-color);
-            text-decoration: none;
-            font-weight: 500;
-        }}
-
-        .zurueck-link a:hover {{
-            color: var(--accent-color);
-        }}
-
-        .keine-termine {{
-            text-align: center;
-            padding: 40px;
-            color: var(--text-secondary);
-        }}
-
-        .hidden {{
-            display: none !important;
-        }}
-
-        footer {{
-            text-align: center;
-            margin-top: 30px;
-            padding: 20px;
-            color: var(--text-secondary);
-            font-size: 12px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>Ratstermine Münsterland</h1>
-            <div class="nav">
-                <a href="{prev_link}" class="nav-btn{prev_class}">&larr; {monatsnamen[prev_monat]}</a>
-                <span class="monat-titel">{monatsnamen[monat]} {jahr}</span>
-                <a href="{next_link}" class="nav-btn{next_class}">{monatsnamen[next_monat]} &rarr;</a>
-            </div>
-        </header>
-
-        {kalender_html}
-
-        <div class="filter-container">
-            <div class="filter-header">
-                <h3>Filter nach Kommune</h3>
-                <button class="filter-reset" onclick="resetFilter()">Alle zurücksetzen</button>
-            </div>
-            <div class="filter-dropdowns">
-                {filter_dropdowns}
-            </div>
-            <div class="filter-stats">
-                <div class="active-filters" id="active-filters"></div>
-                <div class="stats">
-                    <span id="termine-count">{len(termine)}</span> von {len(termine)} Terminen
-                </div>
-            </div>
-        </div>
-
-        <main id="termine-container">
-            {termine_html if termine else '<div class="keine-termine">Keine Termine gefunden</div>'}
-        </main>
-
-        <footer>
-            Generiert am {datetime.now().strftime('%d.%m.%Y um %H:%M Uhr')}<br>
-            Daten aus {len(alle_staedte)} Ratsinformationssystemen<br>
-            <a href="feed.xml" style="color: var(--accent); text-decoration: none;">&#x25CF; RSS-Feed</a>
-        </footer>
-    </div>
-
-    <script>
-        function filterTermine() {{
-            // Alle ausgewählten Städte aus allen Dropdowns sammeln
-            const selects = document.querySelectorAll('.kreis-filter');
-            const gewaehlteStaedte = [];
-
-            selects.forEach(select => {{
-                if (select.value) {{
-                    gewaehlteStaedte.push(select.value);
-                }}
-            }});
-
-            // Termine filtern
-            const termine = document.querySelectorAll('.termin');
-            let sichtbar = 0;
-
-            termine.forEach(t => {{
-                const zeigen = gewaehlteStaedte.length === 0 ||
-                               gewaehlteStaedte.includes(t.dataset.stadt);
-                t.classList.toggle('hidden', !zeigen);
-                if (zeigen) sichtbar++;
-            }});
-
-            document.getElementById('termine-count').textContent = sichtbar;
-
-            // Leere Datum-Gruppen ausblenden
-            document.querySelectorAll('.datum-gruppe').forEach(g => {{
-                const sichtbareTermine = g.querySelectorAll('.termin:not(.hidden)');
-                g.classList.toggle('hidden', sichtbareTermine.length === 0);
-            }});
-
-            // Aktive Filter als Tags anzeigen
-            updateFilterTags(gewaehlteStaedte);
-        }}
-
-        function updateFilterTags(staedte) {{
-            const container = document.getElementById('active-filters');
-            if (staedte.length === 0) {{
-                container.innerHTML = '';
-                return;
-            }}
-            container.innerHTML = staedte.map(stadt =>
-                `<span class="filter-tag">${{stadt}}<button onclick="removeFilter('${{stadt}}')">&times;</button></span>`
-            ).join('');
-        }}
-
-        function removeFilter(stadt) {{
-            // Finde das Dropdown mit dieser Stadt und setze es zurück
-            document.querySelectorAll('.kreis-filter').forEach(select => {{
-                if (select.value === stadt) {{
-                    select.value = '';
-                }}
-            }});
-            filterTermine();
-        }}
-
-        function resetFilter() {{
-            document.querySelectorAll('.kreis-filter').forEach(select => {{
-                select.value = '';
-            }});
-            filterTermine();
-        }}
-    </script>
-</body>
-</html>'''
-
-    return html
 
+    kopf, fuss = seiten_vorlage()
+    werte = {
+        'fingerprint': fingerprint,
+        'monat_titel': f"{monatsnamen[monat]} {jahr}",
+        'css_href': f"style.css?v={asset_version()}",
+        'skripte': ''.join(f'<script src="{name}?v={asset_version()}" defer></script>'
+                           for name in ('app.js', *(['client.js'] if client else []),
+                                        *(['suche.js'] if suche else []))),
+        'main_attribute': (f' data-quelle="{dateiname_fuer_monat(jahr, monat, "json")}" data-ki-url="{KI_URL}"'
+                           if client else ''),
+        'prev_link': dateiname_fuer_monat(prev_jahr, prev_monat) if prev_verfuegbar else "#",
+        'prev_class': "" if prev_verfuegbar else " disabled",
+        'prev_name': monatsnamen[prev_monat],
+        'next_link': dateiname_fuer_monat(next_jahr, next_monat) if next_verfuegbar else "#",
+        'next_class': "" if next_verfuegbar else " disabled",
+        'next_name': monatsnamen[next_monat],
+        'kalender': generiere_kalender(jahr, monat, tage_mit_terminen),
+        'filter_dropdowns': filter_dropdowns,
+        'veraltet_hinweis': generiere_veraltet_hinweis(veraltet),
+        'suche': generiere_suchfeld(suche),
+        'anzahl': len(termine),
+        'generiert': datetime.now().strftime('%d.%m.%Y um %H:%M Uhr'),
+        'anzahl_staedte': len(alle_staedte),
+    }
+
+    yield kopf.substitute(werte)
+    if client:
+        yield '<div class="keine-termine">Termine werden geladen …</div>'
+    elif termine:
+        yield from rendere_termine(termine_nach_datum)
+    else:
+        yield '<div class="keine-termine">Keine Termine gefunden</div>'
+    yield fuss.substitute(werte)
 
-def generiere_rss(alle_termine: list[Termin], jahr: int, monat: int) -> str:
-    """Generiert einen RSS-Feed aus allen Terminen eines Monats."""
+
+def generiere_html(termine: list[Termin], jahr: int, monat: int,
+                   verfuegbare_monate: list[tuple[int, int]], client: bool = False,
+                   veraltet: dict[str, datetime] | None = None, suche: bool = False) -> str:
+    """Generiert das HTML-Dashboard als String (siehe rendere_html)."""
+    return ''.join(rendere_html(termine, jahr, monat, verfuegbare_monate, client, veraltet, suche))
+
+
+def export_reihenfolge(termine: list[Termin]) -> list[Termin]:
+    """Termine in der Reihenfolge des JSON-Exports (nach Datum und Uhrzeit); der Suchindex verweist auf diese Positionen."""
+    return sorted(termine, key=lambda x: (x.datum.date(), x.uhrzeit))
+
+
+def rendere_json(termine: list[Termin], jahr: int, monat: int):
+    """Liefert die Termine eines Monats als kompaktes JSON (ein Termin pro Zeile).
+
+    Format: {"fingerprint", "jahr", "monat", "staedte": [...], "termine":
+    [[datum, uhrzeit, stadt_index, gremium, ort, link], ...]}. Die Termine
+    sind wie auf der Seite nach Datum und Uhrzeit sortiert, stadt_index
+    verweist in "staedte".
+    """
+    fingerprint = berechne_fingerprint('json', termine, jahr, monat)
+    staedte = sorted(set(t.stadt for t in termine))
+    stadt_index = {stadt: i for i, stadt in enumerate(staedte)}
+
+    yield (f'{{"fingerprint":"{fingerprint}","jahr":{jahr},"monat":{monat},'
+           f'"staedte":{json.dumps(staedte, ensure_ascii=False)},"termine":[')
+    trenner = '\n'
+    for t in export_reihenfolge(termine):
+        zeile = [t.datum.strftime('%Y-%m-%d'), t.uhrzeit, stadt_index[t.stadt], t.gremium, t.ort, t.link]
+        yield trenner + json.dumps(zeile, ensure_ascii=False, separators=(',', ':'))
+        trenner = ',\n'
+    yield '\n]}\n'
+
+
+def rendere_rss(alle_termine: list[Termin], jahr: int, monat: int):
+    """Liefert den RSS-Feed aller Termine eines Monats Stück für Stück."""
     monatsnamen = [
         '', 'Januar', 'Februar', 'März', 'April', 'Mai', 'Juni',
         'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'
     ]
     tz = ZoneInfo("Europe/Berlin")
     build_date = format_datetime(datetime.now(tz))
+    fingerprint = berechne_fingerprint('rss', alle_termine, jahr, monat)
+
+    yield f"""<?xml version="1.0" encoding="UTF-8"?>
+<!-- termine-fingerprint: {fingerprint} -->
+<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>Ratstermine Münsterland – {monatsnamen[monat]} {jahr}</title>
+    <link>https://ms-raete.reporter.ruhr/{dateiname_fuer_monat(jahr, monat)}</link>
+    <description>Sitzungstermine aus Ratsinformationssystemen im Münsterland</description>
+    <language>de-de</language>
+    <lastBuildDate>{build_date}</lastBuildDate>
+    <atom:link href="https://ms-raete.reporter.ruhr/feed.xml" rel="self" type="application/rss+xml"/>
+"""
 
-    items = ""
     for t in alle_termine:
         datum_mit_tz = t.datum.replace(tzinfo=tz)
         pub_date = format_datetime(datum_mit_tz)
@@ -731,7 +662,7 @@ def generiere_rss(alle_termine: list[Termin], jahr: int, monat: int) -> str:
             beschreibung = beschreibung.replace(char, esc)
         link_esc = t.link.replace('&', '&amp;')
 
-        items += f"""    <item>
+        yield f"""    <item>
       <title>{title}</title>
       <link>{link_esc}</link>
       <description>{beschreibung}</description>
@@ -740,19 +671,15 @@ def generiere_rss(alle_termine: list[Termin], jahr: int, monat: int) -> str:
     </item>
 """
 
-    return f"""<?xml version="1.0" encoding="UTF-8"?>
-<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">
-  <channel>
-    <title>Ratstermine Münsterland – {monatsnamen[monat]} {jahr}</title>
-    <link>https://ms-raete.reporter.ruhr/{dateiname_fuer_monat(jahr, monat)}</link>
-    <description>Sitzungstermine aus Ratsinformationssystemen im Münsterland</description>
-    <language>de-de</language>
-    <lastBuildDate>{build_date}</lastBuildDate>
-    <atom:link href="https://ms-raete.reporter.ruhr/feed.xml" rel="self" type="application/rss+xml"/>
-{items}  </channel>
+    yield """  </channel>
 </rss>"""
 
 
+def generiere_rss(alle_termine: list[Termin], jahr: int, monat: int) -> str:
+    """Generiert einen RSS-Feed aus allen Terminen eines Monats."""
+    return ''.join(rendere_rss(alle_termine, jahr, monat))
+
+
 def berechne_monate(start_jahr: int, start_monat: int, anzahl: int) -> list[tuple[int, int]]:
     """Berechnet eine Liste von (jahr, monat) Tupeln."""
     monate = []
@@ -766,6 +693,29 @@ def berechne_monate(start_jahr: int, start_monat: int, anzahl: int) -> list[tupl
     return monate
 
 
+def lies_monat(text: str, ende: bool = False) -> tuple[int, int]:
+    """Liest JJJJ oder JJJJ-MM; ein bloßes Jahr steht für Januar bzw. (ende=True) Dezember."""
+    if '-' in text:
+        jahr, monat = text.split('-', 1)
+        return int(jahr), int(monat)
+    return int(text), 12 if ende else 1
+
+
+def monate_zwischen(von: tuple[int, int], bis: tuple[int, int]) -> list[tuple[int, int]]:
+    """Alle Monate von von bis einschließlich bis als (jahr, monat)-Tupel."""
+    anzahl = (bis[0] - von[0]) * 12 + bis[1] - von[1] + 1
+    return berechne_monate(von[0], von[1], max(0, anzahl))
+
+
+def lies_option(argv: list[str], name: str, standard=None):
+    """Liest eine Option der Form --name=wert aus der Kommandozeile."""
+    praefix = f'--{name}='
+    for arg in argv:
+        if arg.startswith(praefix):
+            return arg[len(praefix):]
+    return standard
+
+
 def main():
     """Hauptfunktion."""
     import sys
@@ -774,51 +724,231 @@ def main():
     no_browser = '--no-browser' in sys.argv
     args = [a for a in sys.argv[1:] if not a.startswith('--')]
 
-    # Parameter: Jahr, Monat, Anzahl Monate (optional)
+    # JSON-Export pro Monat (--json); --client rendert die Termine im
+    # Browser aus diesem Export und setzt ihn daher voraus
+    client_modus = '--client' in sys.argv
+    # Suchindex über alle Monate (--suche); verweist auf Positionen im JSON-Export
+    suche = '--suche' in sys.argv
+    json_export = client_modus or suche or '--json' in sys.argv
+    komprimiert = '--komprimiert' in sys.argv
+
+    # Parallelität (--parallel=N gesamt, --pro-host=N je Host); die
+    # asyncio-Engine (--async) verträgt deutlich mehr gleichzeitige Abrufe
+    asynchron = '--async' in sys.argv
+    max_parallel = int(lies_option(sys.argv, 'parallel', MAX_PARALLEL_ASYNC if asynchron else MAX_PARALLEL))
+    max_pro_host = int(lies_option(sys.argv, 'pro-host', MAX_PRO_HOST))
+    # Parallelität pro Host nach Latenz und 429/5xx anpassen (--no-drossel: fest)
+    adaptiv = '--no-drossel' not in sys.argv
+    # Parser-Prozesse (--parser=N), unabhängig von der Zahl der Abrufe
+    parse_prozesse = int(lies_option(sys.argv, 'parser', PARSE_PROZESSE))
+    # Wiederholungen fehlgeschlagener Abrufe (--wiederholungen=N)
+    wiederholungen = int(lies_option(sys.argv, 'wiederholungen', WIEDERHOLUNGEN))
+    # Einzelne Requests: Versuche, Zeitbudget pro Stadt und Monat, Hedging
+    zeitbudget = float(lies_option(sys.argv, 'zeitbudget', ZEITBUDGET))
+    hedge_ab = lies_option(sys.argv, 'hedge')
+    if hedge_ab:
+        hedge_ab = float(hedge_ab)
+    else:
+        hedge_ab = HEDGE_AB_OPTION if '--hedge' in sys.argv else HEDGE_AB
+    BaseScraper.politik = AbrufPolitik(versuche=max(1, int(lies_option(sys.argv, 'versuche', REQUEST_VERSUCHE))),
+                                       pause=REQUEST_PAUSE, frist=zeitbudget or None,
+                                       hedge_ab=hedge_ab)
+
+    # Archiv aller HTTP-Antworten (--record=DIR aufzeichnen, --replay=DIR
+    # offline abspielen); der Cache bleibt dabei aus, damit jede Antwort
+    # vollständig aufgezeichnet bzw. aus dem Archiv gelesen wird
+    archiv = None
+    if lies_option(sys.argv, 'replay'):
+        archiv = Archiv(lies_option(sys.argv, 'replay'), abspielen=True,
+                        mit_latenz='--replay-latenz' in sys.argv)
+        print(f"Spiele Archiv ab: {archiv.verzeichnis}")
+    elif lies_option(sys.argv, 'record'):
+        archiv = Archiv(lies_option(sys.argv, 'record'))
+        print(f"Zeichne auf: {archiv.verzeichnis}")
+    abspielen = archiv is not None and archiv.abspielen
+
+    # Verbindungspool pro Host (--pool=N, Standard: so groß wie --pro-host)
+    konfiguriere_http(pool_groesse=int(lies_option(sys.argv, 'pool', max_pro_host)),
+                      keep_alive='--no-keepalive' not in sys.argv, archiv=archiv)
+
+    # Persistenter HTTP- und Parse-Cache (--no-cache schaltet ab,
+    # --cache-ttl=MIN für Server ohne ETag/Last-Modified)
+    if '--no-cache' not in sys.argv and archiv is None:
+        cache_ttl = float(lies_option(sys.argv, 'cache-ttl', 0)) * 60
+        BaseScraper.http_cache = HttpCache(os.path.join(CACHE_PFAD, 'http'), ttl=cache_ttl)
+        BaseScraper.parse_cache = ParseCache(os.path.join(CACHE_PFAD, 'parse'))
+
+    # Laufprotokoll mit Zeiten und Bytes pro Stadt und Monat (--protokoll[=DATEI])
+    protokoll_pfad = lies_option(sys.argv, 'protokoll')
+    if protokoll_pfad or '--protokoll' in sys.argv:
+        if not protokoll_pfad:
+            os.makedirs(CACHE_PFAD, exist_ok=True)
+            protokoll_pfad = os.path.join(CACHE_PFAD, 'laufprotokoll.jsonl')
+        BaseScraper.laufprotokoll = Laufprotokoll(protokoll_pfad)
+
+    # Parameter: Jahr, Monat, Anzahl Monate (optional); beim Abspielen
+    # standardmäßig die der Aufzeichnung, sonst ab dem aktuellen Monat
+    if abspielen and not args:
+        args = [str(a) for a in archiv.lade_lauf().get('argumente', [])]
     jetzt = datetime.now()
-    jahr = int(args[0]) if len(args) > 0 else jetzt.year
-    monat = int(args[1]) if len(args) > 1 else jetzt.month
-    anzahl_monate = int(args[2]) if len(args) > 2 else 3
 
-    # Liste der zu generierenden Monate
-    monate_liste = berechne_monate(jahr, monat, anzahl_monate)
+    # Archivmodus (--archiv VON BIS): Monat für Monat abrufen, speichern,
+    # rendern und schreiben, iCal-Feeds nur einmal für den ganzen Zeitraum
+    archiv_modus = '--archiv' in sys.argv
+    if archiv_modus:
+        if len(args) != 2:
+            print("Verwendung: python3 app.py --archiv VON BIS (jeweils JJJJ oder JJJJ-MM)")
+            sys.exit(2)
+        monate_liste = monate_zwischen(lies_monat(args[0]), lies_monat(args[1], ende=True))
+        if not monate_liste:
+            print(f"Leerer Zeitraum: {args[0]} bis {args[1]}")
+            sys.exit(2)
+        (jahr, monat), anzahl_monate = monate_liste[0], len(monate_liste)
+    else:
+        jahr = int(args[0]) if len(args) > 0 else jetzt.year
+        monat = int(args[1]) if len(args) > 1 else jetzt.month
+        anzahl_monate = int(args[2]) if len(args) > 2 else 3
+
+        # Liste der zu generierenden Monate
+        monate_liste = berechne_monate(jahr, monat, anzahl_monate)
+    if archiv is not None and not abspielen:
+        archiv.speichere_lauf({'argumente': [jahr, monat, anzahl_monate],
+                               'zeitpunkt': jetzt.isoformat(timespec='seconds')})
 
     print(f"Generiere {anzahl_monate} Monate ab {monat}/{jahr}...")
     print("=" * 50)
 
-    basis_pfad = os.path.dirname(__file__)
-    erster_dateiname = None
-    alle_fehler = []
-
-    for idx, (j, m) in enumerate(monate_liste):
-        monatsnamen = ['', 'Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun',
-                       'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez']
+    # Ausgabeverzeichnis (--ausgabe=DIR); ein abgespielter Lauf schreibt
+    # standardmäßig ins Archiv, damit er die veröffentlichten Seiten nicht überschreibt
+    basis_pfad = lies_option(sys.argv, 'ausgabe')
+    if not basis_pfad:
+        basis_pfad = os.path.join(archiv.verzeichnis, 'ausgabe') if abspielen else os.path.dirname(__file__)
+    os.makedirs(basis_pfad, exist_ok=True)
+    if abspielen or lies_option(sys.argv, 'ausgabe'):
+        print(f"Ausgabe nach: {basis_pfad}")
+    erster_dateiname = os.path.join(basis_pfad, dateiname_fuer_monat(*monate_liste[0]))
+    # Navigation über alle Monate mit Seite, nicht nur die dieses Laufs, damit
+    # Archiv- und reguläre Läufe dieselben Links (und Fingerprints) erzeugen
+    verfuegbare_monate = sorted(vorhandene_monate(basis_pfad) | set(monate_liste))
+    monatsnamen = ['', 'Jan', 'Feb', 'Mär', 'Apr', 'Mai', 'Jun',
+                   'Jul', 'Aug', 'Sep', 'Okt', 'Nov', 'Dez']
+
+    geschrieben = []
+    # Alle Ausgabedateien des Laufs und die davon neu geschriebenen (für --komprimiert)
+    ausgabe_dateien = [os.path.join(basis_pfad, name) for name in ASSETS]
+    geaendert = set()
+
+    # Gemeinsame Assets der Seiten nur bei Änderungen schreiben
+    for pfad in schreibe_assets(basis_pfad):
+        print(f"Asset aktualisiert: {os.path.basename(pfad)}")
+        geaendert.add(pfad)
+
+    # Termin-Speicher (--no-speicher schaltet ab): ausgefallene Städte werden
+    # mit ihrem letzten bekannten Stand gerendert; beim Abspielen aus, damit
+    # archivierte Antworten nicht als aktueller Stand gespeichert werden
+    speicher = None if '--no-speicher' in sys.argv or abspielen else TerminSpeicher(DATENBANK_PFAD)
+    suchindex = SuchIndex(os.path.join(basis_pfad, SUCHE_VERZEICHNIS)) if suche else None
+    scraper_liste = erstelle_scraper()
+    staedte = [s.stadt_name for s in scraper_liste]
+
+    def schreibe_monat(j: int, m: int, termine: list[Termin], fehler_staedte: list[str]):
+        """Schreibt einen Monat, sobald alle seine Abrufe abgeschlossen sind.
+
+        Nach einer erfolgreichen Wiederholung wird der Monat erneut gemeldet
+        und mit den frischen Terminen neu geschrieben.
+        """
+        idx = monate_liste.index((j, m))
         print(f"\n[{idx+1}/{anzahl_monate}] {monatsnamen[m]} {j}:")
-
-        termine, fehler_staedte = hole_alle_termine(j, m)
-        alle_fehler.extend(fehler_staedte)
         print(f"  → {len(termine)} Termine gefunden")
-
-        # HTML generieren
-        html = generiere_html(termine, j, m, monate_liste)
-
-        # Datei speichern
-        dateiname = dateiname_fuer_monat(j, m)
-        ausgabe_pfad = os.path.join(basis_pfad, dateiname)
-        with open(ausgabe_pfad, 'w', encoding='utf-8') as f:
-            f.write(html)
-
-        # RSS-Feed für den aktuellen Monat generieren
-        if idx == 0:
-            erster_dateiname = ausgabe_pfad
-            rss = generiere_rss(termine, j, m)
+        veraltet = {}
+        if speicher is not None:
+            termine, veraltet = ergaenze_aus_speicher(speicher, j, m, termine, staedte, fehler_staedte)
+
+        # HTML nur neu generieren und schreiben, wenn sich Termine,
+        # Navigation oder der Stand veralteter Städte geändert haben
+        ausgabe_pfad = os.path.join(basis_pfad, dateiname_fuer_monat(j, m))
+        fingerprint = berechne_fingerprint(seiten_art(client_modus, suche), termine, j, m,
+                                           verfuegbare_monate, veraltet)
+        if ausgabe_pfad not in ausgabe_dateien:
+            ausgabe_dateien.append(ausgabe_pfad)
+        if schreibe_wenn_geaendert(ausgabe_pfad, fingerprint,
+                                   lambda: rendere_html(termine, j, m, verfuegbare_monate, client_modus, veraltet, suche)):
+            if ausgabe_pfad not in geschrieben:
+                geschrieben.append(ausgabe_pfad)
+            geaendert.add(ausgabe_pfad)
+        else:
+            print("  → unverändert, nicht neu geschrieben")
+
+        if json_export:
+            json_pfad = os.path.join(basis_pfad, dateiname_fuer_monat(j, m, 'json'))
+            json_fingerprint = berechne_fingerprint('json', termine, j, m)
+            if json_pfad not in ausgabe_dateien:
+                ausgabe_dateien.append(json_pfad)
+            if schreibe_wenn_geaendert(json_pfad, json_fingerprint, lambda: rendere_json(termine, j, m)):
+                print(f"  → JSON: {os.path.basename(json_pfad)}")
+                geaendert.add(json_pfad)
+            # Suchindex nur für Monate nachführen, deren Export sich geändert hat
+            if suchindex is not None and suchindex.aktualisiere(
+                    j, m, json_fingerprint, [(t.gremium, t.stadt, t.ort) for t in export_reihenfolge(termine)]):
+                print("  → Suchindex aktualisiert")
+
+        # RSS-Feed für den aktuellen Monat generieren (nicht für das Archiv)
+        if idx == 0 and not archiv_modus:
             rss_pfad = os.path.join(basis_pfad, 'feed.xml')
-            with open(rss_pfad, 'w', encoding='utf-8') as f:
-                f.write(rss)
-            print(f"  → RSS-Feed: feed.xml ({len(termine)} Einträge)")
+            rss_fingerprint = berechne_fingerprint('rss', termine, j, m)
+            if rss_pfad not in ausgabe_dateien:
+                ausgabe_dateien.append(rss_pfad)
+            if schreibe_wenn_geaendert(rss_pfad, rss_fingerprint, lambda: rendere_rss(termine, j, m)):
+                print(f"  → RSS-Feed: feed.xml ({len(termine)} Einträge)")
+                geaendert.add(rss_pfad)
+            else:
+                print("  → RSS-Feed unverändert")
+
+    # Alle (Stadt, Monat)-Abrufe laufweit einplanen; jeder Monat wird
+    # geschrieben, sobald seine Abrufe fertig sind, Fehlschläge werden im
+    # Hintergrund wiederholt
+    planer_klasse = AsyncAbrufPlaner if asynchron else AbrufPlaner
+
+    def erstelle_planer(scraper: list[BaseScraper], monate: list[tuple[int, int]]) -> AbrufPlaner:
+        return planer_klasse(scraper, monate, max_parallel, max_pro_host, parse_prozesse,
+                             wiederholungen, WIEDERHOLUNG_PAUSE, adaptiv)
+
+    if archiv_modus:
+        alle_fehler = hole_archiv(scraper_liste, monate_liste, erstelle_planer, schreibe_monat,
+                                  int(lies_option(sys.argv, 'fenster', ARCHIV_FENSTER)))
+    else:
+        alle_fehler = erstelle_planer(scraper_liste, monate_liste).ausfuehren(schreibe_monat)
+    if speicher is not None:
+        speicher.schliesse()
+    if suchindex is not None:
+        suchindex.schreibe()
+        ausgabe_dateien.extend(suchindex.geschrieben)
+        geaendert.update(suchindex.geschrieben)
 
     print("\n" + "=" * 50)
-    print(f"Fertig! {anzahl_monate} Dateien generiert.")
+    print(f"Fertig! {len(geschrieben)} Dateien generiert, {anzahl_monate - len(geschrieben)} unverändert.")
+    if suchindex is not None:
+        print(f"Suchindex: {suchindex.neu_indiziert} Monate neu indiziert, "
+              f"{len(suchindex.geschrieben)} Dateien in {SUCHE_VERZEICHNIS}/ geschrieben")
+
+    if BaseScraper.laufprotokoll is not None:
+        print(f"\n{BaseScraper.laufprotokoll.zusammenfassung()}")
+        print(f"Laufprotokoll: {BaseScraper.laufprotokoll.pfad}")
+        BaseScraper.laufprotokoll.schliesse()
+
+    # Nachbearbeitung: geänderte Dateien minifizieren und vorkomprimieren
+    if komprimiert:
+        statistik = komprimiere_ausgabe(ausgabe_dateien, geaendert)
+        original = statistik['original']
+        if original:
+            zeile = (f"Komprimiert: {statistik['dateien']} Dateien, {formatiere_bytes(original)}"
+                     f" → {formatiere_bytes(statistik['minifiziert'])} minifiziert"
+                     f", gzip {formatiere_bytes(statistik['gzip'])} (-{1 - statistik['gzip'] / original:.0%})")
+            if brotli:
+                zeile += f", brotli {formatiere_bytes(statistik['brotli'])} (-{1 - statistik['brotli'] / original:.0%})"
+            print(zeile)
+        else:
+            print("Komprimiert: keine geänderten Dateien")
 
     # Fehlerbericht ausgeben
     if alle_fehler:
@@ -0,0 +1,54 @@
+"""Vergleicht den lxml-Parser für ALLRIS-Wicket-Antworten mit dem BeautifulSoup-Pfad.
+
+Verwendung (im Projektverzeichnis):
+    python3 -m benchmarks.allris_parser          # 20 Wiederholungen
+    python3 -m benchmarks.allris_parser 100      # 100 Wiederholungen
+"""
+
+import glob
+import os
+import sys
+import tracemalloc
+
+from scraper import AllrisScraper
+from benchmarks.sessionnet_parser import miss_zeit
+
+FIXTURE_PFAD = os.path.join(os.path.dirname(__file__), 'fixtures', 'allris')
+BASIS_URL = 'https://allris.example.de/public/'
+
+
+def miss_speicher(funktion, text: str) -> int:
+    """Gibt den Spitzenwert der Python-Allokationen (Bytes) eines Aufrufs zurück."""
+    tracemalloc.start()
+    try:
+        funktion(text, 2026, 3)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    wiederholungen = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    scraper = AllrisScraper('Benchmark', BASIS_URL)
+
+    print(f"{'Antwort':<20} {'Termine':>7} {'bs4':>9} {'lxml':>9} {'Faktor':>7} "
+          f"{'bs4 Spitze':>11} {'lxml Spitze':>11}  Ergebnis")
+    for pfad in sorted(glob.glob(os.path.join(FIXTURE_PFAD, '*.xml'))):
+        with open(pfad, encoding='utf-8') as f:
+            text = f.read()
+
+        termine_lxml = scraper._parse_kalender(text, 2026, 3)
+        termine_bs4 = scraper._parse_kalender_bs4(text, 2026, 3)
+        t_bs4 = miss_zeit(scraper._parse_kalender_bs4, text, wiederholungen)
+        t_lxml = miss_zeit(scraper._parse_kalender, text, wiederholungen)
+        m_bs4 = miss_speicher(scraper._parse_kalender_bs4, text)
+        m_lxml = miss_speicher(scraper._parse_kalender, text)
+
+        ergebnis = 'gleich' if termine_lxml == termine_bs4 else f'ABWEICHEND ({len(termine_bs4)} bs4)'
+        print(f"{os.path.basename(pfad):<20} {len(termine_lxml):>7} {t_bs4 * 1000:>7.1f}ms "
+              f"{t_lxml * 1000:>7.1f}ms {t_bs4 / t_lxml:>6.1f}x {m_bs4 / 1024:>9.0f}KB "
+              f"{m_lxml / 1024:>9.0f}KB  {ergebnis}")
+
+
+if __name__ == '__main__':
+    main()
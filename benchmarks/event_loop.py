@@ -0,0 +1,134 @@
+"""Prüft, dass die asyncio-Engine die Event-Loop beim Parsen nicht blockiert.
+
+Ein lokaler HTTP-Server liefert vergrößerte Fixtures (SessionNet-Seite,
+iCal-Feed); die Async-Varianten der Scraper rufen sie ohne Parse-Pool ab
+(wie mit --async und dem Standard --parser=0), ohne und mit HTTP- und
+Parse-Cache. Daneben läuft ein Takt, der alle TAKT Sekunden aufwacht und
+seine größte Verspätung misst. Blockierten Parser oder Cache-Dateien die
+Loop, wäre sie so groß wie die Parse-Zeit. Übrig bleibt der längste
+einzelne Aufruf von lxml, der die GIL hält (bei der zehnfach vergrößerten
+SessionNet-Seite etwa 25 ms, bei echten Seiten wenige ms); bei noch
+größeren Seiten hilft nur der Prozess-Pool (--parser=N).
+
+Verwendung (im Projektverzeichnis):
+    python3 -m benchmarks.event_loop                 # Grenze 50 ms
+    python3 -m benchmarks.event_loop --grenze=0.02
+
+Liegt eine Verspätung über --grenze (Sekunden), endet die Prüfung mit
+Exit-Code 1.
+"""
+
+import asyncio
+import hashlib
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app import lies_option
+from scraper import BaseScraper, RatsinfoScraper, SessionNetScraper
+from scraper.asynchron import neuer_async_client
+from scraper.cache import HttpCache, ParseCache
+from benchmarks.suite import ICAL_EVENT, JAHR, MONAT, SESSIONNET_ZEILE, lade_fixture, vervielfache
+
+TAKT = 0.001
+FAKTOR = 10
+
+
+class FixtureServer(BaseHTTPRequestHandler):
+    """Liefert die Fixtures mit ETag (bedingte Requests bekommen 304)."""
+
+    bodies: dict[str, bytes] = {}
+
+    def do_GET(self):
+        body = self.bodies[self.path.split('?')[0]]
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def mit_takt(abruf) -> tuple[float, float]:
+    """Führt abruf() aus und gibt (Dauer, größte Verspätung des Takts) zurück."""
+    fertig = False
+    verspaetung = 0.0
+
+    async def takt():
+        nonlocal verspaetung
+        while not fertig:
+            start = time.perf_counter()
+            await asyncio.sleep(TAKT)
+            verspaetung = max(verspaetung, time.perf_counter() - start - TAKT)
+
+    taktgeber = asyncio.create_task(takt())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    try:
+        await abruf()
+    finally:
+        dauer = time.perf_counter() - start
+        fertig = True
+        await taktgeber
+    return dauer, verspaetung
+
+
+async def pruefe(basis_url: str, grenze: float) -> bool:
+    sessionnet = SessionNetScraper('Benchmark', f'{basis_url}/bi/si0046.php')
+    ratsinfo = RatsinfoScraper('Benchmark', f'{basis_url}/')
+
+    faelle = {
+        'sessionnet': lambda client: sessionnet.hole_termine_async(client, JAHR, MONAT),
+        'ical': lambda client: ratsinfo.hole_termine_bereich_async(client, (2000, 1), (2099, 12)),
+    }
+
+    print(f"{'Fall':<24} {'Dauer':>9} {'Verspätung':>11}  Ergebnis")
+    ok = True
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        for cache in ('ohne Cache', 'Cache kalt', 'Cache warm'):
+            if cache == 'ohne Cache':
+                BaseScraper.http_cache = BaseScraper.parse_cache = None
+            elif cache == 'Cache kalt':
+                BaseScraper.http_cache = HttpCache(f'{verzeichnis}/http')
+                BaseScraper.parse_cache = ParseCache(f'{verzeichnis}/parse')
+            async with neuer_async_client() as client:
+                for name, abruf in faelle.items():
+                    dauer, verspaetung = await mit_takt(lambda: abruf(client))
+                    ergebnis = 'ok' if verspaetung <= grenze else 'BLOCKIERT'
+                    ok &= verspaetung <= grenze
+                    print(f"{name + '/' + cache:<24} {dauer * 1000:>7.1f}ms {verspaetung * 1000:>9.1f}ms  {ergebnis}")
+    BaseScraper.http_cache = BaseScraper.parse_cache = None
+    return ok
+
+
+def main():
+    grenze = float(lies_option(sys.argv, 'grenze', 0.05))
+    FixtureServer.bodies = {
+        '/bi/si0046.php': vervielfache(lade_fixture('sessionnet', 'si0046_smc_tabelle.html'),
+                                       SESSIONNET_ZEILE, FAKTOR).encode('utf-8'),
+        '/termine/ics/SD.NET_RIM.ics': vervielfache(lade_fixture('ical', 'SD.NET_RIM.ics'),
+                                                    ICAL_EVENT, FAKTOR).encode('utf-8'),
+    }
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        ok = asyncio.run(pruefe(f'http://127.0.0.1:{server.server_port}', grenze))
+    finally:
+        server.shutdown()
+    if not ok:
+        print(f"\nEvent-Loop länger als {grenze * 1000:.0f}ms blockiert")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
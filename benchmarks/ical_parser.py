@@ -0,0 +1,76 @@
+"""Vergleicht den zeilenweisen iCal-Parser mit dem bisherigen re.split-Parser.
+
+Verwendung (im Projektverzeichnis):
+    python3 -m benchmarks.ical_parser          # 20 Wiederholungen
+    python3 -m benchmarks.ical_parser 100      # 100 Wiederholungen
+
+Weichen die Termine der beiden Parser bei einem Feed ab, endet der
+Vergleich mit Exit-Code 1 (valarm.ics prüft z.B., dass eingebettete
+VALARM-Komponenten die Felder ihres Events nicht überschreiben).
+"""
+
+import glob
+import os
+import sys
+
+from scraper import RatsinfoScraper
+from benchmarks.referenz.ratsinfo_alt import RatsinfoScraperAlt
+from benchmarks.allris_parser import miss_speicher
+from benchmarks.sessionnet_parser import miss_zeit
+
+FIXTURE_PFAD = os.path.join(os.path.dirname(__file__), 'fixtures', 'ical')
+BASIS_URL = 'https://gemeinde.ratsinfomanagement.net/'
+
+# Ein Monat, ein typischer Lauf (6 Monate) und der ganze Feed
+ZEITRAEUME = {
+    '1 Monat': ((2026, 3), (2026, 3)),
+    '6 Monate': ((2026, 1), (2026, 6)),
+    'alles': ((2000, 1), (2099, 12)),
+}
+
+
+def main():
+    wiederholungen = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    neu = RatsinfoScraper('Benchmark', BASIS_URL)
+    alt = RatsinfoScraperAlt('Benchmark', BASIS_URL)
+
+    print(f"{'Feed':<18} {'Zeitraum':<9} {'Termine':>7} {'alt':>9} {'neu':>9} {'Faktor':>7} "
+          f"{'alt Spitze':>11} {'Stream':>11}  Ergebnis")
+    abweichend = False
+    for pfad in sorted(glob.glob(os.path.join(FIXTURE_PFAD, '*.ics'))):
+        with open(pfad, encoding='utf-8', newline='') as f:
+            text = f.read()
+
+        for name, (start, ende) in ZEITRAEUME.items():
+            def parse_neu(t, *_):
+                return neu._parse_ical_bereich(t, start, ende)
+
+            def parse_alt(t, *_):
+                return alt._parse_ical_bereich(t, start, ende)
+
+            termine_neu = parse_neu(text)
+            termine_alt = parse_alt(text)
+            t_alt = miss_zeit(parse_alt, text, wiederholungen)
+            t_neu = miss_zeit(parse_neu, text, wiederholungen)
+            m_alt = miss_speicher(parse_alt, text)
+
+            # Speicher des neuen Parsers beim zeilenweisen Lesen (wie aus der HTTP-Antwort)
+            def parse_neu_stream(*_):
+                with open(pfad, encoding='utf-8', newline='') as f:
+                    return neu._parse_ical_zeilen(f, start, ende)
+
+            m_neu = miss_speicher(parse_neu_stream, None)
+
+            anzahl = sum(len(t) for t in termine_neu.values())
+            ergebnis = 'gleich' if termine_neu == termine_alt else 'ABWEICHEND'
+            abweichend |= termine_neu != termine_alt
+            print(f"{os.path.basename(pfad):<18} {name:<9} {anzahl:>7} {t_alt * 1000:>7.1f}ms "
+                  f"{t_neu * 1000:>7.1f}ms {t_alt / t_neu:>6.1f}x {m_alt / 1024:>9.0f}KB "
+                  f"{m_neu / 1024:>9.0f}KB  {ergebnis}")
+
+    if abweichend:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
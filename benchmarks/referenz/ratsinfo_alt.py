@@ -0,0 +1,102 @@
+"""Bisheriger iCal-Parser (re.split über den ganzen Feed) als Vergleichsreferenz.
+
+Unverändert übernommen aus scraper/ratsinfo.py vor der Umstellung auf den
+zeilenweisen Parser. Wird nur von den Benchmarks verwendet.
+"""
+
+import re
+from datetime import datetime
+from scraper.base import Termin, monate_im_bereich
+from scraper.ratsinfo import RatsinfoScraper
+
+
+class RatsinfoScraperAlt(RatsinfoScraper):
+    """Ratsinfo-Scraper mit dem bisherigen iCal-Parser."""
+
+    def _parse_ical_bereich(self, ical_text: str, start: tuple[int, int],
+                            ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Parst den iCal-Text und ordnet die Termine von start bis ende ihren Monaten zu."""
+        termine_pro_monat = {m: [] for m in monate_im_bereich(start, ende)}
+
+        # iCal in Events aufteilen
+        events = re.split(r'BEGIN:VEVENT', ical_text)
+
+        for event in events[1:]:  # Erstes Element ist Header
+            if 'END:VEVENT' not in event:
+                continue
+
+            termin = self._parse_event(event, start, ende)
+            if termin:
+                termine_pro_monat[(termin.datum.year, termin.datum.month)].append(termin)
+
+        return termine_pro_monat
+
+    def _parse_event(self, event_text: str, start: tuple[int, int],
+                     ende: tuple[int, int]) -> Termin | None:
+        """Parst ein einzelnes iCal-Event."""
+        # DTSTART extrahieren
+        dtstart_match = re.search(r'DTSTART[^:]*:(\d{8}T\d{6})', event_text)
+        if not dtstart_match:
+            return None
+
+        try:
+            # Format: 20260205T160000 oder 20260205T160000Z
+            dt_str = dtstart_match.group(1)
+            datum = datetime.strptime(dt_str[:15], '%Y%m%dT%H%M%S')
+        except ValueError:
+            return None
+
+        # Nur Termine im gewünschten Zeitraum
+        if not start <= (datum.year, datum.month) <= ende:
+            return None
+
+        uhrzeit = datum.strftime('%H:%M Uhr')
+
+        # SUMMARY (Gremium) extrahieren
+        summary_match = re.search(r'SUMMARY:(.+?)(?:\r?\n(?! )|\r?\nEND)', event_text, re.DOTALL)
+        gremium = 'Unbekannt'
+        if summary_match:
+            gremium = self._unfold_ical_line(summary_match.group(1))
+
+        # LOCATION extrahieren
+        location_match = re.search(r'LOCATION:(.+?)(?:\r?\n(?! )|\r?\nEND)', event_text, re.DOTALL)
+        ort = ''
+        if location_match:
+            ort = self._unfold_ical_line(location_match.group(1))
+
+        # URL oder DESCRIPTION mit Link extrahieren
+        url_match = re.search(r'URL:(.+?)(?:\r?\n(?! )|\r?\nEND)', event_text, re.DOTALL)
+        link = ''
+        if url_match:
+            link = self._unfold_ical_line(url_match.group(1))
+        else:
+            # Versuche Link aus DESCRIPTION zu extrahieren
+            desc_match = re.search(r'DESCRIPTION:(.+?)(?:\r?\nEND|\r?\n[A-Z]+:)', event_text, re.DOTALL)
+            if desc_match:
+                desc = self._unfold_ical_line(desc_match.group(1))
+                link_in_desc = re.search(r'https?://[^\s<>"\\]+', desc)
+                if link_in_desc:
+                    link = link_in_desc.group(0)
+
+        # Falls kein Link gefunden, verwende Terminseite
+        if not link:
+            link = f"{self.base_domain}/termine"
+
+        return Termin(
+            stadt=self.stadt_name,
+            datum=datum,
+            uhrzeit=uhrzeit,
+            gremium=gremium[:100],
+            ort=ort[:100],
+            link=link
+        )
+
+    def _unfold_ical_line(self, text: str) -> str:
+        """Entfaltet iCal-Zeilen (Fortsetzungszeilen beginnen mit Leerzeichen/Tab)."""
+        # Entferne Zeilenumbrüche mit Fortsetzung
+        text = re.sub(r'\r?\n[ \t]', '', text)
+        # Entferne übrige Zeilenumbrüche
+        text = re.sub(r'\r?\n.*', '', text)
+        # Dekodiere escaped characters
+        text = text.replace('\\n', ' ').replace('\\,', ',').replace('\\;', ';')
+        return text.strip()
@@ -0,0 +1,51 @@
+"""Vergleicht den Single-Pass-SessionNet-Parser mit dem bisherigen Parser.
+
+Verwendung (im Projektverzeichnis):
+    python3 -m benchmarks.sessionnet_parser          # 20 Wiederholungen
+    python3 -m benchmarks.sessionnet_parser 100      # 100 Wiederholungen
+"""
+
+import glob
+import os
+import sys
+import time
+
+from scraper import SessionNetScraper
+from benchmarks.referenz.sessionnet_alt import SessionNetScraperAlt
+
+FIXTURE_PFAD = os.path.join(os.path.dirname(__file__), 'fixtures', 'sessionnet')
+BASIS_URL = 'https://ratsinfo.example.de/bi/si0046.php'
+
+
+def miss_zeit(funktion, html: str, wiederholungen: int) -> float:
+    """Gibt die beste Laufzeit (Sekunden) aus mehreren Wiederholungen zurück."""
+    beste = float('inf')
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion(html, 2026, 3)
+        beste = min(beste, time.perf_counter() - start)
+    return beste
+
+
+def main():
+    wiederholungen = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    neu = SessionNetScraper('Benchmark', BASIS_URL)
+    alt = SessionNetScraperAlt('Benchmark', BASIS_URL)
+
+    print(f"{'Seite':<28} {'Termine':>7} {'alt':>9} {'neu':>9} {'Faktor':>7}  Ergebnis")
+    for pfad in sorted(glob.glob(os.path.join(FIXTURE_PFAD, '*.html'))):
+        with open(pfad, encoding='utf-8') as f:
+            html = f.read()
+
+        termine_neu = neu._parse_html(html, 2026, 3)
+        termine_alt = alt._parse_html(html, 2026, 3)
+        t_alt = miss_zeit(alt._parse_html, html, wiederholungen)
+        t_neu = miss_zeit(neu._parse_html, html, wiederholungen)
+
+        ergebnis = 'gleich' if termine_neu == termine_alt else f'ABWEICHEND ({len(termine_alt)} alt)'
+        print(f"{os.path.basename(pfad):<28} {len(termine_neu):>7} {t_alt * 1000:>7.1f}ms "
+              f"{t_neu * 1000:>7.1f}ms {t_alt / t_neu:>6.1f}x  {ergebnis}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""Benchmark-Suite für alle Parser und Renderer mit Vergleich gegen eine gespeicherte Baseline.
+
+Misst _parse_html (SessionNet, Tabellen-, zk- und Text-Layout),
+_parse_kalender (ALLRIS-Wicket), _parse_ical (Ratsinfomanagement und
+gremien.info) sowie generiere_html und generiere_rss, jeweils in
+realistischer Größe und zehnfach vergrößert. Pro Fall werden beste
+Laufzeit, Spitzenwert der Python-Allokationen und Zahl der Termine
+erfasst. Ohne Netzwerk: alle Eingaben kommen aus fixtures/.
+
+Verwendung (im Projektverzeichnis):
+    python3 -m benchmarks.suite                    # Messen und mit baseline.json vergleichen
+    python3 -m benchmarks.suite --speichern        # Messung als neue Baseline speichern
+    python3 -m benchmarks.suite --wiederholungen=50 --toleranz=1.5
+
+Der Vergleich schlägt fehl (Exit-Code 1), wenn ein Fall mehr als
+--toleranz (Standard: 1.3) mal so lange braucht oder so viel Speicher
+belegt wie in der Baseline, oder wenn sich die Zahl der Termine ändert.
+Laufzeiten sind nur auf derselben Maschine vergleichbar; die Baseline
+daher nach einem Maschinenwechsel neu speichern.
+"""
+
+import json
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+from app import generiere_html, generiere_rss, lies_option
+from config import STAEDTE
+from scraper import SessionNetScraper, AllrisScraper, RatsinfoScraper, GremienInfoScraper, Termin, termin_schluessel
+from benchmarks.allris_parser import miss_speicher
+
+FIXTURE_PFAD = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASELINE_PFAD = os.path.join(os.path.dirname(__file__), 'baseline.json')
+JAHR, MONAT = 2026, 3
+
+# Wiederholte Blöcke je Fixture, die für die 10x-Variante vervielfacht werden
+SESSIONNET_ZEILE = re.compile(r'<tr class="smc-t-r-l">.*?</tr>\n', re.S)
+SESSIONNET_ZK = re.compile(r'<div class="zk1 zkzeile">.*?</div>\n')
+SESSIONNET_TEXT = re.compile(r'<section class="tag">.*?</section>\n', re.S)
+ALLRIS_ZEILE = re.compile(r'<tr(?: class="[^"]*")?><td class="dow">.*?</tr>\n?', re.S)
+ICAL_EVENT = re.compile(r'BEGIN:VEVENT\r?\n.*?END:VEVENT\r?\n', re.S)
+
+# Termine eines realistischen Monats (alle Städte zusammen)
+TERMINE_PRO_MONAT = 1700
+
+
+def lade_fixture(*teile: str) -> str:
+    with open(os.path.join(FIXTURE_PFAD, *teile), encoding='utf-8', newline='') as f:
+        return f.read()
+
+
+def vervielfache(text: str, block: re.Pattern, faktor: int) -> str:
+    """Wiederholt den Abschnitt vom ersten bis zum letzten Block faktor-mal.
+
+    Der übrige Aufbau des Dokuments (Kopf, Navigation, Fuß) bleibt erhalten,
+    sodass die Parser dieselben Pfade durchlaufen wie bei echten Seiten.
+    """
+    treffer = list(block.finditer(text))
+    if faktor == 1 or not treffer:
+        return text
+    start, ende = treffer[0].start(), treffer[-1].end()
+    return text[:start] + text[start:ende] * faktor + text[ende:]
+
+
+def beispiel_termine(anzahl: int) -> list[Termin]:
+    """Erzeugt reproduzierbar anzahl Termine eines Monats, verteilt auf alle Städte."""
+    zufall = random.Random(1)
+    staedte = [s.name for s in STAEDTE]
+    gremien = ['Rat', 'Bauausschuss', '[ABGESAGT] Schulausschuss', 'Ausschuss für Umwelt & Klima',
+               'Haupt- und Finanzausschuss', 'Bezirksvertretung Mitte']
+    termine = []
+    for i in range(anzahl):
+        datum = datetime(JAHR, MONAT, zufall.randint(1, 28), zufall.randint(8, 19), zufall.choice([0, 30]))
+        termine.append(Termin(
+            stadt=zufall.choice(staedte), datum=datum, uhrzeit=datum.strftime('%H:%M Uhr'),
+            gremium=zufall.choice(gremien), ort=zufall.choice(['', 'Rathaus, Saal 1', 'Bürgerhaus']),
+            link=zufall.choice(['', f'https://ratsinfo.example.de/bi/si0057.php?__ksinr={i}'])))
+    termine.sort(key=termin_schluessel)
+    return termine
+
+
+def faelle(faktor: int) -> dict:
+    """Alle Benchmark-Fälle einer Größe: Name → (Funktion(eingabe), Eingabe)."""
+    sessionnet = SessionNetScraper('Benchmark', 'https://ratsinfo.example.de/bi/si0046.php')
+    allris = AllrisScraper('Benchmark', 'https://allris.example.de/public/')
+    ratsinfo = RatsinfoScraper('Benchmark', 'https://gemeinde.ratsinfomanagement.net/')
+    gremieninfo = GremienInfoScraper('Benchmark', 'https://gemeinde.gremien.info/')
+    termine = beispiel_termine(TERMINE_PRO_MONAT * faktor)
+    monate = [(JAHR, MONAT - 1), (JAHR, MONAT), (JAHR, MONAT + 1)]
+
+    def parser(funktion):
+        return lambda text: funktion(text, JAHR, MONAT)
+
+    return {
+        'sessionnet_tabelle': (parser(sessionnet._parse_html), vervielfache(
+            lade_fixture('sessionnet', 'si0046_smc_tabelle.html'), SESSIONNET_ZEILE, faktor)),
+        'sessionnet_zk': (parser(sessionnet._parse_html), vervielfache(
+            lade_fixture('sessionnet', 'si0046_zk.html'), SESSIONNET_ZK, faktor)),
+        'sessionnet_text': (parser(sessionnet._parse_html), vervielfache(
+            lade_fixture('sessionnet', 'si0046_text.html'), SESSIONNET_TEXT, faktor)),
+        'allris_kalender': (parser(allris._parse_kalender), vervielfache(
+            lade_fixture('allris', 'si010_lwl.xml'), ALLRIS_ZEILE, faktor)),
+        'ical_ratsinfo': (parser(ratsinfo._parse_ical), vervielfache(
+            lade_fixture('ical', 'SD.NET_RIM.ics'), ICAL_EVENT, faktor)),
+        'ical_gremieninfo': (parser(gremieninfo._parse_ical), vervielfache(
+            lade_fixture('ical', 'gremieninfo_webcalendar.ics'), ICAL_EVENT, faktor)),
+        'generiere_html': (lambda t: generiere_html(t, JAHR, MONAT, monate), termine),
+        'generiere_rss': (lambda t: generiere_rss(t, JAHR, MONAT), termine),
+    }
+
+
+def anzahl_termine(ergebnis, eingabe) -> int:
+    """Zahl der gefundenen (Parser) bzw. gerenderten Termine (Renderer)."""
+    return len(ergebnis) if isinstance(ergebnis, list) else len(eingabe)
+
+
+def messe(wiederholungen: int) -> dict[str, dict]:
+    """Führt alle Fälle in beiden Größen aus.
+
+    Die Wiederholungen laufen reihum über alle Fälle statt Fall für Fall,
+    damit eine vorübergehend ausgelastete Maschine nicht einzelne Fälle
+    verfälscht; gewertet wird die beste Zeit.
+    """
+    alle_faelle = {f"{name}/{groesse}": fall
+                   for groesse, faktor in (('1x', 1), ('10x', 10))
+                   for name, fall in faelle(faktor).items()}
+
+    ergebnisse = {}
+    for fall, (funktion, eingabe) in alle_faelle.items():
+        # miss_speicher ruft funktion(eingabe, jahr, monat) auf
+        ergebnisse[fall] = {
+            'sekunden': float('inf'),
+            'spitze_bytes': miss_speicher(lambda e, *_: funktion(e), eingabe),
+            'termine': anzahl_termine(funktion(eingabe), eingabe),
+        }
+    for _ in range(wiederholungen):
+        for fall, (funktion, eingabe) in alle_faelle.items():
+            start = time.perf_counter()
+            funktion(eingabe)
+            ergebnisse[fall]['sekunden'] = min(ergebnisse[fall]['sekunden'], time.perf_counter() - start)
+    return ergebnisse
+
+
+def vergleiche(ergebnisse: dict, baseline: dict, toleranz: float) -> bool:
+    """Gibt die Tabelle gegen die Baseline aus; True, wenn alle Fälle im Budget liegen."""
+    im_budget = True
+    print(f"{'Fall':<26} {'Termine':>7} {'Zeit':>9} {'Basis':>9} {'Faktor':>7} "
+          f"{'Spitze':>9} {'Basis':>9}  Ergebnis")
+    for fall, wert in ergebnisse.items():
+        basis = baseline.get(fall)
+        zeit = f"{wert['sekunden'] * 1000:>7.2f}ms"
+        spitze = f"{wert['spitze_bytes'] / 1024:>7.0f}KB"
+        if basis is None:
+            print(f"{fall:<26} {wert['termine']:>7} {zeit} {'-':>9} {'-':>7} {spitze} {'-':>9}  neu")
+            continue
+
+        probleme = []
+        faktor = wert['sekunden'] / basis['sekunden']
+        if faktor > toleranz:
+            probleme.append('langsamer')
+        if wert['spitze_bytes'] > basis['spitze_bytes'] * toleranz:
+            probleme.append('mehr Speicher')
+        if wert['termine'] != basis['termine']:
+            probleme.append(f"Termine {basis['termine']} → {wert['termine']}")
+        im_budget &= not probleme
+        print(f"{fall:<26} {wert['termine']:>7} {zeit} {basis['sekunden'] * 1000:>7.2f}ms {faktor:>6.2f}x "
+              f"{spitze} {basis['spitze_bytes'] / 1024:>7.0f}KB  {', '.join(probleme) or 'ok'}")
+    return im_budget
+
+
+def main():
+    wiederholungen = int(lies_option(sys.argv, 'wiederholungen', 20))
+    toleranz = float(lies_option(sys.argv, 'toleranz', 1.3))
+    ergebnisse = messe(wiederholungen)
+
+    if '--speichern' in sys.argv:
+        with open(BASELINE_PFAD, 'w', encoding='utf-8') as f:
+            json.dump(ergebnisse, f, indent=2, sort_keys=True)
+            f.write('\n')
+        vergleiche(ergebnisse, {}, toleranz)
+        print(f"\nBaseline gespeichert: {BASELINE_PFAD}")
+        return
+
+    try:
+        with open(BASELINE_PFAD, encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        baseline = {}
+        print("Keine Baseline vorhanden (--speichern legt sie an)\n")
+
+    if not vergleiche(ergebnisse, baseline, toleranz):
+        print(f"\nBudget überschritten (Toleranz {toleranz}x)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
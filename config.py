@@ -21,6 +21,35 @@ class Kreis(Enum):
     WARENDORF = "Kreis Warendorf"
 
 
+# Parallelität beim Abruf: insgesamt und pro Host (mehrere Kommunen
+# teilen sich z.B. sessionnet.owl-it.de); pro Host ist MAX_PRO_HOST die
+# Obergrenze, darunter passt sich die Parallelität an Latenz und Fehler an
+MAX_PARALLEL = 10
+MAX_PRO_HOST = 4
+# Gesamtzahl gleichzeitiger Abrufe mit der asyncio-Engine (--async)
+MAX_PARALLEL_ASYNC = 200
+# Prozesse zum Parsen der Antworten (0 = im Abruf-Thread parsen)
+PARSE_PROZESSE = 0
+# Fehlgeschlagene Abrufe im Hintergrund wiederholen: Anzahl Versuche und
+# Pause vor dem ersten in Sekunden (verdoppelt sich je Versuch)
+WIEDERHOLUNGEN = 2
+WIEDERHOLUNG_PAUSE = 5
+# Einzelne Requests innerhalb eines Abrufs: Versuche bei Verbindungsfehlern,
+# Timeouts, 429 und 5xx (Pause ab REQUEST_PAUSE Sekunden, verdoppelt sich),
+# Zeitbudget pro Stadt und Monat in Sekunden und Wartezeit auf die
+# Antwort-Header, ab der bei einem langsamen Host ein zweiter, identischer
+# Request gestartet wird (Hedging). Hedging ist aus (None), bis es im
+# Betrieb gemessen ist; --hedge schaltet es mit HEDGE_AB_OPTION Sekunden ein
+REQUEST_VERSUCHE = 3
+REQUEST_PAUSE = 0.5
+ZEITBUDGET = 45
+HEDGE_AB = None
+HEDGE_AB_OPTION = 2.0
+# Archivmodus (--archiv): Monate, deren Einzelabrufe gemeinsam eingeplant
+# und im Speicher gehalten werden
+ARCHIV_FENSTER = 6
+
+
 @dataclass
 class Stadt:
     name: str
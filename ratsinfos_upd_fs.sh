@@ -16,13 +16,22 @@ echo "$OUTPUT"
 # Anzahl Termine aus Output extrahieren
 MONATE=$(echo "$OUTPUT" | grep -o '[0-9]* Dateien generiert' | grep -o '[0-9]*')
 
-# Zu GitHub pushen (nur wenn Änderungen vorhanden)
-if git diff --quiet termine_*.html 2>/dev/null; then
+# Alle generierten Dateien: Seiten, JSON-Exporte, Feed, Assets, Suchindex
+# (suche/ mit index.json und den Shards) und ihre vorkomprimierten Varianten
+# (Muster ohne Treffer bleiben stehen und werden von git als Pfadmuster
+# ohne Treffer ignoriert)
+ARTEFAKTE=(termine_*.html termine_*.json index.html feed.xml style.css app.js client.js suche.js suche *.gz *.br)
+
+# Zu GitHub pushen (nur wenn Änderungen vorhanden, auch neue Dateien)
+if [ -z "$(git status --porcelain -- "${ARTEFAKTE[@]}" 2>/dev/null)" ]; then
     echo "Keine Änderungen - kein Push nötig"
     PUSH_STATUS="Keine Änderungen"
 else
     echo "Änderungen gefunden - pushe zu GitHub..."
-    git add termine_*.html index.html 2>/dev/null
+    # Einzeln hinzufügen: git add bricht ab, wenn ein Muster nichts trifft (z.B. ohne --json)
+    for datei in "${ARTEFAKTE[@]}"; do
+        [ -e "$datei" ] && git add "$datei"
+    done
     git commit -m "Termine aktualisiert $DATUM" 2>&1
 
     if git push 2>&1; then
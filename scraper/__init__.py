@@ -1,7 +1,9 @@
-from .base import Termin
+from .base import Termin, TerminBatch, BaseScraper, termin_schluessel
 from .sessionnet import SessionNetScraper
 from .ratsinfo import RatsinfoScraper
 from .allris import AllrisScraper
 from .gremieninfo import GremienInfoScraper
+from .planer import AbrufPlaner
+from .asynchron import AsyncAbrufPlaner
 
-__all__ = ['Termin', 'SessionNetScraper', 'RatsinfoScraper', 'AllrisScraper', 'GremienInfoScraper']
+__all__ = ['Termin', 'TerminBatch', 'termin_schluessel', 'BaseScraper', 'SessionNetScraper', 'RatsinfoScraper', 'AllrisScraper', 'GremienInfoScraper', 'AbrufPlaner', 'AsyncAbrufPlaner']
@@ -1,14 +1,104 @@
 """Scraper für ALLRIS net 4.x-Systeme (via Wicket-AJAX)."""
 
+import asyncio
 import re
 import warnings
-import requests
 from datetime import datetime
+import lxml.html
+import requests
+from lxml import etree
 from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-from .base import BaseScraper, Termin
+from .base import BaseScraper, Termin, neue_http_session, hat_klasse, text_aus_element, monate_im_bereich
+from .asynchron import httpx, neuer_async_client
 
 warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
 
+ZEIT_MUSTER = re.compile(r'(\d{1,2}):(\d{2})')
+# Jahreslinks (Index und Jahr) und aktiver Monatslink in der Kalender-Navigation
+JAHRESLINK = re.compile(r'calNav-years-(\d+)-yearlink"([^>]*)>\s*(\d{4})')
+AKTIVER_MONAT = re.compile(r'calNav-months-(\d+)-monthlink"[^>]*class="active"')
+# Jahreslinks, solange noch keine Antwort mit Navigation gelesen wurde
+STANDARD_JAHRE = {2023 + i: i for i in range(7)}
+
+
+class JahrNichtImKalender(LookupError):
+    """Der ALLRIS-Kalender bietet für das angefragte Jahr keinen Jahreslink an."""
+
+
+class WicketKalender:
+    """Zustand einer Wicket-Session des ALLRIS-Kalenders (si010): welcher Monat angezeigt wird.
+
+    Plant nur die nötigen Requests; ausgeführt werden sie vom Scraper über
+    eine requests-Session oder einen httpx.AsyncClient (asyncio-Engine).
+    """
+
+    def __init__(self, kalender_url: str, session):
+        self.kalender_url = kalender_url
+        # Eigene Cookies für die Wicket-Session
+        self.session = session
+        self.antwort = None
+        self.jahr = None
+        self.monat = None
+        # Jahr → Index des Jahreslinks, aus der zuletzt gelesenen Navigation
+        self.jahre = dict(STANDARD_JAHRE)
+
+    def start_urls(self) -> list[tuple[str, bool]]:
+        """Gibt die (url, ajax)-Requests zum Starten der Session zurück."""
+        # Nach dem Start zeigt der Kalender den aktuellen Monat
+        jetzt = datetime.now()
+        self.jahr = jetzt.year
+        self.monat = jetzt.month
+        return [
+            # Schritt 1: Session starten
+            (self.kalender_url, False),
+            # Schritt 2: Kalender-Daten laden (Timer-Endpoint)
+            (f"{self.kalender_url}?0-1.0-", True),
+        ]
+
+    def uebernimm_anzeige(self, text: str):
+        """Übernimmt angebotene Jahre und angezeigten Monat aus der Navigation einer Antwort.
+
+        Der Server kann einen anderen Monat als den lokalen zeigen (z.B. um
+        Mitternacht am Monatsende oder beim Abspielen eines Archivs), und
+        welche Jahre die Jahreslinks abdecken, legt er fest.
+        """
+        links = JAHRESLINK.findall(text)
+        if not links:
+            return
+        self.jahre = {int(jahr): int(index) for index, _, jahr in links}
+        aktiv = [int(jahr) for _, attribute, jahr in links if 'class="active"' in attribute]
+        monat = AKTIVER_MONAT.search(text)
+        if aktiv and monat:
+            self.jahr = aktiv[0]
+            self.monat = int(monat.group(1)) + 1
+
+    def navigation(self, jahr: int, monat: int) -> list[str]:
+        """Gibt die AJAX-URLs zurück, die zum Monat führen (nur soweit nötig).
+
+        Raises:
+            JahrNichtImKalender: wenn die Navigation kein Jahr jahr anbietet
+                (der Zustand bleibt dann unverändert)
+        """
+        urls = []
+
+        # Zum gewünschten Jahr navigieren (falls nötig)
+        if jahr != self.jahr:
+            if jahr not in self.jahre:
+                raise JahrNichtImKalender(f"Kalender bietet {jahr} nicht an "
+                                          f"(nur {min(self.jahre)}–{max(self.jahre)})")
+            urls.append(f"{self.kalender_url}?0-1.0-form-calNav-years-{self.jahre[jahr]}-yearlink")
+            self.jahr = jahr
+            # Welcher Monat nach dem Jahreswechsel angezeigt wird, ist offen
+            self.monat = None
+
+        # Zum gewünschten Monat navigieren (falls nötig)
+        if monat != self.monat:
+            monat_index = monat - 1
+            urls.append(f"{self.kalender_url}?0-1.0-form-calNav-months-{monat_index}-monthlink")
+            self.monat = monat
+
+        return urls
+
 
 class AllrisScraper(BaseScraper):
     """Scraper für ALLRIS net-basierte Ratsinformationssysteme."""
@@ -27,6 +117,12 @@ class AllrisScraper(BaseScraper):
         'Wicket-Ajax-BaseURL': 'si010',
     }
 
+    # Alle Monate eines Laufs über eine Wicket-Session abrufen
+    BEREICHSABRUF = True
+
+    # 2: lxml-Parser für Wicket-AJAX-Antworten
+    PARSER_VERSION = 2
+
     def __init__(self, stadt_name: str, base_url: str):
         super().__init__(stadt_name, base_url)
         self.base_url = base_url.rstrip('/')
@@ -34,40 +130,224 @@ class AllrisScraper(BaseScraper):
 
     def hole_termine(self, jahr: int, monat: int) -> list[Termin]:
         """Holt alle Termine für einen bestimmten Monat via Wicket-AJAX."""
-        session = requests.Session()
+        termine = self.hole_termine_bereich((jahr, monat), (jahr, monat))[(jahr, monat)]
+        if isinstance(termine, Exception):
+            raise termine
+        return termine
 
-        # Schritt 1: Session starten
-        session.get(self.kalender_url, headers=self.HEADERS, timeout=15)
+    def hole_termine_bereich(self, start: tuple[int, int],
+                             ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Holt alle Monate von start bis ende über eine gemeinsame Wicket-Session.
 
-        # Schritt 2: Kalender-Daten laden (Timer-Endpoint)
-        ajax_url = f"{self.kalender_url}?0-1.0-"
-        resp = session.get(ajax_url, headers=self.AJAX_HEADERS, timeout=15)
-        resp.raise_for_status()
+        Die Session wird nur einmal gestartet (Seite + Timer-Endpoint); danach
+        wird Monat für Monat weiternavigiert, der Jahreslink nur bei einem
+        Jahreswechsel. Der Wicket-Kalender zeigt immer genau einen Monat, ein
+        Zeitraum lässt sich daher nicht in einem einzigen Request abfragen.
 
-        # Aktuellen Monat/Jahr aus der initialen Antwort ermitteln
-        jetzt = datetime.now()
-        aktueller_monat = jetzt.month
-        aktuelles_jahr = jetzt.year
-
-        # Schritt 3: Zum gewünschten Jahr navigieren (falls nötig)
-        if jahr != aktuelles_jahr:
-            jahr_index = jahr - 2023
-            if 0 <= jahr_index <= 6:
-                url = f"{self.kalender_url}?0-1.0-form-calNav-years-{jahr_index}-yearlink"
-                resp = session.get(url, headers=self.AJAX_HEADERS, timeout=15)
-                resp.raise_for_status()
-
-        # Schritt 4: Zum gewünschten Monat navigieren (falls nötig)
-        if monat != aktueller_monat or jahr != aktuelles_jahr:
-            monat_index = monat - 1
-            url = f"{self.kalender_url}?0-1.0-form-calNav-months-{monat_index}-monthlink"
-            resp = session.get(url, headers=self.AJAX_HEADERS, timeout=15)
+        Monate in Jahren ohne Jahreslink enthalten statt der Termine die
+        JahrNichtImKalender-Ausnahme; der Planer meldet die Stadt dann nur
+        für diese Monate als ausgefallen.
+        """
+        termine_pro_monat = {}
+        kalender = None
+
+        for jahr, monat in monate_im_bereich(start, ende):
+            # Wicket-Antworten hängen vom Session-Zustand ab und tragen keine
+            # Validatoren; gecacht wird daher nur die fertige Monatsantwort und
+            # nur mit --cache-ttl (ohne TTL wäre sie nie wiederverwendbar)
+            cache_schluessel = f"{self.kalender_url}#{jahr}-{monat:02d}"
+            resp = self._frisch_aus_cache(cache_schluessel)
+
+            if resp is None:
+                try:
+                    try:
+                        if kalender is None:
+                            kalender = self._starte_kalender()
+                        resp = self._zeige_monat(kalender, jahr, monat)
+                    except requests.RequestException:
+                        # Session einmal neu starten (z.B. abgelaufene Wicket-Seite)
+                        kalender = self._starte_kalender()
+                        resp = self._zeige_monat(kalender, jahr, monat)
+                except JahrNichtImKalender as e:
+                    termine_pro_monat[(jahr, monat)] = e
+                    continue
+
+                if self.http_cache is not None and self.http_cache.ttl > 0:
+                    self.http_cache.speichere(cache_schluessel, resp)
+
+            termine_pro_monat[(jahr, monat)] = self._parse_gecacht(
+                cache_schluessel, resp.text, self._parse_kalender, jahr, monat)
+
+        return termine_pro_monat
+
+    async def hole_termine_async(self, client, jahr: int, monat: int) -> list[Termin]:
+        """Holt alle Termine eines Monats über httpx (asyncio-Engine)."""
+        termine = (await self.hole_termine_bereich_async(client, (jahr, monat), (jahr, monat)))[(jahr, monat)]
+        if isinstance(termine, Exception):
+            raise termine
+        return termine
+
+    async def hole_termine_bereich_async(self, client, start: tuple[int, int],
+                                         ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Async-Variante von hole_termine_bereich().
+
+        Die Wicket-Session bekommt einen eigenen httpx.AsyncClient, damit ihre
+        Cookies nicht mit dem gemeinsamen Client geteilt werden.
+        """
+        termine_pro_monat = {}
+        kalender = None
+
+        async with neuer_async_client(max_verbindungen=1) as wicket_client:
+            for jahr, monat in monate_im_bereich(start, ende):
+                cache_schluessel = f"{self.kalender_url}#{jahr}-{monat:02d}"
+                resp = await self._frisch_aus_cache_async(cache_schluessel)
+
+                if resp is None:
+                    try:
+                        try:
+                            if kalender is None:
+                                kalender = await self._starte_kalender_async(wicket_client)
+                            resp = await self._zeige_monat_async(kalender, jahr, monat)
+                        except httpx.HTTPError:
+                            wicket_client.cookies.clear()
+                            kalender = await self._starte_kalender_async(wicket_client)
+                            resp = await self._zeige_monat_async(kalender, jahr, monat)
+                    except JahrNichtImKalender as e:
+                        termine_pro_monat[(jahr, monat)] = e
+                        continue
+
+                    if self.http_cache is not None and self.http_cache.ttl > 0:
+                        await asyncio.to_thread(self.http_cache.speichere, cache_schluessel, resp)
+
+                termine_pro_monat[(jahr, monat)] = await self._parse_gecacht_async(
+                    cache_schluessel, resp.text, self._parse_kalender, jahr, monat)
+
+        return termine_pro_monat
+
+    def _starte_kalender(self) -> WicketKalender:
+        """Startet eine neue Wicket-Session (eigene Cookies, Verbindungen aus dem Host-Pool)."""
+        kalender = WicketKalender(self.kalender_url, neue_http_session(self.kalender_url))
+        for url, ajax in kalender.start_urls():
+            kalender.antwort = self._wicket_get(kalender, url, ajax)
+            kalender.uebernimm_anzeige(kalender.antwort.text)
+        return kalender
+
+    def _zeige_monat(self, kalender: WicketKalender, jahr: int, monat: int) -> requests.Response:
+        """Navigiert zum Monat und gibt die Kalender-Antwort zurück."""
+        for url in kalender.navigation(jahr, monat):
+            kalender.antwort = self._wicket_get(kalender, url, ajax=True)
+        return kalender.antwort
+
+    def _wicket_get(self, kalender: WicketKalender, url: str, ajax: bool) -> requests.Response:
+        resp = self._get(url, headers=self.AJAX_HEADERS if ajax else self.HEADERS, timeout=15,
+                         session=kalender.session, cache=False, idempotent=False)
+        if ajax:
             resp.raise_for_status()
+        return resp
+
+    async def _starte_kalender_async(self, client) -> WicketKalender:
+        kalender = WicketKalender(self.kalender_url, client)
+        for url, ajax in kalender.start_urls():
+            kalender.antwort = await self._wicket_get_async(kalender, url, ajax)
+            kalender.uebernimm_anzeige(kalender.antwort.text)
+        return kalender
 
-        return self._parse_kalender(resp.text, jahr, monat)
+    async def _zeige_monat_async(self, kalender: WicketKalender, jahr: int, monat: int):
+        for url in kalender.navigation(jahr, monat):
+            kalender.antwort = await self._wicket_get_async(kalender, url, ajax=True)
+        return kalender.antwort
+
+    async def _wicket_get_async(self, kalender: WicketKalender, url: str, ajax: bool):
+        resp = await self._get_async(kalender.session, url,
+                                     headers=self.AJAX_HEADERS if ajax else self.HEADERS,
+                                     timeout=15, cache=False, idempotent=False)
+        if ajax:
+            resp.raise_for_status()
+        return resp
 
     def _parse_kalender(self, xml_text: str, jahr: int, monat: int) -> list[Termin]:
-        """Parst die AJAX-Antwort und extrahiert Termine."""
+        """Parst die AJAX-Antwort und extrahiert Termine.
+
+        Die Wicket-Antwort wird als XML gelesen und der HTML-Inhalt der
+        <component>-Elemente mit lxml in einem Durchlauf ausgewertet. Nur wenn
+        die Antwort kein wohlgeformtes XML ist, wird BeautifulSoup verwendet.
+        """
+        # Wicket-Antworten sind XML; der Kalender steckt als HTML in CDATA-Abschnitten.
+        # Parser pro Aufruf, da lxml-Parser nicht zwischen Threads geteilt werden sollten
+        parser = etree.XMLParser(resolve_entities=False, no_network=True, huge_tree=True)
+        try:
+            wurzel = etree.fromstring(xml_text.encode('utf-8'), parser)
+        except etree.XMLSyntaxError:
+            return self._parse_kalender_bs4(xml_text, jahr, monat)
+        if wurzel is None or wurzel.tag != 'ajax-response':
+            return self._parse_kalender_bs4(xml_text, jahr, monat)
+
+        termine = []
+        for component in wurzel.iter('component'):
+            if not component.text or '<tr' not in component.text:
+                continue
+            fragment = lxml.html.fragment_fromstring(component.text, create_parent='div')
+            termine.extend(self._parse_zeilen(fragment.iter('tr'), jahr, monat))
+        return termine
+
+    def _parse_zeilen(self, zeilen, jahr: int, monat: int) -> list[Termin]:
+        """Extrahiert Termine aus den <tr>-Elementen des Kalenders (lxml)."""
+        termine = []
+        aktueller_tag = None
+
+        for row in zeilen:
+            classes = row.get('class', '').split()
+
+            # Benötigte Felder in einem Durchlauf über die Zeile einsammeln
+            tag_span = zeit_td = text_td = raum_td = None
+            for elem in row.iter('span', 'td'):
+                if elem.tag == 'span':
+                    if tag_span is None and hat_klasse(elem, 'dom'):
+                        tag_span = elem
+                elif zeit_td is None and hat_klasse(elem, 'time'):
+                    zeit_td = elem
+                elif text_td is None and hat_klasse(elem, 'textCol'):
+                    text_td = elem
+                elif raum_td is None and hat_klasse(elem, 'raum'):
+                    raum_td = elem
+
+            # Leere Zeilen überspringen
+            if 'emptyRow' in classes:
+                if tag_span is not None:
+                    aktueller_tag = int(text_aus_element(tag_span))
+                continue
+
+            # Tag aus der Zeile extrahieren
+            if tag_span is not None:
+                aktueller_tag = int(text_aus_element(tag_span))
+            elif 'sameday' not in classes:
+                # Weder eigener Tag noch sameday → Header-Zeile etc.
+                continue
+
+            if aktueller_tag is None or zeit_td is None or text_td is None:
+                continue
+            zeit_text = text_aus_element(zeit_td)
+            if not zeit_text:
+                continue
+
+            # Gremium (Sitzungsname) und Link zur Sitzung
+            link_tag = next(text_td.iter('a'), None)
+            if link_tag is not None:
+                gremium = text_aus_element(link_tag)
+                href = link_tag.get('href')
+            else:
+                gremium = text_aus_element(text_td)
+                href = None
+
+            termin = self._erstelle_termin(jahr, monat, aktueller_tag, zeit_text, gremium, href,
+                                           text_aus_element(raum_td) if raum_td is not None else '')
+            if termin:
+                termine.append(termin)
+
+        return termine
+
+    def _parse_kalender_bs4(self, xml_text: str, jahr: int, monat: int) -> list[Termin]:
+        """Parst die AJAX-Antwort mit BeautifulSoup (Fallback für fehlerhaftes XML)."""
         termine = []
         soup = BeautifulSoup(xml_text, 'lxml')
 
@@ -108,44 +388,51 @@ class AllrisScraper(BaseScraper):
                 continue
             link_tag = text_td.find('a')
             gremium = link_tag.get_text(strip=True) if link_tag else text_td.get_text(strip=True)
-
-            # Link zur Sitzung
-            link = ''
-            if link_tag and link_tag.get('href'):
-                href = link_tag['href']
-                if href.startswith('./'):
-                    link = f"{self.base_url}/{href[2:]}"
-                elif href.startswith('http'):
-                    link = href
-                else:
-                    link = f"{self.base_url}/{href}"
-            if not link:
-                link = self.kalender_url
+            href = link_tag.get('href') if link_tag else None
 
             # Raum/Ort
             raum_td = row.find('td', class_='raum')
             ort = raum_td.get_text(strip=True) if raum_td else ''
 
-            # Datum zusammenbauen
-            try:
-                stunde, minute = 0, 0
-                zeit_match = re.match(r'(\d{1,2}):(\d{2})', zeit_text)
-                if zeit_match:
-                    stunde = int(zeit_match.group(1))
-                    minute = int(zeit_match.group(2))
-                datum = datetime(jahr, monat, aktueller_tag, stunde, minute)
-            except ValueError:
-                continue
+            termin = self._erstelle_termin(jahr, monat, aktueller_tag, zeit_text, gremium, href, ort)
+            if termin:
+                termine.append(termin)
 
-            uhrzeit = f"{stunde:02d}:{minute:02d} Uhr"
+        return termine
 
-            termine.append(Termin(
-                stadt=self.stadt_name,
-                datum=datum,
-                uhrzeit=uhrzeit,
-                gremium=gremium[:100],
-                ort=ort[:100],
-                link=link
-            ))
+    def _erstelle_termin(self, jahr: int, monat: int, tag: int, zeit_text: str,
+                         gremium: str, href: str | None, ort: str) -> Termin | None:
+        """Baut aus den Feldern einer Kalenderzeile einen Termin."""
+        # Link zur Sitzung
+        link = ''
+        if href:
+            if href.startswith('./'):
+                link = f"{self.base_url}/{href[2:]}"
+            elif href.startswith('http'):
+                link = href
+            else:
+                link = f"{self.base_url}/{href}"
+        if not link:
+            link = self.kalender_url
 
-        return termine
+        # Datum zusammenbauen
+        try:
+            stunde, minute = 0, 0
+            zeit_match = ZEIT_MUSTER.match(zeit_text)
+            if zeit_match:
+                stunde = int(zeit_match.group(1))
+                minute = int(zeit_match.group(2))
+            datum = datetime(jahr, monat, tag, stunde, minute)
+        except ValueError:
+            return None
+
+        uhrzeit = f"{stunde:02d}:{minute:02d} Uhr"
+
+        return Termin(
+            stadt=self.stadt_name,
+            datum=datum,
+            uhrzeit=uhrzeit,
+            gremium=gremium[:100],
+            ort=ort[:100],
+            link=link
+        )
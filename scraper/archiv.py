@@ -0,0 +1,213 @@
+"""Archiv aller HTTP-Antworten eines Laufs: aufzeichnen (--record) und offline abspielen (--replay)."""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+try:
+    import httpx
+except ImportError:  # Optional, nur für die asyncio-Engine nötig
+    httpx = None
+
+from .cache import _schreibe_atomar
+
+
+# Header, die nach dem Dekodieren des Bodys nicht mehr stimmen
+VERWORFENE_HEADER = ('content-encoding', 'content-length', 'transfer-encoding')
+
+
+class Archiv:
+    """Legt jeden Austausch (Methode, URL, n-ter Abruf) als .json/.body-Paar ab.
+
+    Der Schlüssel zählt Abrufe derselben URL mit, damit zustandsbehaftete
+    Folgen wie die Wicket-Navigation bei ALLRIS (gleiche URL, je nach
+    Session-Zustand anderer Inhalt) in derselben Reihenfolge abgespielt
+    werden. Gespeichert wird der dekodierte Body; fehlgeschlagene Abrufe
+    werden mit ihrer Fehlermeldung archiviert und beim Abspielen erneut
+    ausgelöst.
+
+    Args:
+        verzeichnis: Ablage des Archivs
+        abspielen: True = Antworten aus dem Archiv liefern, False = aufzeichnen
+        mit_latenz: Beim Abspielen so lange warten wie der aufgezeichnete Abruf
+    """
+
+    def __init__(self, verzeichnis: str, abspielen: bool = False, mit_latenz: bool = False):
+        self.verzeichnis = verzeichnis
+        self.abspielen = abspielen
+        self.mit_latenz = mit_latenz
+        self._lock = threading.Lock()
+        self._zaehler: dict[str, int] = defaultdict(int)
+        if abspielen and not os.path.isdir(verzeichnis):
+            raise FileNotFoundError(f"Archiv nicht gefunden: {verzeichnis}")
+        os.makedirs(verzeichnis, exist_ok=True)
+
+    def _pfad(self, methode: str, url: str, nummer: int) -> str:
+        h = hashlib.sha256(f"{methode} {url}".encode('utf-8')).hexdigest()
+        return os.path.join(self.verzeichnis, h[:2], f"{h}-{nummer}")
+
+    def _naechste_nummer(self, methode: str, url: str) -> int:
+        with self._lock:
+            nummer = self._zaehler[f"{methode} {url}"]
+            self._zaehler[f"{methode} {url}"] += 1
+        return nummer
+
+    def speichere(self, methode: str, url: str, dauer: float, status: int = 0, grund: str = '',
+                  headers=None, body: bytes = b'', fehler: str | None = None):
+        """Archiviert einen Austausch (oder den Fehler, mit dem er abgebrochen ist)."""
+        pfad = self._pfad(methode, url, self._naechste_nummer(methode, url))
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        meta = {
+            'methode': methode,
+            'url': url,
+            'status': status,
+            'grund': grund,
+            'headers': {k: v for k, v in (headers or {}).items() if k.lower() not in VERWORFENE_HEADER},
+            'dauer': round(dauer, 4),
+            'fehler': fehler,
+        }
+        # Body zuerst schreiben, damit Metadaten nie auf einen fehlenden Body zeigen
+        _schreibe_atomar(pfad + '.body', body)
+        _schreibe_atomar(pfad + '.json', json.dumps(meta, ensure_ascii=False).encode('utf-8'))
+
+    def lade(self, methode: str, url: str) -> tuple[dict, bytes] | None:
+        """Gibt (Metadaten, Body) des nächsten Abrufs der URL zurück.
+
+        Wird eine URL öfter abgerufen als bei der Aufzeichnung (z.B. durch
+        zusätzliche Wiederholungen), kommt die zuletzt aufgezeichnete Antwort.
+
+        Returns:
+            (meta, body) oder None, wenn die URL nicht im Archiv ist
+        """
+        for nummer in range(self._naechste_nummer(methode, url), -1, -1):
+            pfad = self._pfad(methode, url, nummer)
+            try:
+                with open(pfad + '.json', encoding='utf-8') as f:
+                    meta = json.load(f)
+                with open(pfad + '.body', 'rb') as f:
+                    return meta, f.read()
+            except (OSError, ValueError):
+                continue
+        return None
+
+    def wartezeit(self, meta: dict) -> float:
+        """Sekunden, die das Abspielen eines Austauschs dauern soll."""
+        return meta['dauer'] if self.mit_latenz else 0.0
+
+    def speichere_lauf(self, daten: dict):
+        """Legt die Parameter des aufgezeichneten Laufs ab (Jahr, Monat, Anzahl, Zeitpunkt)."""
+        _schreibe_atomar(os.path.join(self.verzeichnis, 'lauf.json'),
+                         json.dumps(daten, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    def lade_lauf(self) -> dict:
+        """Parameter des aufgezeichneten Laufs ({} bei einem Archiv ohne lauf.json)."""
+        try:
+            with open(os.path.join(self.verzeichnis, 'lauf.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+
+class ArchivAdapter(HTTPAdapter):
+    """Transport-Adapter für requests: zeichnet über den Verbindungspool auf oder spielt ab.
+
+    Ersetzt beim Aufzeichnen bzw. Abspielen den HTTPAdapter des Host-Pools
+    (siehe base._host_adapter); Redirects und Cookies behandelt weiterhin
+    die requests-Session.
+    """
+
+    def __init__(self, archiv: Archiv, **kwargs):
+        super().__init__(**kwargs)
+        self.archiv = archiv
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if self.archiv.abspielen:
+            return self._spiele_ab(request)
+
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            # Body sofort lesen (auch bei stream=True), damit er archiviert werden kann
+            body = response.content
+        except requests.RequestException as e:
+            self.archiv.speichere(request.method, request.url, time.perf_counter() - start,
+                                  fehler=f"{type(e).__name__}: {e}")
+            raise
+        self.archiv.speichere(request.method, request.url, time.perf_counter() - start,
+                              response.status_code, response.reason or '', response.headers, body)
+        return response
+
+    def _spiele_ab(self, request: requests.PreparedRequest) -> requests.Response:
+        eintrag = self.archiv.lade(request.method, request.url)
+        if eintrag is None:
+            raise requests.ConnectionError(f"Nicht im Archiv: {request.method} {request.url}", request=request)
+        meta, body = eintrag
+        time.sleep(self.archiv.wartezeit(meta))
+        if meta['fehler']:
+            raise requests.ConnectionError(meta['fehler'], request=request)
+
+        response = requests.Response()
+        response.status_code = meta['status']
+        response.reason = meta['grund']
+        response.headers = CaseInsensitiveDict(meta['headers'])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response._content = body
+        response._content_consumed = True
+        return response
+
+
+class ArchivTransport(httpx.AsyncBaseTransport if httpx is not None else object):
+    """Transport für httpx (asyncio-Engine) mit demselben Archiv wie ArchivAdapter.
+
+    Args:
+        transport: Echter Transport für die Aufzeichnung (None beim Abspielen)
+    """
+
+    def __init__(self, archiv: Archiv, transport=None):
+        self.archiv = archiv
+        self.transport = transport
+
+    async def handle_async_request(self, request: 'httpx.Request') -> 'httpx.Response':
+        methode, url = request.method, str(request.url)
+        if self.archiv.abspielen:
+            eintrag = self.archiv.lade(methode, url)
+            if eintrag is None:
+                raise httpx.ConnectError(f"Nicht im Archiv: {methode} {url}", request=request)
+            meta, body = eintrag
+            await asyncio.sleep(self.archiv.wartezeit(meta))
+            if meta['fehler']:
+                raise httpx.ConnectError(meta['fehler'], request=request)
+            return httpx.Response(meta['status'], headers=meta['headers'], content=body, request=request)
+
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+            try:
+                # aread() dekodiert Content-Encoding; daher ohne diese Header weiterreichen
+                body = await response.aread()
+            finally:
+                await response.aclose()
+        except httpx.HTTPError as e:
+            self.archiv.speichere(methode, url, time.perf_counter() - start, fehler=f"{type(e).__name__}: {e}")
+            raise
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in VERWORFENE_HEADER}
+        self.archiv.speichere(methode, url, time.perf_counter() - start, response.status_code,
+                              response.reason_phrase, headers, body)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request,
+                              extensions=response.extensions)
+
+    async def aclose(self):
+        if self.transport is not None:
+            await self.transport.aclose()
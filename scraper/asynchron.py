@@ -0,0 +1,108 @@
+"""asyncio-Engine: alle Abrufe eines Laufs als Coroutinen auf einem Thread (benötigt httpx)."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Callable
+
+try:
+    import httpx
+except ImportError:  # Optional, nur für die asyncio-Engine nötig
+    httpx = None
+
+from . import base
+from .archiv import ArchivTransport
+from .base import Termin
+from .planer import AbrufPlaner, Aufgabe, Fortschritt, host_drosseln, parse_auftraege, parse_pool
+
+
+def neuer_async_client(max_verbindungen: int = 100) -> 'httpx.AsyncClient':
+    """Erstellt einen httpx.AsyncClient, der sich wie eine requests-Session verhält.
+
+    Redirects werden wie bei requests verfolgt; Keep-Alive und Archiv
+    richten sich nach konfiguriere_http().
+    """
+    if httpx is None:
+        raise RuntimeError("Die asyncio-Engine benötigt httpx (pip install httpx)")
+    limits = httpx.Limits(max_connections=max_verbindungen,
+                          max_keepalive_connections=max_verbindungen if base.KEEP_ALIVE else 0)
+    if base.ARCHIV is None:
+        return httpx.AsyncClient(follow_redirects=True, limits=limits)
+    # Beim Abspielen ohne Netz; beim Aufzeichnen über einen echten Transport
+    # (ein eigener Transport übernimmt die Limits nicht vom Client)
+    echt = None if base.ARCHIV.abspielen else httpx.AsyncHTTPTransport(limits=limits)
+    return httpx.AsyncClient(follow_redirects=True, transport=ArchivTransport(base.ARCHIV, echt))
+
+
+class AsyncAbrufPlaner(AbrufPlaner):
+    """Führt die Aufgaben des AbrufPlaners mit asyncio statt mit einem Thread-Pool aus.
+
+    Jede Aufgabe läuft als Coroutine über einen gemeinsamen httpx.AsyncClient.
+    Begrenzt wird durch ein Semaphor für alle Abrufe (max_parallel, ohne
+    Thread-Kosten auch im Hunderterbereich) und dieselbe adaptive Drossel
+    pro Host wie bei der Thread-Engine. Geparst wird mit denselben Parsern wie bei der
+    Thread-Engine, mit parse_prozesse > 0 im Prozess-Pool, sonst in
+    Worker-Threads; Parser und Cache-Dateien blockieren die Event-Loop
+    also nie. Scraper ohne eigene Async-Variante laufen ganz in einem
+    Worker-Thread.
+    """
+
+    def ausfuehren(self, bei_monat_fertig: Callable[[int, int, list[Termin], list[str]], None] | None = None
+                   ) -> list[str]:
+        """Führt alle Aufgaben in einer eigenen Event-Loop aus (siehe AbrufPlaner.ausfuehren)."""
+        return asyncio.run(self.ausfuehren_async(bei_monat_fertig))
+
+    async def ausfuehren_async(self, bei_monat_fertig: Callable[[int, int, list[Termin], list[str]], None] | None = None
+                               ) -> list[str]:
+        """Führt alle Aufgaben aus; bei_monat_fertig wird in der Event-Loop aufgerufen."""
+        fortschritt = Fortschritt(self.monate, self.aufgaben, bei_monat_fertig)
+        gesamt = asyncio.Semaphore(self.max_parallel)
+        # Wartende Aufgaben eines Hosts werden geweckt, sobald er einen Platz freigibt
+        frei = {host: asyncio.Condition() for host in self.drosseln}
+
+        @asynccontextmanager
+        async def host_platz(host: str):
+            drossel = self.drosseln[host]
+            async with frei[host]:
+                while not drossel.hat_platz():
+                    try:
+                        # Pausierte Hosts (Retry-After) werden ohne Freigabe wieder frei
+                        await asyncio.wait_for(frei[host].wait(), drossel.wartezeit() or None)
+                    except TimeoutError:
+                        pass
+                drossel.belege()
+            try:
+                yield
+            finally:
+                drossel.freigeben()
+                async with frei[host]:
+                    frei[host].notify_all()
+
+        async with neuer_async_client(self.max_parallel) as client:
+            async def starte(aufgabe: Aufgabe):
+                # Erst den Host-Platz, dann den globalen, damit wartende
+                # Aufgaben eines ausgelasteten Hosts keine globalen Plätze belegen
+                while True:
+                    try:
+                        async with host_platz(aufgabe.scraper.host), gesamt:
+                            ergebnis = await aufgabe.ausfuehren_async(client)
+                        # Auf den Parse-Pool erst nach Freigabe der Abruf-Plätze warten
+                        await asyncio.gather(*(asyncio.wrap_future(f) for f in parse_auftraege(ergebnis)),
+                                             return_exceptions=True)
+                        fortschritt.verbuche(aufgabe, ergebnis)
+                    except Exception as e:
+                        fortschritt.fehler(aufgabe, e)
+                        fortschritt.melde_fertige_monate()
+                        # Wiederholung ohne belegte Plätze abwarten
+                        pause = self.plane_wiederholung(aufgabe)
+                        if pause is None:
+                            return
+                        await asyncio.sleep(pause)
+                        continue
+                    fortschritt.melde_fertige_monate()
+                    return
+
+            fortschritt.melde_fertige_monate()
+            with parse_pool(self.parse_prozesse), host_drosseln(self.drosseln):
+                await asyncio.gather(*(starte(aufgabe) for aufgabe in self.aufgaben))
+
+        return fortschritt.fehler_staedte()
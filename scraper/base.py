@@ -1,29 +1,210 @@
 """Basis-Klassen für die Ratsinformationssystem-Scraper."""
 
-from dataclasses import dataclass
-from datetime import datetime
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+import requests
+from array import array
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future, FIRST_COMPLETED, wait
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from .archiv import Archiv, ArchivAdapter
+from .cache import GestreamterBody, HttpCache, ParseCache, beim_lesen, hashe_beim_lesen
+from .drossel import HostDrossel
+from .messung import Laufprotokoll, aktuelle_messung, parse_im_pool, parse_zeit
+from .politik import AbrufPolitik, FristAbgelaufen, VORUEBERGEHENDE_FEHLER, VORUEBERGEHENDE_STATUS
 
 
-@dataclass
+# Verbindungspool pro Host (einstellbar über konfiguriere_http)
+POOL_GROESSE = 10
+KEEP_ALIVE = True
+# Größe der Stücke, in denen gestreamte Antworten gelesen werden (Bytes)
+STREAM_STUECK = 64 * 1024
+# Archiv, in das alle Antworten aufgezeichnet oder aus dem sie abgespielt
+# werden (None = direkt über das Netz)
+ARCHIV: Archiv | None = None
+
+_http_lock = threading.Lock()
+_adapter_pro_host: dict[str, HTTPAdapter] = {}
+_session_pro_host: dict[str, requests.Session] = {}
+
+
+def konfiguriere_http(pool_groesse: int | None = None, keep_alive: bool | None = None,
+                      archiv: Archiv | None = None):
+    """Stellt Poolgröße, Keep-Alive und Archiv für alle künftig erzeugten Verbindungspools ein.
+
+    Bereits bestehende Pools werden verworfen, damit die neuen Werte greifen.
+    """
+    global POOL_GROESSE, KEEP_ALIVE, ARCHIV
+    with _http_lock:
+        if pool_groesse is not None:
+            POOL_GROESSE = max(1, pool_groesse)
+        if keep_alive is not None:
+            KEEP_ALIVE = keep_alive
+        if archiv is not None:
+            ARCHIV = archiv
+        for session in _session_pro_host.values():
+            session.close()
+        _session_pro_host.clear()
+        _adapter_pro_host.clear()
+
+
+def _host_adapter(host: str) -> HTTPAdapter:
+    """Gibt den gemeinsamen Verbindungspool eines Hosts zurück (Lock muss gehalten werden)."""
+    adapter = _adapter_pro_host.get(host)
+    if adapter is None:
+        if ARCHIV is not None:
+            adapter = ArchivAdapter(ARCHIV, pool_connections=1, pool_maxsize=POOL_GROESSE)
+        else:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_GROESSE)
+        _adapter_pro_host[host] = adapter
+    return adapter
+
+
+def _erstelle_session(host: str) -> requests.Session:
+    """Erstellt eine Session, die den Verbindungspool des Hosts nutzt (Lock muss gehalten werden)."""
+    session = requests.Session()
+    adapter = _host_adapter(host)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def http_session(url: str) -> requests.Session:
+    """Gibt die gemeinsame Session für den Host der URL zurück.
+
+    Alle Scraper eines Hosts (z.B. die Kommunen auf sessionnet.owl-it.de)
+    teilen sich dieselben Keep-Alive-Verbindungen.
+    """
+    host = urlparse(url).netloc.lower()
+    with _http_lock:
+        session = _session_pro_host.get(host)
+        if session is None:
+            session = _erstelle_session(host)
+            _session_pro_host[host] = session
+        return session
+
+
+def neue_http_session(url: str) -> requests.Session:
+    """Erstellt eine Session mit eigenen Cookies, aber dem gemeinsamen Verbindungspool des Hosts.
+
+    Für zustandsbehaftete Abrufe (z.B. Wicket-Sessions bei ALLRIS).
+    """
+    host = urlparse(url).netloc.lower()
+    with _http_lock:
+        return _erstelle_session(host)
+
+
+WOCHENTAGE = ('Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So')
+
+
+@lru_cache(maxsize=None)
+def _datum_text(tag: int) -> str:
+    """Deutsches Datum (z.B. "Mo, 02.03.2026") zum Ordinaltag; pro Kalendertag nur einmal formatiert."""
+    d = date.fromordinal(tag)
+    return f"{WOCHENTAGE[d.weekday()]}, {d:%d.%m.%Y}"
+
+
+@dataclass(slots=True, frozen=True)
 class Termin:
-    """Ein Sitzungstermin."""
+    """Ein Sitzungstermin (unveränderlich).
+
+    stadt und gremium werden interniert, sodass alle Termine einer Stadt
+    bzw. eines Gremiums denselben String teilen. Sortiert wird mit dem beim
+    Anlegen berechneten sortierschluessel: nach Datum, gleichzeitige
+    Termine nach Stadt, Gremium und Link (termine.sort(key=termin_schluessel)).
+    """
     stadt: str
     datum: datetime
     uhrzeit: str
     gremium: str
     ort: str
     link: str
+    sortierschluessel: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # str(): Parser liefern teils NavigableStrings, die den ganzen Baum festhalten
+        stadt = sys.intern(str(self.stadt))
+        gremium = sys.intern(str(self.gremium))
+        object.__setattr__(self, 'stadt', stadt)
+        object.__setattr__(self, 'gremium', gremium)
+        object.__setattr__(self, 'sortierschluessel', (self.datum, stadt, gremium, self.link))
 
-    def __lt__(self, other):
-        """Sortierung nach Datum."""
-        return self.datum < other.datum
+    def __reduce__(self):
+        # Ohne Sortierschlüssel übertragen (Parse-Pool); beim Laden wird neu interniert
+        return Termin, (self.stadt, self.datum, self.uhrzeit, self.gremium, self.ort, self.link)
 
     def datum_formatiert(self) -> str:
         """Gibt das Datum im deutschen Format zurück."""
-        wochentage = ['Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa', 'So']
-        wt = wochentage[self.datum.weekday()]
-        return f"{wt}, {self.datum.strftime('%d.%m.%Y')}"
+        return _datum_text(self.datum.toordinal())
+
+
+# Sortierschlüssel für list.sort()/sorted() über Termine
+termin_schluessel = attrgetter('sortierschluessel')
+
+# Spalten von TerminBatch, die als Index in eine Wertetabelle abgelegt werden
+_KODIERTE_SPALTEN = ('stadt', 'uhrzeit', 'gremium', 'ort')
+
+
+class TerminBatch:
+    """Spaltenweise Ablage vieler Termine, z.B. für mehrjährige Bereiche.
+
+    Statt eines Objekts pro Termin gibt es eine Spalte pro Feld: Stadt,
+    Uhrzeit, Gremium und Ort als Index in eine Tabelle der vorkommenden
+    Werte (array 'I'), das Datum als Sekunden seit dem 1.1.0001 (array 'q'),
+    nur die Links als Liste. Termin-Objekte entstehen erst beim Lesen.
+    """
+
+    __slots__ = ('_werte', '_codes', '_spalten', '_sekunden', '_links')
+
+    def __init__(self, termine=()):
+        self._werte: dict[str, list[str]] = {spalte: [] for spalte in _KODIERTE_SPALTEN}
+        self._codes: dict[str, dict[str, int]] = {spalte: {} for spalte in _KODIERTE_SPALTEN}
+        self._spalten = {spalte: array('I') for spalte in _KODIERTE_SPALTEN}
+        self._sekunden = array('q')
+        self._links: list[str] = []
+        self.erweitere(termine)
+
+    def __len__(self) -> int:
+        return len(self._sekunden)
+
+    def __getitem__(self, i: int) -> Termin:
+        werte = [self._werte[spalte][self._spalten[spalte][i]] for spalte in _KODIERTE_SPALTEN]
+        sekunden = self._sekunden[i]
+        datum = datetime.fromordinal(sekunden // 86400) + timedelta(seconds=sekunden % 86400)
+        stadt, uhrzeit, gremium, ort = werte
+        return Termin(stadt=stadt, datum=datum, uhrzeit=uhrzeit, gremium=gremium, ort=ort,
+                      link=self._links[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def anhaengen(self, termin: Termin):
+        for spalte in _KODIERTE_SPALTEN:
+            wert = getattr(termin, spalte)
+            codes = self._codes[spalte]
+            code = codes.get(wert)
+            if code is None:
+                code = codes[wert] = len(codes)
+                self._werte[spalte].append(wert)
+            self._spalten[spalte].append(code)
+        d = termin.datum
+        self._sekunden.append(d.toordinal() * 86400 + d.hour * 3600 + d.minute * 60 + d.second)
+        self._links.append(termin.link)
+
+    def erweitere(self, termine):
+        for termin in termine:
+            self.anhaengen(termin)
 
 
 class BaseScraper(ABC):
@@ -32,8 +213,644 @@ class BaseScraper(ABC):
     def __init__(self, stadt_name: str, base_url: str):
         self.stadt_name = stadt_name
         self.base_url = base_url
+        self.host = urlparse(base_url).netloc.lower()
+
+    # True, wenn hole_termine_bereich() mehrere Monate mit einem einzigen
+    # Abruf liefert (z.B. iCal-Feeds) und daher pro Lauf nur einmal
+    # aufgerufen werden sollte.
+    BEREICHSABRUF = False
+
+    # Persistente Caches für alle Scraper (None = kein Cache)
+    http_cache: HttpCache | None = None
+    parse_cache: ParseCache | None = None
+
+    # Prozess-Pool für die Parser (None = im abrufenden Thread parsen);
+    # wird vom AbrufPlaner für die Dauer eines Laufs gesetzt
+    parse_pool: Executor | None = None
+
+    # JSON-Lines-Protokoll mit Zeiten und Bytes jeder Aufgabe (None = keine
+    # Messung); die Hooks _http_get/_http_get_async/_parse_gecacht verbuchen
+    # in die Messung der laufenden Aufgabe
+    laufprotokoll: Laufprotokoll | None = None
+
+    # Adaptive Parallelitätsgrenzen pro Host; wird vom AbrufPlaner für die
+    # Dauer eines Laufs gesetzt, die Request-Hooks melden Status und Latenz
+    drosseln: dict[str, HostDrossel] | None = None
+
+    # Wiederholung, Zeitbudget und Hedging einzelner Requests
+    politik: AbrufPolitik = AbrufPolitik()
+
+    # Threads, in denen die Thread-Engine Requests absichert (Hedging);
+    # wird vom AbrufPlaner für die Dauer eines Laufs gesetzt (None = ohne)
+    hedge_pool: Executor | None = None
+
+    # Erhöhen, wenn sich das Parse-Ergebnis für gleiche Eingaben ändert
+    # (macht gespeicherte Parse-Ergebnisse ungültig)
+    PARSER_VERSION = 1
+
+    def _get(self, url: str, headers: dict | None = None, timeout: float = 15,
+             session: requests.Session | None = None, cache: bool = True,
+             cache_schluessel: str | None = None, stream: bool = False,
+             idempotent: bool = True) -> requests.Response:
+        """Führt einen GET-Request über den gemeinsamen Verbindungspool des Hosts aus.
+
+        Ist ein http_cache gesetzt, werden bedingte Requests gesendet und bei
+        304 (oder innerhalb der TTL) der gespeicherte Body zurückgegeben.
+        Wiederholungen, Zeitbudget und Hedging richten sich nach politik.
+
+        Args:
+            cache: False für zustandsbehaftete Requests, die nie aus dem Cache kommen dürfen
+            cache_schluessel: Abweichender Cache-Schlüssel (Standard: die URL)
+            stream: Body erst beim Lesen laden; mit http_cache geht er dabei
+                direkt in die Cache-Datei (siehe _parse_gestreamt)
+            idempotent: False für Requests, die den Zustand auf dem Server
+                ändern (z.B. Wicket-Navigation); sie werden weder wiederholt
+                noch doppelt gesendet
+        """
+        if session is None:
+            session = http_session(url)
+        http_cache = self.http_cache if cache else None
+        if http_cache is None:
+            return self._abruf(session, url, idempotent, headers=headers, timeout=timeout, stream=stream)
+
+        schluessel = cache_schluessel or url
+        eintrag, request_headers = self._vor_abruf(http_cache, schluessel, headers, mit_body=not stream)
+        if request_headers is None:
+            return eintrag.als_response()
+        response = self._abruf(session, url, idempotent, headers=request_headers, timeout=timeout, stream=stream)
+        return self._nach_abruf(http_cache, schluessel, eintrag, response, stream)
+
+    async def _get_async(self, client, url: str, headers: dict | None = None, timeout: float = 15,
+                         cache: bool = True, cache_schluessel: str | None = None, stream: bool = False,
+                         idempotent: bool = True):
+        """Async-Gegenstück zu _get() über einen httpx.AsyncClient (gleiche Cache-Logik).
+
+        Aus dem Cache kommt wie bei _get() eine requests.Response; beide
+        Antworttypen bieten text, encoding, status_code und raise_for_status().
+        Cache-Dateien werden in Worker-Threads gelesen und geschrieben, damit
+        die Event-Loop währenddessen andere Abrufe bedienen kann.
+        Mit stream=True wird der Body einer 200-Antwort Stück für Stück in
+        den HTTP-Cache (ohne Cache in eine temporäre Datei) geschrieben und
+        eine requests.Response zurückgegeben, die ihn erst beim Lesen aus der
+        Datei lädt, wie bei _get() mit stream=True.
+        """
+        http_cache = self.http_cache if cache else None
+        if http_cache is None:
+            response = await self._abruf_async(client, url, idempotent, headers=headers, timeout=timeout,
+                                               stream=stream)
+            return await self._lies_in_datei(None, url, response) if stream else response
+
+        schluessel = cache_schluessel or url
+        eintrag, request_headers = await asyncio.to_thread(self._vor_abruf, http_cache, schluessel, headers,
+                                                           not stream)
+        if request_headers is None:
+            return eintrag.als_response()
+        response = await self._abruf_async(client, url, idempotent, headers=request_headers, timeout=timeout,
+                                           stream=stream)
+        if stream and not (response.status_code == 304 and eintrag):
+            return await self._lies_in_datei(http_cache, schluessel, response)
+        if stream:
+            await response.aclose()
+        return await asyncio.to_thread(self._nach_abruf, http_cache, schluessel, eintrag, response)
+
+    @staticmethod
+    async def _lies_in_datei(http_cache: HttpCache | None, schluessel: str, response):
+        """Liest eine gestreamte httpx-Antwort in den HTTP-Cache bzw. eine temporäre Datei (siehe _get_async).
+
+        Andere Antworten als 200 werden vollständig gelesen und unverändert
+        zurückgegeben.
+        """
+        if response.status_code != 200:
+            await response.aread()
+            return response
+        body = await asyncio.to_thread(http_cache.neuer_body, schluessel) if http_cache is not None \
+            else await asyncio.to_thread(GestreamterBody)
+        start = time.perf_counter()
+        try:
+            async for stueck in response.aiter_bytes(STREAM_STUECK):
+                await asyncio.to_thread(body.schreibe, stueck)
+        except BaseException:
+            body.verwerfe()
+            raise
+        finally:
+            await response.aclose()
+        messung = aktuelle_messung()
+        if messung is not None:
+            messung.gelesen(body.groesse, time.perf_counter() - start)
+        if http_cache is None:
+            return body.als_response(response)
+        eintrag = await asyncio.to_thread(http_cache.uebernimm, schluessel, response, body)
+        return eintrag.als_response()
+
+    def _abruf(self, session: requests.Session, url: str, idempotent: bool, **kwargs) -> requests.Response:
+        """Führt einen Request nach politik aus: Zeitbudget, Wiederholungen und Hedging.
+
+        Nach dem letzten Versuch wird eine 429/5xx-Antwort zurückgegeben
+        (der Aufrufer prüft den Status), ein Verbindungsfehler weitergereicht.
+        """
+        politik = self.politik
+        versuch = 1
+        while True:
+            kwargs['timeout'] = politik.timeout(kwargs['timeout'])
+            try:
+                if idempotent:
+                    response = self._http_get_abgesichert(session, url, **kwargs)
+                else:
+                    response = self._http_get(session, url, **kwargs)
+            except VORUEBERGEHENDE_FEHLER:
+                if not idempotent or (pause := politik.naechste_pause(versuch)) is None:
+                    raise
+            else:
+                if not idempotent or response.status_code not in VORUEBERGEHENDE_STATUS:
+                    return response
+                if (pause := politik.naechste_pause(versuch, response.headers.get('Retry-After'))) is None:
+                    return response
+                response.close()
+            _zaehle_wiederholung()
+            time.sleep(pause)
+            versuch += 1
+
+    async def _abruf_async(self, client, url: str, idempotent: bool, **kwargs):
+        """Async-Gegenstück zu _abruf()."""
+        politik = self.politik
+        versuch = 1
+        while True:
+            kwargs['timeout'] = politik.timeout(kwargs['timeout'])
+            try:
+                if idempotent:
+                    response = await self._http_get_abgesichert_async(client, url, **kwargs)
+                else:
+                    response = await self._http_get_async(client, url, **kwargs)
+            except VORUEBERGEHENDE_FEHLER:
+                if not idempotent or (pause := politik.naechste_pause(versuch)) is None:
+                    raise
+            else:
+                if not idempotent or response.status_code not in VORUEBERGEHENDE_STATUS:
+                    return response
+                if (pause := politik.naechste_pause(versuch, response.headers.get('Retry-After'))) is None:
+                    return response
+                await response.aclose()
+            _zaehle_wiederholung()
+            await asyncio.sleep(pause)
+            versuch += 1
+
+    def _http_get_abgesichert(self, session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """_http_get() mit Hedging: ohne Antwort-Header nach der Hedge-Verzögerung läuft ein zweiter Request.
+
+        Beide Requests laufen gestreamt im hedge_pool (mit dem Kontext der
+        Aufgabe, also derselben Messung), damit nur die Zeit bis zu den
+        Headern zählt und ein langsamer Download keinen zweiten auslöst; die
+        erste erfolgreiche Antwort gewinnt, die andere wird beim Eintreffen
+        verworfen. Der zweite Request belegt einen Platz in der Drossel des
+        Hosts, bis beide fertig sind; ist keiner frei, gibt es keinen.
+        Ohne stream wird der Body der gewinnenden Antwort danach gelesen.
+        """
+        drossel = _drossel(url)
+        verzoegerung = self.politik.hedge_verzoegerung(drossel)
+        pool = self.hedge_pool
+        if verzoegerung is None or pool is None:
+            return self._http_get(session, url, **kwargs)
+
+        def starte(timeout: float) -> Future:
+            return pool.submit(contextvars.copy_context().run, self._http_get, session, url,
+                               **{**kwargs, 'timeout': timeout, 'stream': True})
+
+        laufend = {starte(kwargs['timeout'])}
+        fertig, _ = wait(laufend, timeout=verzoegerung)
+        zweitanfrage = False
+        if not fertig and (rest := _hedge_timeout(self.politik, kwargs['timeout'])) and drossel.versuche_belegen():
+            _zaehle_zweitanfrage()
+            zweitanfrage = True
+            laufend.add(starte(rest))
+        while True:
+            fertig, laufend = wait(laufend, return_when=FIRST_COMPLETED)
+            sieger = _erster_erfolg(fertig, laufend)
+            if sieger is not None:
+                break
+        verlierer = (fertig | laufend) - {sieger}
+        for future in verlierer:
+            future.add_done_callback(_verwerfe_antwort)
+        if zweitanfrage:
+            _freigeben_nach(verlierer, drossel)
+        response = sieger.result()
+        if not kwargs.get('stream'):
+            _lies_body(response)
+        return response
+
+    async def _http_get_abgesichert_async(self, client, url: str, **kwargs):
+        """Async-Gegenstück zu _http_get_abgesichert(); der langsamere Request wird abgebrochen."""
+        drossel = _drossel(url)
+        verzoegerung = self.politik.hedge_verzoegerung(drossel)
+        if verzoegerung is None:
+            return await self._http_get_async(client, url, **kwargs)
+
+        def starte(timeout: float) -> asyncio.Task:
+            return asyncio.ensure_future(self._http_get_async(client, url, **{**kwargs, 'timeout': timeout,
+                                                                              'stream': True}))
+
+        laufend = {starte(kwargs['timeout'])}
+        fertig, _ = await asyncio.wait(laufend, timeout=verzoegerung)
+        zweitanfrage = False
+        if not fertig and (rest := _hedge_timeout(self.politik, kwargs['timeout'])) and drossel.versuche_belegen():
+            _zaehle_zweitanfrage()
+            zweitanfrage = True
+            laufend.add(starte(rest))
+        sieger = None
+        try:
+            while sieger is None:
+                fertig, laufend = await asyncio.wait(laufend, return_when=asyncio.FIRST_COMPLETED)
+                sieger = _erster_erfolg(fertig, laufend)
+        finally:
+            for task in laufend:
+                task.cancel()
+            for task in fertig - {sieger}:
+                if not task.cancelled() and task.exception() is None:
+                    await task.result().aclose()
+            if zweitanfrage:
+                drossel.freigeben()
+        response = sieger.result()
+        if not kwargs.get('stream'):
+            start = time.perf_counter()
+            await response.aread()
+            messung = aktuelle_messung()
+            if messung is not None:
+                messung.gelesen(len(response.content), time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _http_get(session: requests.Session, url: str, **kwargs) -> requests.Response:
+        """Hook für jeden Request über das Netz: verbucht Zeiten und Bytes in der aktuellen Messung.
+
+        response.elapsed endet bei requests mit dem Empfang der Header (TTFB
+        inklusive Verbindungsaufbau), der Rest bis zum vollständigen Body
+        zählt als Download. Mit stream=True bleibt der Body ungelesen: seine
+        Bytes werden beim Lesen verbucht, die Zeit dafür zählt zu dem, der
+        ihn liest (beim zeilenweisen Parsen zur Parse-Zeit).
+        Status und TTFB gehen außerdem an die Drossel des Hosts.
+        """
+        messung = aktuelle_messung()
+        drossel = _drossel(url)
+        if messung is None and drossel is None:
+            return session.get(url, **kwargs)
+        start = time.perf_counter()
+        try:
+            response = session.get(url, **kwargs)
+        except Exception:
+            # Auch fehlgeschlagene Requests (z.B. Timeouts) kosten Zeit
+            vergangen = time.perf_counter() - start
+            if messung is not None:
+                messung.abruf(vergangen, vergangen, 0)
+            if drossel is not None:
+                drossel.melde(None, vergangen)
+            raise
+        ttfb = response.elapsed.total_seconds()
+        if drossel is not None:
+            drossel.melde(response.status_code, ttfb, response.headers.get('Retry-After'))
+        if messung is not None:
+            if kwargs.get('stream'):
+                messung.abruf(ttfb, ttfb, 0)
+                _zaehle_gelesene_bytes(response, messung)
+            else:
+                messung.abruf(ttfb, time.perf_counter() - start, len(response.content))
+        return response
+
+    @staticmethod
+    async def _http_get_async(client, url: str, **kwargs):
+        """Async-Gegenstück zu _http_get(); Verbindungsaufbau und TTFB über den httpx-Trace."""
+        messung = aktuelle_messung()
+        drossel = _drossel(url)
+        if messung is None and drossel is None:
+            return await _client_get(client, url, **kwargs)
+
+        ereignisse = {}
+
+        async def trace(name: str, info: dict):
+            ereignisse.setdefault(name, time.perf_counter())
+
+        start = time.perf_counter()
+        try:
+            response = await _client_get(client, url, extensions={'trace': trace}, **kwargs)
+        except Exception:
+            vergangen = time.perf_counter() - start
+            if messung is not None:
+                messung.abruf(vergangen, vergangen, 0)
+            if drossel is not None:
+                drossel.melde(None, vergangen)
+            raise
+        ende = time.perf_counter()
+
+        def dauer(schritt: str) -> float:
+            if f"{schritt}.complete" not in ereignisse:
+                return 0.0
+            return ereignisse[f"{schritt}.complete"] - ereignisse[f"{schritt}.started"]
+
+        verbindung = dauer('connection.connect_tcp') + dauer('connection.start_tls')
+        kopf = (ereignisse.get('http11.receive_response_headers.complete')
+                or ereignisse.get('http2.receive_response_headers.complete') or ende)
+        if drossel is not None:
+            drossel.melde(response.status_code, kopf - start, response.headers.get('Retry-After'))
+        if messung is not None:
+            if kwargs.get('stream'):
+                # Bytes und Download-Zeit verbucht, wer den Body liest (_lies_in_datei)
+                messung.abruf(kopf - start - verbindung, kopf - start - verbindung, 0, verbindung)
+            else:
+                messung.abruf(kopf - start - verbindung, ende - start - verbindung, len(response.content),
+                              verbindung)
+        return response
+
+    @staticmethod
+    def _vor_abruf(http_cache: HttpCache, schluessel: str, headers: dict | None, mit_body: bool = True):
+        """Gibt (eintrag, request_headers) zurück; request_headers None = Eintrag ist frisch."""
+        eintrag = http_cache.lade(schluessel, mit_body)
+        if eintrag and http_cache.ist_frisch(eintrag):
+            _zaehle_cache_treffer()
+            return eintrag, None
+        request_headers = dict(headers or {})
+        if eintrag:
+            request_headers.update(eintrag.bedingte_header())
+        return eintrag, request_headers
+
+    @staticmethod
+    def _nach_abruf(http_cache: HttpCache, schluessel: str, eintrag, response, stream: bool = False):
+        """Wertet die Antwort eines bedingten Requests aus (304 → gespeicherter Body).
+
+        Eine gestreamte 200-Antwort wird erst beim Lesen gespeichert.
+        """
+        if response.status_code == 304 and eintrag:
+            _zaehle_cache_treffer()
+            if stream:
+                response.close()
+            http_cache.bestaetige(schluessel, eintrag, response)
+            return eintrag.als_response()
+        if response.status_code == 200:
+            if stream:
+                http_cache.speichere_gestreamt(schluessel, response)
+            else:
+                http_cache.speichere(schluessel, response)
+        return response
+
+    async def _frisch_aus_cache_async(self, schluessel: str) -> requests.Response | None:
+        """_frisch_aus_cache() mit dem Lesen der Cache-Datei in einem Worker-Thread."""
+        if self.http_cache is None:
+            return None
+        return await asyncio.to_thread(self._frisch_aus_cache, schluessel)
+
+    def _frisch_aus_cache(self, schluessel: str) -> requests.Response | None:
+        """Gibt eine noch frische (TTL) Antwort aus dem Cache zurück, sonst None."""
+        if self.http_cache is None:
+            return None
+        eintrag = self.http_cache.lade(schluessel)
+        if eintrag and self.http_cache.ist_frisch(eintrag):
+            _zaehle_cache_treffer()
+            return eintrag.als_response()
+        return None
+
+    def _parse_gecacht(self, url: str, body: str, parser, *args):
+        """Ruft parser(body, *args) auf, außer das Ergebnis für diesen Body ist im Parse-Cache.
+
+        Ist ein parse_pool gesetzt, wird nicht im aufrufenden Thread geparst,
+        sondern ein Future des Pools zurückgegeben (siehe AbrufPlaner). Die
+        Parse-Zeit zählt in beiden Fällen zur aktuellen Messung.
+        """
+        if self.parse_cache is None:
+            if self.parse_pool is not None:
+                return parse_im_pool(self.parse_pool, parser, body, *args)
+            with parse_zeit():
+                return parser(body, *args)
+
+        schluessel = self._parse_schluessel(url, args)
+        body_hash = self.parse_cache.body_hash(body)
+        ergebnis = self.parse_cache.lade(schluessel, body_hash, self.stadt_name)
+        if ergebnis is not None:
+            return ergebnis
+        if self.parse_pool is not None:
+            future = parse_im_pool(self.parse_pool, parser, body, *args)
+            parse_cache = self.parse_cache
+
+            def speichere(f):
+                if f.exception() is None:
+                    parse_cache.speichere(schluessel, body_hash, f.result())
+
+            future.add_done_callback(speichere)
+            return future
+        with parse_zeit():
+            ergebnis = parser(body, *args)
+        self.parse_cache.speichere(schluessel, body_hash, ergebnis)
+        return ergebnis
+
+    def _parse_gestreamt(self, url: str, response: requests.Response, parser, *args):
+        """Wie _parse_gecacht(), aber parser(zeilen, *args) liest die Zeilen direkt aus einer gestreamten Antwort.
+
+        Der Body liegt nie vollständig im Speicher. Für den Parse-Cache wird
+        er auch nicht vorab gebraucht: kommt die Antwort aus dem HTTP-Cache,
+        ist ihr Hash bekannt (response.body_hash) und ein Treffer erspart das
+        Lesen ganz; sonst wird der Hash beim Lesen gebildet und das Ergebnis
+        danach gespeichert. Geparst wird immer im aufrufenden Thread, da ein
+        Prozess-Pool den ganzen Body bräuchte.
+        """
+        with response:
+            schluessel = self._parse_schluessel(url, args)
+            if self.parse_cache is not None:
+                if getattr(response, 'body_hash', None):
+                    ergebnis = self.parse_cache.lade(schluessel, response.body_hash, self.stadt_name)
+                    if ergebnis is not None:
+                        return ergebnis
+                elif not hasattr(response, 'body_hash'):
+                    # Weder aus dem HTTP-Cache noch auf dem Weg dorthin gehasht
+                    hashe_beim_lesen(response)
+            with parse_zeit():
+                ergebnis = parser(response.iter_lines(chunk_size=STREAM_STUECK, decode_unicode=True), *args)
+            if self.parse_cache is not None and response.body_hash:
+                self.parse_cache.speichere(schluessel, response.body_hash, ergebnis)
+            return ergebnis
+
+    async def _parse_gecacht_async(self, url: str, body: str, parser, *args):
+        """_parse_gecacht() für die asyncio-Engine: Parser und Parse-Cache laufen in einem Worker-Thread.
+
+        Auch ohne parse_pool blockieren so weder BeautifulSoup/lxml noch die
+        Dateizugriffe des Parse-Caches die Event-Loop; mit parse_pool kommt
+        wie bei _parse_gecacht() ein Future zurück.
+        """
+        return await asyncio.to_thread(self._parse_gecacht, url, body, parser, *args)
+
+    async def _parse_gestreamt_async(self, url: str, response: requests.Response, parser, *args):
+        """_parse_gestreamt() für die asyncio-Engine: Lesen und Parsen laufen in einem Worker-Thread."""
+        return await asyncio.to_thread(self._parse_gestreamt, url, response, parser, *args)
+
+    def _parse_schluessel(self, url: str, args: tuple) -> str:
+        """Schlüssel im Parse-Cache: Scraper-Typ, Parser-Version, Stadt, URL und Parameter."""
+        return f"{type(self).__name__}|{self.PARSER_VERSION}|{self.stadt_name}|{url}|{args!r}"
 
     @abstractmethod
     def hole_termine(self, jahr: int, monat: int) -> list[Termin]:
         """Holt alle Termine für einen bestimmten Monat."""
         pass
+
+    def hole_termine_bereich(self, start: tuple[int, int],
+                             ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Holt alle Termine von start bis einschließlich ende.
+
+        Args:
+            start: (jahr, monat) des ersten Monats
+            ende: (jahr, monat) des letzten Monats
+
+        Returns:
+            Dict von (jahr, monat) auf die Termine des Monats; ist nur ein
+            einzelner Monat nicht abrufbar, steht dort statt der Termine die
+            Ausnahme (der Planer meldet die Stadt dann nur dort als ausgefallen)
+        """
+        return {(j, m): self.hole_termine(j, m) for j, m in monate_im_bereich(start, ende)}
+
+    async def hole_termine_async(self, client, jahr: int, monat: int) -> list[Termin]:
+        """Async-Variante von hole_termine() für die asyncio-Engine.
+
+        Standard: die synchrone Variante in einem Worker-Thread. Scraper
+        überschreiben dies mit einem Abruf über den httpx.AsyncClient und
+        demselben Parser.
+        """
+        return await asyncio.to_thread(self.hole_termine, jahr, monat)
+
+    async def hole_termine_bereich_async(self, client, start: tuple[int, int],
+                                         ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Async-Variante von hole_termine_bereich()."""
+        return {(j, m): await self.hole_termine_async(client, j, m)
+                for j, m in monate_im_bereich(start, ende)}
+
+
+async def _client_get(client, url: str, stream: bool = False, **kwargs):
+    """client.get() mit stream wie bei requests: bei True kehrt es nach den Headern zurück."""
+    if not stream:
+        return await client.get(url, **kwargs)
+    return await client.send(client.build_request('GET', url, **kwargs), stream=True)
+
+
+def _drossel(url: str) -> HostDrossel | None:
+    """Drossel des Hosts der URL im laufenden Lauf (None = ohne Planer oder fremder Host)."""
+    drosseln = BaseScraper.drosseln
+    if not drosseln:
+        return None
+    return drosseln.get(urlparse(url).netloc.lower())
+
+
+def _zaehle_wiederholung():
+    messung = aktuelle_messung()
+    if messung is not None:
+        messung.wiederholungen += 1
+
+
+def _zaehle_zweitanfrage():
+    messung = aktuelle_messung()
+    if messung is not None:
+        messung.zweitanfragen += 1
+
+
+def _hedge_timeout(politik: AbrufPolitik, timeout: float) -> float | None:
+    """Timeout des zweiten Requests beim Hedging (None = Zeitbudget aufgebraucht, kein Hedge)."""
+    try:
+        return politik.timeout(timeout)
+    except FristAbgelaufen:
+        return None
+
+
+def _erster_erfolg(fertig: set, laufend: set):
+    """Beim Hedging: der erfolgreiche fertige Request, sonst der fehlgeschlagene, wenn keiner mehr läuft.
+
+    Returns:
+        Future bzw. Task, dessen result() zurückgegeben wird, oder None (weiter warten)
+    """
+    erfolgreich = [future for future in fertig if future.exception() is None]
+    if erfolgreich:
+        return erfolgreich[0]
+    return next(iter(fertig)) if not laufend else None
+
+
+def _verwerfe_antwort(future: Future):
+    """Schließt die Antwort eines beim Hedging unterlegenen Requests."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _freigeben_nach(futures: set, drossel: HostDrossel):
+    """Gibt den Platz einer Zweitanfrage frei, sobald alle futures fertig sind."""
+    offen = len(futures)
+    lock = threading.Lock()
+
+    def fertig(_):
+        nonlocal offen
+        with lock:
+            offen -= 1
+            if offen:
+                return
+        drossel.freigeben()
+
+    if not futures:
+        drossel.freigeben()
+    for future in futures:
+        future.add_done_callback(fertig)
+
+
+def _lies_body(response: requests.Response):
+    """Liest den Body einer gestreamten Antwort; die Zeit dafür zählt als Download."""
+    start = time.perf_counter()
+    response.content
+    messung = aktuelle_messung()
+    if messung is not None:
+        messung.gelesen(0, time.perf_counter() - start)
+
+
+def _zaehle_gelesene_bytes(response: requests.Response, messung):
+    """Verbucht die Bytes einer gestreamten Antwort erst, wenn sie gelesen werden.
+
+    Die Bytes zählen vor dem Dekodieren wie bei len(response.content).
+    """
+    beim_lesen(response, lambda stueck: messung.gelesen(len(stueck)))
+
+
+def _zaehle_cache_treffer():
+    """Verbucht eine Antwort aus dem HTTP-Cache (frisch oder per 304) in der aktuellen Messung."""
+    messung = aktuelle_messung()
+    if messung is not None:
+        messung.aus_cache += 1
+
+
+def hat_klasse(elem, klasse: str) -> bool:
+    """Prüft, ob ein lxml-Element die CSS-Klasse trägt."""
+    return klasse in elem.get('class', '').split()
+
+
+def text_aus_element(elem, trenner: str = '') -> str:
+    """Gibt den Text eines lxml-Elements zurück (wie get_text(trenner, strip=True) in BeautifulSoup).
+
+    Kommentare sowie Inhalte von <script>/<style> werden übersprungen, leere
+    Textstücke entfernt.
+    """
+    teile = []
+
+    def sammle(e):
+        if e.text:
+            t = e.text.strip()
+            if t:
+                teile.append(t)
+        for kind in e:
+            if isinstance(kind.tag, str) and kind.tag not in ('script', 'style'):
+                sammle(kind)
+            if kind.tail:
+                t = kind.tail.strip()
+                if t:
+                    teile.append(t)
+
+    sammle(elem)
+    return trenner.join(teile)
+
+
+def monate_im_bereich(start: tuple[int, int], ende: tuple[int, int]) -> list[tuple[int, int]]:
+    """Gibt alle (jahr, monat) Tupel von start bis einschließlich ende zurück."""
+    monate = []
+    jahr, monat = start
+    while (jahr, monat) <= ende:
+        monate.append((jahr, monat))
+        monat += 1
+        if monat > 12:
+            monat = 1
+            jahr += 1
+    return monate
@@ -0,0 +1,385 @@
+"""Persistente Caches: HTTP-Antworten (ETag/Last-Modified) und Parse-Ergebnisse."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Antwort-Header, die mit dem Body gespeichert werden
+GESPEICHERTE_HEADER = ('Content-Type', 'ETag', 'Last-Modified', 'Date')
+
+
+@dataclass
+class CacheEintrag:
+    """Eine gespeicherte HTTP-Antwort samt Validatoren.
+
+    Ohne body (geladen mit mit_body=False) liest die Antwort den Body erst
+    beim Lesen aus der Datei body_pfad.
+    """
+    url: str
+    body: bytes | None
+    headers: dict[str, str] = field(default_factory=dict)
+    encoding: str | None = None
+    zeitpunkt: float = 0.0
+    body_pfad: str = ''
+    body_hash: str | None = None  # SHA-256 des Bodys (fehlt bei Einträgen älterer Versionen)
+
+    @property
+    def etag(self) -> str | None:
+        return self.headers.get('ETag')
+
+    @property
+    def last_modified(self) -> str | None:
+        return self.headers.get('Last-Modified')
+
+    def hat_validatoren(self) -> bool:
+        """True, wenn der Server ETag oder Last-Modified geliefert hat."""
+        return bool(self.etag or self.last_modified)
+
+    def alter(self) -> float:
+        """Alter des Eintrags in Sekunden."""
+        return time.time() - self.zeitpunkt
+
+    def bedingte_header(self) -> dict[str, str]:
+        """Header für einen bedingten Request (If-None-Match/If-Modified-Since)."""
+        header = {}
+        if self.etag:
+            header['If-None-Match'] = self.etag
+        if self.last_modified:
+            header['If-Modified-Since'] = self.last_modified
+        return header
+
+    def als_response(self) -> requests.Response:
+        """Baut aus dem Eintrag eine Response, wie sie requests liefern würde."""
+        response = requests.Response()
+        response.status_code = 200
+        response.url = self.url
+        if self.body is None:
+            # Wie eine gestreamte Antwort: der Body wird erst beim Lesen geladen
+            datei = open(self.body_pfad, 'rb')
+            response.raw = datei
+            beim_lesen(response, am_ende=lambda vollstaendig: datei.close())
+        else:
+            response._content = self.body
+            response._content_consumed = True
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response.aus_cache = True
+        if self.body_hash:
+            response.body_hash = self.body_hash
+        return response
+
+
+class HttpCache:
+    """Speichert Antworten auf der Platte und prüft sie per bedingtem Request.
+
+    Liefert der Server ETag oder Last-Modified, wird bei jedem Abruf
+    If-None-Match/If-Modified-Since gesendet und bei 304 der gespeicherte
+    Body verwendet. Für Server ohne Validatoren gilt ein Eintrag stattdessen
+    ttl Sekunden lang als frisch und wird ohne Request verwendet (ttl=0
+    schaltet das ab). Ist frisch_ab gesetzt, gelten alle Einträge, die seit
+    diesem Zeitpunkt gespeichert oder bestätigt wurden, ebenfalls als frisch
+    (z.B. damit ein Lauf denselben Feed nur einmal abruft).
+    """
+
+    def __init__(self, verzeichnis: str, ttl: float = 0):
+        self.verzeichnis = verzeichnis
+        self.ttl = ttl
+        self.frisch_ab: float | None = None
+        os.makedirs(verzeichnis, exist_ok=True)
+
+    def _pfad(self, schluessel: str) -> str:
+        h = hashlib.sha256(schluessel.encode('utf-8')).hexdigest()
+        return os.path.join(self.verzeichnis, h[:2], h)
+
+    def lade(self, schluessel: str, mit_body: bool = True) -> CacheEintrag | None:
+        """Lädt einen Eintrag oder None, falls keiner (lesbar) vorhanden ist.
+
+        Args:
+            mit_body: False = Body nicht in den Speicher laden, die Antwort
+                des Eintrags liest ihn dann aus der Datei
+        """
+        pfad = self._pfad(schluessel)
+        try:
+            with open(pfad + '.json', encoding='utf-8') as f:
+                meta = json.load(f)
+            if mit_body:
+                with open(pfad + '.body', 'rb') as f:
+                    body = f.read()
+            else:
+                body = None
+                if not os.path.isfile(pfad + '.body'):
+                    return None
+        except (OSError, ValueError):
+            return None
+        return CacheEintrag(url=meta['url'], body=body, headers=meta.get('headers', {}),
+                            encoding=meta.get('encoding'), zeitpunkt=meta.get('zeitpunkt', 0.0),
+                            body_pfad=pfad + '.body', body_hash=meta.get('sha256'))
+
+    def ist_frisch(self, eintrag: CacheEintrag) -> bool:
+        """True, wenn ein Eintrag ohne Validatoren noch innerhalb der TTL liegt (oder seit frisch_ab geschrieben wurde)."""
+        if self.frisch_ab is not None and eintrag.zeitpunkt >= self.frisch_ab:
+            return True
+        return self.ttl > 0 and not eintrag.hat_validatoren() and eintrag.alter() < self.ttl
+
+    def speichere(self, schluessel: str, response: requests.Response) -> CacheEintrag:
+        """Speichert eine erfolgreiche Antwort (requests oder httpx)."""
+        headers = {h: response.headers[h] for h in GESPEICHERTE_HEADER if h in response.headers}
+        eintrag = CacheEintrag(url=str(response.url), body=response.content, headers=headers,
+                               encoding=response.encoding, zeitpunkt=time.time(),
+                               body_pfad=self._pfad(schluessel) + '.body',
+                               body_hash=hashlib.sha256(response.content).hexdigest())
+        self._schreibe(schluessel, eintrag, mit_body=True)
+        return eintrag
+
+    def speichere_gestreamt(self, schluessel: str, response: requests.Response):
+        """Wie speichere(), aber für eine gestreamte requests-Antwort, ohne sie vorab zu lesen.
+
+        Der Body geht beim Lesen der Antwort Stück für Stück in die
+        Cache-Datei und in den SHA-256; der Eintrag wird erst übernommen,
+        wenn er vollständig gelesen ist (ein abgebrochenes Lesen hinterlässt
+        keinen). Danach steht der Hash in response.body_hash.
+        """
+        body = None
+
+        def stueck(daten: bytes):
+            nonlocal body
+            if body is None:
+                body = self.neuer_body(schluessel)
+            body.schreibe(daten)
+
+        def am_ende(vollstaendig: bool):
+            nonlocal body
+            if body is None:
+                body = self.neuer_body(schluessel)
+            if vollstaendig:
+                response.body_hash = self.uebernimm(schluessel, response, body).body_hash
+            else:
+                body.verwerfe()
+
+        response.body_hash = None
+        beim_lesen(response, stueck, am_ende)
+
+    def neuer_body(self, schluessel: str) -> 'GestreamterBody':
+        """Temporäre Datei für den Body eines Eintrags, im Verzeichnis des Eintrags."""
+        verzeichnis = os.path.dirname(self._pfad(schluessel))
+        os.makedirs(verzeichnis, exist_ok=True)
+        return GestreamterBody(verzeichnis)
+
+    def uebernimm(self, schluessel: str, response, body: 'GestreamterBody') -> CacheEintrag:
+        """Übernimmt einen vollständig geschriebenen Body (siehe neuer_body) als Eintrag (requests oder httpx)."""
+        pfad = self._pfad(schluessel)
+        headers = {h: response.headers[h] for h in GESPEICHERTE_HEADER if h in response.headers}
+        eintrag = CacheEintrag(url=str(response.url), body=None, headers=headers,
+                               encoding=response.encoding, zeitpunkt=time.time(),
+                               body_pfad=pfad + '.body', body_hash=body.body_hash)
+        body.verschiebe(eintrag.body_pfad)
+        self._schreibe(schluessel, eintrag, mit_body=False)
+        return eintrag
+
+    def bestaetige(self, schluessel: str, eintrag: CacheEintrag, response: requests.Response):
+        """Aktualisiert Zeitpunkt und Validatoren nach einer 304-Antwort."""
+        for h in ('ETag', 'Last-Modified', 'Date'):
+            if h in response.headers:
+                eintrag.headers[h] = response.headers[h]
+        eintrag.zeitpunkt = time.time()
+        self._schreibe(schluessel, eintrag, mit_body=False)
+
+    def _schreibe(self, schluessel: str, eintrag: CacheEintrag, mit_body: bool):
+        pfad = self._pfad(schluessel)
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        meta = {
+            'url': eintrag.url,
+            'headers': eintrag.headers,
+            'encoding': eintrag.encoding,
+            'zeitpunkt': eintrag.zeitpunkt,
+            'sha256': eintrag.body_hash,
+        }
+        # Body zuerst schreiben, damit Metadaten nie auf einen fehlenden Body zeigen
+        if mit_body:
+            _schreibe_atomar(pfad + '.body', eintrag.body)
+        _schreibe_atomar(pfad + '.json', json.dumps(meta).encode('utf-8'))
+
+
+class ParseCache:
+    """Speichert Parse-Ergebnisse, damit unveränderte Quellen nicht erneut geparst werden.
+
+    Pro (Scraper-Typ, URL, Parameter) wird genau ein Ergebnis zusammen mit
+    dem Hash des geparsten Bodys abgelegt. Ein Treffer setzt voraus, dass der
+    Body byte-gleich ist. Termine werden kompakt als Zeilen
+    [datum, uhrzeit, gremium, ort, link] gespeichert; die Stadt ergibt sich
+    aus dem Scraper.
+    """
+
+    def __init__(self, verzeichnis: str):
+        self.verzeichnis = verzeichnis
+        os.makedirs(verzeichnis, exist_ok=True)
+
+    @staticmethod
+    def body_hash(body: str | bytes) -> str:
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        return hashlib.sha256(body).hexdigest()
+
+    def _pfad(self, schluessel: str) -> str:
+        h = hashlib.sha256(schluessel.encode('utf-8')).hexdigest()
+        return os.path.join(self.verzeichnis, h[:2], h + '.json')
+
+    def lade(self, schluessel: str, body_hash: str, stadt: str):
+        """Gibt das gespeicherte Ergebnis zurück, wenn es zum Body-Hash passt, sonst None."""
+        try:
+            with open(self._pfad(schluessel), encoding='utf-8') as f:
+                daten = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if daten.get('hash') != body_hash:
+            return None
+        if 'monate' in daten:
+            return {tuple(int(x) for x in k.split('-')): _zu_terminen(zeilen, stadt)
+                    for k, zeilen in daten['monate'].items()}
+        return _zu_terminen(daten['termine'], stadt)
+
+    def speichere(self, schluessel: str, body_hash: str, ergebnis):
+        """Speichert eine Termin-Liste oder ein Dict von (jahr, monat) auf Termin-Listen."""
+        daten = {'hash': body_hash}
+        if isinstance(ergebnis, dict):
+            daten['monate'] = {f"{j}-{m}": _zu_zeilen(termine) for (j, m), termine in ergebnis.items()}
+        else:
+            daten['termine'] = _zu_zeilen(ergebnis)
+        pfad = self._pfad(schluessel)
+        os.makedirs(os.path.dirname(pfad), exist_ok=True)
+        _schreibe_atomar(pfad, json.dumps(daten, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+class GestreamterBody:
+    """Nimmt einen Body Stück für Stück auf: in eine temporäre Datei und in den SHA-256.
+
+    Args:
+        verzeichnis: Ablage der Datei, die später per verschiebe() an ihren
+            Platz kommt (None = anonyme Datei, die nur gelesen wird)
+    """
+
+    def __init__(self, verzeichnis: str | None = None):
+        if verzeichnis is None:
+            self.pfad = None
+            self.datei = tempfile.TemporaryFile()
+        else:
+            fd, self.pfad = tempfile.mkstemp(dir=verzeichnis, prefix='.tmp-')
+            self.datei = os.fdopen(fd, 'w+b')
+        self._hash = hashlib.sha256()
+        self.groesse = 0
+
+    def schreibe(self, stueck: bytes):
+        self.datei.write(stueck)
+        self._hash.update(stueck)
+        self.groesse += len(stueck)
+
+    @property
+    def body_hash(self) -> str:
+        return self._hash.hexdigest()
+
+    def verschiebe(self, ziel: str):
+        """Schließt die Datei und legt sie unter ziel ab."""
+        self.datei.close()
+        os.replace(self.pfad, ziel)
+
+    def verwerfe(self):
+        self.datei.close()
+        if self.pfad is not None:
+            try:
+                os.unlink(self.pfad)
+            except OSError:
+                pass
+
+    def als_response(self, response) -> requests.Response:
+        """Eine requests-Antwort mit Status, Headern und URL von response, die den Body aus der Datei liest."""
+        self.datei.seek(0)
+        antwort = requests.Response()
+        antwort.status_code = response.status_code
+        antwort.url = str(response.url)
+        antwort.headers = CaseInsensitiveDict(response.headers)
+        antwort.encoding = response.encoding
+        antwort.raw = self.datei
+        antwort.body_hash = self.body_hash
+        beim_lesen(antwort, am_ende=lambda vollstaendig: self.verwerfe())
+        return antwort
+
+
+def beim_lesen(response: requests.Response, bei_stueck=None, am_ende=None):
+    """Beobachtet das Lesen einer gestreamten requests-Antwort.
+
+    Umhüllt response.iter_content, worüber auch iter_lines, content und text
+    lesen. bei_stueck(stueck) bekommt jedes gelesene Stück (dekomprimiert,
+    vor dem Dekodieren), am_ende(vollstaendig) läuft nach dem letzten Stück
+    oder wenn das Lesen abbricht.
+    """
+    iter_content = response.iter_content
+
+    def gelesen(chunk_size: int | None = 1, decode_unicode: bool = False):
+        def stuecke():
+            vollstaendig = False
+            try:
+                for stueck in iter_content(chunk_size):
+                    if bei_stueck is not None:
+                        bei_stueck(stueck)
+                    yield stueck
+                vollstaendig = True
+            finally:
+                if am_ende is not None:
+                    am_ende(vollstaendig)
+        if decode_unicode:
+            return requests.utils.stream_decode_response_unicode(stuecke(), response)
+        return stuecke()
+
+    response.iter_content = gelesen
+
+
+def hashe_beim_lesen(response: requests.Response):
+    """Bildet den SHA-256 einer gestreamten Antwort beim Lesen; danach steht er in response.body_hash."""
+    body_hash = hashlib.sha256()
+
+    def am_ende(vollstaendig: bool):
+        if vollstaendig:
+            response.body_hash = body_hash.hexdigest()
+
+    response.body_hash = None
+    beim_lesen(response, body_hash.update, am_ende)
+
+
+def _zu_zeilen(termine) -> list[list[str]]:
+    return [[t.datum.isoformat(), t.uhrzeit, t.gremium, t.ort, t.link] for t in termine]
+
+
+def _zu_terminen(zeilen: list[list[str]], stadt: str):
+    from .base import Termin
+    return [Termin(stadt=stadt, datum=datetime.fromisoformat(d), uhrzeit=u, gremium=g, ort=o, link=l)
+            for d, u, g, o, l in zeilen]
+
+
+def _schreibe_atomar(pfad: str, daten: bytes, modus: int | None = None):
+    """Schreibt eine Datei über eine temporäre Datei und os.replace.
+
+    Args:
+        modus: Dateirechte, z.B. 0o644 für veröffentlichte Dateien (Standard:
+            die 0600 von mkstemp, für Cache und Archiv)
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(pfad), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(daten)
+        if modus is not None:
+            os.chmod(tmp, modus)
+        os.replace(tmp, pfad)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,115 @@
+"""Adaptive Begrenzung paralleler Abrufe pro Host (z.B. sessionnet.owl-it.de mit mehreren Kommunen)."""
+
+import threading
+import time
+
+
+# Anteil, auf den die Grenze bei Fehlern (429, 5xx, Timeouts) bzw. bei stark
+# gestiegener Latenz sinkt
+SENKUNG_FEHLER = 0.5
+SENKUNG_LATENZ = 0.75
+# Latenz gilt als gestiegen, wenn ihr gleitender Mittelwert das Vielfache
+# der besten beobachteten Latenz übersteigt (Untergrenze gegen Messrauschen)
+LATENZ_FAKTOR = 3.0
+LATENZ_UNTERGRENZE = 0.1
+# Mindestabstand zwischen zwei Senkungen (Sekunden)
+MIN_FENSTER = 0.2
+# Längste Pause, die ein Retry-After-Header erzwingen kann (Sekunden)
+MAX_PAUSE = 60.0
+
+
+class HostDrossel:
+    """Obergrenze gleichzeitiger Aufgaben für einen Host, angepasst nach AIMD.
+
+    Die Grenze startet bei der Hälfte des Maximums und wächst mit jeder
+    erfolgreichen Antwort um 1/Grenze (also um eins pro "Runde"), bis das
+    Maximum (--pro-host) erreicht ist. Bei 429, 5xx oder Netzwerkfehlern
+    wird sie halbiert, bei stark gestiegener Latenz auf drei Viertel
+    gesenkt, höchstens einmal pro Latenzfenster, damit gleichzeitig
+    scheiternde Abrufe sie nicht mehrfach senken. Ein Retry-After pausiert
+    den Host ganz.
+
+    Belegt und freigegeben wird vom Planer, gemeldet aus den Request-Hooks
+    in BaseScraper (auch aus Worker-Threads); daher mit Lock.
+
+    Args:
+        maximum: Höchstzahl paralleler Aufgaben
+        adaptiv: False = feste Grenze maximum, Meldungen werden ignoriert
+    """
+
+    def __init__(self, maximum: int, adaptiv: bool = True):
+        self.maximum = max(1, maximum)
+        self.adaptiv = adaptiv
+        self.grenze = float(max(1, self.maximum // 2) if adaptiv else self.maximum)
+        self.aktiv = 0
+        self.latenz: float | None = None  # gleitender Mittelwert (Sekunden bis zu den Headern)
+        self.beste_latenz = float('inf')
+        self.fehlerquote = 0.0  # gleitender Anteil fehlgeschlagener Abrufe
+        self.anfragen = 0
+        self.fehler = 0
+        self.gesperrt_bis = 0.0
+        self._naechste_senkung = 0.0
+        self._lock = threading.Lock()
+
+    def hat_platz(self) -> bool:
+        """True, wenn eine weitere Aufgabe starten darf."""
+        with self._lock:
+            return self.aktiv < int(self.grenze) and time.monotonic() >= self.gesperrt_bis
+
+    def wartezeit(self) -> float:
+        """Sekunden bis zum Ende einer Pause (0 = nicht pausiert)."""
+        return max(0.0, self.gesperrt_bis - time.monotonic())
+
+    def belege(self):
+        with self._lock:
+            self.aktiv += 1
+
+    def versuche_belegen(self) -> bool:
+        """Belegt einen Platz, falls einer frei ist (für Zweitanfragen beim Hedging)."""
+        with self._lock:
+            if self.aktiv >= int(self.grenze) or time.monotonic() < self.gesperrt_bis:
+                return False
+            self.aktiv += 1
+            return True
+
+    def freigeben(self):
+        with self._lock:
+            self.aktiv -= 1
+
+    def melde(self, status: int | None, latenz: float, retry_after: str | None = None):
+        """Verbucht das Ergebnis eines Requests.
+
+        Args:
+            status: HTTP-Status oder None bei einem Netzwerkfehler (z.B. Timeout)
+            latenz: Sekunden bis zu den Antwort-Headern
+            retry_after: Retry-After-Header der Antwort (nur Sekunden werden ausgewertet)
+        """
+        if not self.adaptiv:
+            return
+        fehlgeschlagen = status is None or status == 429 or status >= 500
+        with self._lock:
+            jetzt = time.monotonic()
+            self.anfragen += 1
+            self.fehlerquote = 0.8 * self.fehlerquote + 0.2 * fehlgeschlagen
+            if fehlgeschlagen:
+                self.fehler += 1
+                self._senke(SENKUNG_FEHLER, jetzt)
+                if retry_after and retry_after.strip().isdigit():
+                    self.gesperrt_bis = max(self.gesperrt_bis, jetzt + min(float(retry_after), MAX_PAUSE))
+                return
+
+            self.latenz = latenz if self.latenz is None else 0.8 * self.latenz + 0.2 * latenz
+            self.beste_latenz = min(self.beste_latenz, latenz)
+            if self.latenz > LATENZ_FAKTOR * max(self.beste_latenz, LATENZ_UNTERGRENZE):
+                self._senke(SENKUNG_LATENZ, jetzt)
+            elif self.aktiv >= int(self.grenze):
+                # Grenze ausgeschöpft und Host antwortet: additiv hochfahren
+                self.grenze = min(float(self.maximum), self.grenze + 1 / self.grenze)
+
+    def _senke(self, faktor: float, jetzt: float):
+        """Senkt die Grenze, höchstens einmal pro Latenzfenster (Lock muss gehalten werden)."""
+        if jetzt < self._naechste_senkung:
+            return
+        self.grenze = max(1.0, self.grenze * faktor)
+        # Fenster: Antworten, die bei der Senkung schon unterwegs waren
+        self._naechste_senkung = jetzt + max(MIN_FENSTER, 2 * (self.latenz or 0.0))
@@ -0,0 +1,185 @@
+"""Messpunkte pro Abruf (Stadt, Monat) und JSON-Lines-Laufprotokoll."""
+
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+
+
+# Messung der gerade ausgeführten Aufgabe; pro Thread bzw. asyncio-Task
+# getrennt, damit die Hooks in BaseScraper sie ohne Parameter finden
+_aktuelle_messung: ContextVar['Messung | None'] = ContextVar('aktuelle_messung', default=None)
+
+
+@dataclass
+class Messung:
+    """Zeiten und Datenmengen einer Aufgabe (eine Stadt, ein oder mehrere Monate).
+
+    Alle Zeiten in Sekunden, summiert über alle Requests der Aufgabe. Die
+    Verbindungszeit (DNS, TCP und TLS zusammen) liefert nur httpx (--async);
+    bei requests steckt sie in ttfb.
+    """
+    stadt: str
+    system: str
+    host: str
+    monate: list[str]
+    versuch: int = 0
+    anfragen: int = 0
+    aus_cache: int = 0  # Antworten aus dem HTTP-Cache (frisch oder 304)
+    wiederholungen: int = 0  # wiederholte Requests (AbrufPolitik)
+    zweitanfragen: int = 0  # zusätzliche Requests beim Hedging
+    bytes: int = 0
+    verbindung: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    parse: float = 0.0
+    termine: int = 0
+    dauer: float = 0.0
+    fehler: str | None = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+
+    def abruf(self, ttfb: float, gesamt: float, anzahl_bytes: int, verbindung: float = 0.0):
+        """Verbucht einen Request über das Netz."""
+        self.anfragen += 1
+        self.bytes += anzahl_bytes
+        self.verbindung += verbindung
+        self.ttfb += ttfb
+        self.download += max(0.0, gesamt - ttfb)
+
+    def gelesen(self, anzahl_bytes: int, dauer: float = 0.0):
+        """Verbucht Bytes (und Download-Zeit), die erst nach dem Request aus einer gestreamten Antwort gelesen werden."""
+        self.bytes += anzahl_bytes
+        self.download += dauer
+
+    def abschliessen(self, termine: int = 0, fehler: str | None = None):
+        """Setzt Ergebnis und Gesamtdauer (inklusive Warten auf den Parse-Pool)."""
+        self.termine = termine
+        self.fehler = fehler
+        self.dauer = time.perf_counter() - self._start
+
+    def als_dict(self) -> dict:
+        daten = asdict(self)
+        del daten['_start']
+        for name in ('verbindung', 'ttfb', 'download', 'parse', 'dauer'):
+            daten[name] = round(daten[name], 4)
+        return daten
+
+
+def aktuelle_messung() -> Messung | None:
+    """Die Messung der im aktuellen Thread bzw. Task laufenden Aufgabe (None = ohne Protokoll)."""
+    return _aktuelle_messung.get()
+
+
+@contextmanager
+def messung_aktiv(messung: Messung | None):
+    """Macht die Messung für den Block zur aktuellen Messung."""
+    token = _aktuelle_messung.set(messung)
+    try:
+        yield messung
+    finally:
+        _aktuelle_messung.reset(token)
+
+
+@contextmanager
+def parse_zeit():
+    """Misst die Dauer des Blocks als Parse-Zeit der aktuellen Messung."""
+    messung = _aktuelle_messung.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if messung is not None:
+            messung.parse += time.perf_counter() - start
+
+
+def _parse_mit_dauer(parser, body, *args):
+    """Läuft im Parse-Pool: Ergebnis und Parse-Dauer im Worker-Prozess."""
+    start = time.perf_counter()
+    ergebnis = parser(body, *args)
+    return ergebnis, time.perf_counter() - start
+
+
+def parse_im_pool(pool, parser, body, *args) -> Future:
+    """Reicht parser(body, *args) an den Pool; die Dauer im Worker zählt zur aktuellen Messung.
+
+    Returns:
+        Future mit dem Ergebnis des Parsers (wie pool.submit)
+    """
+    messung = _aktuelle_messung.get()
+    if messung is None:
+        return pool.submit(parser, body, *args)
+
+    ergebnis = Future()
+
+    def weiter(f: Future):
+        try:
+            termine, dauer = f.result()
+        except BaseException as e:
+            ergebnis.set_exception(e)
+            return
+        messung.parse += dauer
+        ergebnis.set_result(termine)
+
+    pool.submit(_parse_mit_dauer, parser, body, *args).add_done_callback(weiter)
+    return ergebnis
+
+
+class Laufprotokoll:
+    """Schreibt jede abgeschlossene Messung als eine JSON-Zeile und fasst den Lauf zusammen.
+
+    Wird nur aus dem koordinierenden Thread des AbrufPlaners beschrieben.
+    Mehrere Läufe werden an dieselbe Datei angehängt und über "lauf"
+    (Startzeitpunkt) unterschieden.
+    """
+
+    def __init__(self, pfad: str):
+        self.pfad = pfad
+        self.lauf = datetime.now().isoformat(timespec='seconds')
+        self.messungen: list[Messung] = []
+        self._datei = open(pfad, 'a', encoding='utf-8')
+
+    def schreibe(self, messung: Messung):
+        self.messungen.append(messung)
+        zeile = {'lauf': self.lauf, **messung.als_dict()}
+        self._datei.write(json.dumps(zeile, ensure_ascii=False) + '\n')
+        self._datei.flush()
+
+    def schliesse(self):
+        self._datei.close()
+
+    def zusammenfassung(self, anzahl: int = 10) -> str:
+        """Tabellen der langsamsten Hosts (nach Netzwerkzeit) und Parser (nach Parse-Zeit)."""
+        hosts = defaultdict(lambda: [0, 0, 0.0, 0.0, 0.0, 0])
+        for m in self.messungen:
+            werte = hosts[m.host]
+            werte[0] += m.anfragen
+            werte[1] += m.bytes
+            werte[2] += m.verbindung + m.ttfb
+            werte[3] += m.download
+            werte[4] += m.verbindung + m.ttfb + m.download
+            werte[5] += m.fehler is not None
+
+        zeilen = [f"Langsamste Hosts (Netzwerkzeit, {len(hosts)} Hosts):",
+                  f"  {'Host':<40} {'Anfr.':>5} {'KB':>8} {'TTFB s':>7} {'Laden s':>7} {'Summe s':>7} {'Fehler':>6}"]
+        for host, (anfragen, anzahl_bytes, ttfb, download, summe, fehler) in sorted(
+                hosts.items(), key=lambda e: -e[1][4])[:anzahl]:
+            zeilen.append(f"  {host:<40} {anfragen:>5} {anzahl_bytes / 1024:>8.0f} {ttfb:>7.2f}"
+                          f" {download:>7.2f} {summe:>7.2f} {fehler:>6}")
+
+        parser = defaultdict(lambda: [0.0, 0, 0, ''])
+        for m in self.messungen:
+            werte = parser[m.stadt]
+            werte[0] += m.parse
+            werte[1] += m.bytes
+            werte[2] += m.termine
+            werte[3] = m.system
+        zeilen += ["", "Langsamste Parser (Parse-Zeit pro Stadt):",
+                   f"  {'Stadt':<28} {'System':<20} {'Parse s':>7} {'KB':>8} {'Termine':>7}"]
+        for stadt, (parse, anzahl_bytes, termine, system) in sorted(
+                parser.items(), key=lambda e: -e[1][0])[:anzahl]:
+            zeilen.append(f"  {stadt:<28} {system:<20} {parse:>7.3f} {anzahl_bytes / 1024:>8.0f} {termine:>7}")
+        return '\n'.join(zeilen)
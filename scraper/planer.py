@@ -0,0 +1,362 @@
+"""Laufweiter Abruf-Planer für alle (Scraper, Monat)-Aufgaben."""
+
+import heapq
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable
+from .base import BaseScraper, Termin, termin_schluessel
+from .drossel import HostDrossel
+from .messung import Messung, messung_aktiv
+from .politik import wiederholung_pause, zeitbudget
+
+
+@dataclass
+class Aufgabe:
+    """Ein Abruf eines Scrapers, der einen oder mehrere Monate abdeckt."""
+    scraper: BaseScraper
+    monate: list[tuple[int, int]]
+    versuch: int = 0  # 0 = erster Abruf, danach Wiederholungen
+    messung: Messung | None = None  # nur mit BaseScraper.laufprotokoll
+
+    def ausfuehren(self) -> dict[tuple[int, int], list[Termin]]:
+        """Führt den Abruf aus und liefert die Termine pro Monat.
+
+        Mit Parse-Pool enthält das Ergebnis statt der Termine Futures (siehe
+        parse_auftraege/aufgeloest).
+        """
+        with messung_aktiv(self.neue_messung()), zeitbudget(self.zeitbudget()):
+            if len(self.monate) == 1 and not self.scraper.BEREICHSABRUF:
+                jahr, monat = self.monate[0]
+                return {(jahr, monat): self.scraper.hole_termine(jahr, monat)}
+            return self.scraper.hole_termine_bereich(self.monate[0], self.monate[-1])
+
+    async def ausfuehren_async(self, client) -> dict[tuple[int, int], list[Termin]]:
+        """Wie ausfuehren(), aber über die Async-Variante des Scrapers."""
+        with messung_aktiv(self.neue_messung()), zeitbudget(self.zeitbudget()):
+            if len(self.monate) == 1 and not self.scraper.BEREICHSABRUF:
+                jahr, monat = self.monate[0]
+                return {(jahr, monat): await self.scraper.hole_termine_async(client, jahr, monat)}
+            return await self.scraper.hole_termine_bereich_async(client, self.monate[0], self.monate[-1])
+
+    def zeitbudget(self) -> float | None:
+        """Zeitbudget aller Requests dieses Versuchs: AbrufPolitik.frist pro Monat."""
+        frist = self.scraper.politik.frist
+        return None if frist is None else frist * len(self.monate)
+
+    def neue_messung(self) -> Messung | None:
+        """Beginnt die Messung dieses Versuchs, falls ein Laufprotokoll geführt wird."""
+        if BaseScraper.laufprotokoll is None:
+            self.messung = None
+        else:
+            scraper = self.scraper
+            self.messung = Messung(scraper.stadt_name, type(scraper).__name__, scraper.host,
+                                   [f"{j}-{m:02d}" for j, m in self.monate], self.versuch)
+        return self.messung
+
+    def protokolliere(self, termine: int = 0, fehler: str | None = None):
+        """Schließt die Messung ab und schreibt sie ins Laufprotokoll."""
+        if self.messung is None or BaseScraper.laufprotokoll is None:
+            return
+        self.messung.abschliessen(termine, fehler)
+        BaseScraper.laufprotokoll.schreibe(self.messung)
+        self.messung = None
+
+
+def parse_auftraege(ergebnis) -> list[Future]:
+    """Gibt die Parse-Futures im Ergebnis einer Aufgabe zurück."""
+    if isinstance(ergebnis, Future):
+        return [ergebnis]
+    return [termine for termine in ergebnis.values() if isinstance(termine, Future)]
+
+
+def aufgeloest(ergebnis) -> dict[tuple[int, int], list[Termin]]:
+    """Ersetzt die (fertigen) Parse-Futures eines Ergebnisses durch ihre Termine."""
+    if isinstance(ergebnis, Future):
+        ergebnis = ergebnis.result()
+    return {monat_key: termine.result() if isinstance(termine, Future) else termine
+            for monat_key, termine in ergebnis.items()}
+
+
+@contextmanager
+def parse_pool(prozesse: int):
+    """Stellt allen Scrapern für die Dauer des Blocks einen Prozess-Pool zum Parsen bereit.
+
+    Bei prozesse <= 0 wird weiter im abrufenden Thread geparst. Die Prozesse
+    werden per spawn gestartet, da die Abruf-Threads zu diesem Zeitpunkt
+    bereits laufen.
+    """
+    if prozesse <= 0:
+        yield
+        return
+    pool = ProcessPoolExecutor(max_workers=prozesse, mp_context=multiprocessing.get_context('spawn'))
+    BaseScraper.parse_pool = pool
+    try:
+        yield
+    finally:
+        BaseScraper.parse_pool = None
+        pool.shutdown(cancel_futures=True)
+
+
+@contextmanager
+def hedge_pool(threads: int):
+    """Stellt den Scrapern für die Dauer des Blocks Threads für abgesicherte Requests bereit.
+
+    Beim Hedging laufen beide Requests in diesem Pool, während der
+    Abruf-Thread auf den schnelleren wartet; ein unterlegener Request
+    läuft dort ohne Wartenden zu Ende.
+    """
+    pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='hedge')
+    BaseScraper.hedge_pool = pool
+    try:
+        yield
+    finally:
+        BaseScraper.hedge_pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+@contextmanager
+def host_drosseln(drosseln: dict[str, HostDrossel]):
+    """Macht die Drosseln für die Dauer des Blocks für die Request-Hooks aller Scraper sichtbar."""
+    BaseScraper.drosseln = drosseln
+    try:
+        yield
+    finally:
+        BaseScraper.drosseln = None
+
+
+class AbrufPlaner:
+    """Plant alle Abrufe eines Laufs als einen gemeinsamen Aufgabengraphen.
+
+    Alle (Scraper, Monat)-Aufgaben werden zu Beginn eingeplant und laufen
+    unabhängig vom Monat parallel, begrenzt durch eine Gesamtzahl paralleler
+    Abrufe und eine Grenze pro Host. Sobald alle Aufgaben eines Monats
+    abgeschlossen sind, wird der Monat über einen Callback gemeldet.
+
+    Die Grenze pro Host ist adaptiv (HostDrossel): sie bleibt unter
+    max_pro_host, sinkt bei 429/5xx, Timeouts und steigender Latenz und
+    wächst wieder, sobald der Host sich erholt. Kommunen auf demselben Host
+    (z.B. sessionnet.owl-it.de) teilen sich eine Drossel.
+
+    Mit parse_prozesse > 0 arbeitet der Lauf als zweistufige Pipeline: die
+    Abruf-Threads laden nur die Antworten und geben den Body an einen
+    Prozess-Pool weiter, der die Termine parst. So überlappen Netzwerk-I/O
+    und Parsen, und das Parsen verteilt sich auf mehrere Kerne.
+
+    Fehlgeschlagene Aufgaben blockieren ihren Monat nicht: er wird sofort
+    mit dem Fehler gemeldet (der Aufrufer kann den letzten bekannten Stand
+    einsetzen), während die Aufgabe bis zu `wiederholungen` Mal mit
+    exponentiell wachsender Pause im Hintergrund wiederholt wird. Gelingt
+    eine Wiederholung, wird der Monat erneut gemeldet.
+    """
+
+    def __init__(self, scraper_liste: list[BaseScraper], monate: list[tuple[int, int]],
+                 max_parallel: int = 10, max_pro_host: int = 4, parse_prozesse: int = 0,
+                 wiederholungen: int = 0, wiederholung_pause: float = 5.0, adaptiv: bool = True):
+        self.monate = list(monate)
+        self.max_parallel = max(1, max_parallel)
+        self.max_pro_host = max(1, max_pro_host)
+        self.parse_prozesse = parse_prozesse
+        self.wiederholungen = max(0, wiederholungen)
+        self.wiederholung_pause = wiederholung_pause
+        self.drosseln = {scraper.host: HostDrossel(self.max_pro_host, adaptiv) for scraper in scraper_liste}
+
+        # Bereichsabrufe zuerst, danach Monat für Monat, damit frühe Monate
+        # zuerst vollständig werden
+        self.aufgaben: list[Aufgabe] = []
+        for scraper in scraper_liste:
+            if scraper.BEREICHSABRUF:
+                self.aufgaben.append(Aufgabe(scraper, self.monate))
+        for monat_key in self.monate:
+            for scraper in scraper_liste:
+                if not scraper.BEREICHSABRUF:
+                    self.aufgaben.append(Aufgabe(scraper, [monat_key]))
+
+    def ausfuehren(self, bei_monat_fertig: Callable[[int, int, list[Termin], list[str]], None] | None = None
+                   ) -> list[str]:
+        """Führt alle Aufgaben aus.
+
+        Args:
+            bei_monat_fertig: Wird im aufrufenden Thread mit (jahr, monat,
+                termine, fehler_staedte) aufgerufen, sobald alle Aufgaben
+                eines Monats abgeschlossen sind, und erneut, wenn eine
+                Wiederholung gelingt. Die Termine sind sortiert.
+
+        Returns:
+            Liste der Städte, die auch nach allen Wiederholungen fehlen
+            (ohne Duplikate, sortiert)
+        """
+        fortschritt = Fortschritt(self.monate, self.aufgaben, bei_monat_fertig)
+        wartend = deque(self.aufgaben)
+        laufend = {}
+        parsend: dict[Future, tuple[Aufgabe, object]] = {}
+        # Geplante Wiederholungen als Heap von (fällig um, id, Aufgabe)
+        wiederholen: list[tuple[float, int, Aufgabe]] = []
+
+        def fehlgeschlagen(aufgabe: Aufgabe, e: Exception):
+            fortschritt.fehler(aufgabe, e)
+            pause = self.plane_wiederholung(aufgabe)
+            if pause is not None:
+                heapq.heappush(wiederholen, (time.monotonic() + pause, id(aufgabe), aufgabe))
+
+        with parse_pool(self.parse_prozesse), host_drosseln(self.drosseln), hedge_pool(2 * self.max_parallel), \
+                ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            fortschritt.melde_fertige_monate()
+            while wartend or laufend or parsend or wiederholen:
+                # Fällige Wiederholungen einreihen
+                while wiederholen and wiederholen[0][0] <= time.monotonic():
+                    wartend.append(heapq.heappop(wiederholen)[2])
+
+                # Freie Plätze mit Aufgaben füllen, deren Host noch Kapazität hat
+                uebersprungen = deque()
+                while wartend and len(laufend) < self.max_parallel:
+                    aufgabe = wartend.popleft()
+                    drossel = self.drosseln[aufgabe.scraper.host]
+                    if not drossel.hat_platz():
+                        uebersprungen.append(aufgabe)
+                        continue
+                    drossel.belege()
+                    laufend[executor.submit(aufgabe.ausfuehren)] = aufgabe
+                uebersprungen.extend(wartend)
+                wartend = uebersprungen
+
+                # Höchstens bis zur nächsten fälligen Wiederholung bzw. bis ein
+                # pausierter Host (Retry-After) wieder frei ist warten
+                fristen = [max(0.0, wiederholen[0][0] - time.monotonic())] if wiederholen else []
+                fristen += [d.wartezeit() for d in self.drosseln.values() if d.wartezeit() > 0]
+                timeout = min(fristen) if fristen else None
+                if not laufend and not parsend:
+                    if timeout:
+                        time.sleep(timeout)
+                    continue
+                fertig, _ = wait([*laufend, *parsend], timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in fertig:
+                    if future in laufend:
+                        # Abruf fertig: Platz freigeben, Parsen läuft ggf. noch
+                        aufgabe = laufend.pop(future)
+                        self.drosseln[aufgabe.scraper.host].freigeben()
+                        try:
+                            ergebnis = future.result()
+                        except Exception as e:
+                            fehlgeschlagen(aufgabe, e)
+                            continue
+                        offen = [f for f in parse_auftraege(ergebnis) if not f.done()]
+                        for parse_future in offen:
+                            parsend[parse_future] = (aufgabe, ergebnis)
+                        if offen:
+                            continue
+                    else:
+                        # Parsen fertig: verbuchen, sobald alle Futures der Aufgabe fertig sind
+                        aufgabe, ergebnis = parsend.pop(future)
+                        if any(f in parsend for f in parse_auftraege(ergebnis)):
+                            continue
+                    try:
+                        fortschritt.verbuche(aufgabe, ergebnis)
+                    except Exception as e:
+                        fehlgeschlagen(aufgabe, e)
+
+                fortschritt.melde_fertige_monate()
+
+        return fortschritt.fehler_staedte()
+
+    def plane_wiederholung(self, aufgabe: Aufgabe) -> float | None:
+        """Zählt den Versuch einer fehlgeschlagenen Aufgabe hoch.
+
+        Returns:
+            Pause in Sekunden bis zur Wiederholung, oder None, wenn keine
+            Versuche mehr übrig sind
+        """
+        if aufgabe.versuch >= self.wiederholungen:
+            return None
+        aufgabe.versuch += 1
+        return wiederholung_pause(aufgabe.versuch, self.wiederholung_pause)
+
+
+class Fortschritt:
+    """Sammelt die Ergebnisse der Aufgaben eines Laufs und meldet vollständige Monate.
+
+    Wird von beiden Engines (Threads und asyncio) genutzt und immer nur aus
+    dem koordinierenden Thread aufgerufen.
+    """
+
+    def __init__(self, monate: list[tuple[int, int]], aufgaben: list[Aufgabe],
+                 bei_monat_fertig: Callable[[int, int, list[Termin], list[str]], None] | None):
+        self.monate = monate
+        self.bei_monat_fertig = bei_monat_fertig
+        self.termine_pro_monat = {m: [] for m in monate}
+        self.fehler_pro_monat = {m: [] for m in monate}
+        self.offen_pro_monat = {m: 0 for m in monate}
+        for aufgabe in aufgaben:
+            for monat_key in aufgabe.monate:
+                self.offen_pro_monat[monat_key] += 1
+
+    def verbuche(self, aufgabe: Aufgabe, ergebnis):
+        """Verbucht eine abgeschlossene Aufgabe, deren Parse-Futures alle fertig sind.
+
+        Ein Fehler beim Parsen wird weitergereicht; der Aufrufer verbucht ihn
+        über fehler().
+        """
+        self.erfolg(aufgabe, aufgeloest(ergebnis))
+
+    def erfolg(self, aufgabe: Aufgabe, result: dict[tuple[int, int], list[Termin]]):
+        """Verbucht die Termine einer erfolgreichen Aufgabe (auch einer Wiederholung)."""
+        scraper = aufgabe.scraper
+        aufgabe.protokolliere(termine=sum(len(termine) for termine in result.values()
+                                          if not isinstance(termine, Exception)))
+        for monat_key in aufgabe.monate:
+            termine = result.get(monat_key, [])
+            if isinstance(termine, Exception):
+                # Einzelner Monat nicht abrufbar (z.B. Jahr außerhalb des
+                # ALLRIS-Kalenders): Stadt fehlt nur in diesem Monat; nach einer
+                # Wiederholung steht sie dort bereits als ausgefallen
+                print(f"  Fehler bei {scraper.stadt_name} ({monat_key[1]}/{monat_key[0]}): {termine}")
+                if aufgabe.versuch == 0:
+                    self.fehler_pro_monat[monat_key].append(scraper.stadt_name)
+                    self.offen_pro_monat[monat_key] -= 1
+                continue
+            self.termine_pro_monat[monat_key].extend(termine)
+            if termine:
+                print(f"  {scraper.stadt_name} ({monat_key[1]}/{monat_key[0]}): "
+                      f"{len(termine)} Termine")
+            if aufgabe.versuch == 0:
+                self.offen_pro_monat[monat_key] -= 1
+                continue
+            # Nachgeholt: Stadt gilt nicht mehr als ausgefallen, ein bereits
+            # gemeldeter Monat wird erneut gemeldet
+            self.fehler_pro_monat[monat_key].remove(scraper.stadt_name)
+            if self.offen_pro_monat[monat_key] == -1:
+                self.offen_pro_monat[monat_key] = 0
+        if aufgabe.versuch:
+            print(f"  {scraper.stadt_name}: Wiederholung {aufgabe.versuch} erfolgreich")
+
+    def fehler(self, aufgabe: Aufgabe, e: Exception):
+        """Verbucht eine fehlgeschlagene Aufgabe; eine gescheiterte Wiederholung wird nur gemeldet."""
+        scraper = aufgabe.scraper
+        # Nur die erste Zeile (httpx hängt z.B. einen Hinweis-Link an)
+        meldung = str(e).splitlines()[0] if str(e) else type(e).__name__
+        aufgabe.protokolliere(fehler=meldung)
+        if aufgabe.versuch:
+            print(f"  Wiederholung {aufgabe.versuch} bei {scraper.stadt_name} fehlgeschlagen: {meldung}")
+            return
+        print(f"  Fehler bei {scraper.stadt_name}: {meldung}")
+        for monat_key in aufgabe.monate:
+            self.fehler_pro_monat[monat_key].append(scraper.stadt_name)
+            self.offen_pro_monat[monat_key] -= 1
+
+    def melde_fertige_monate(self):
+        """Ruft bei_monat_fertig für alle Monate auf, deren Aufgaben abgeschlossen sind."""
+        for monat_key in self.monate:
+            if self.offen_pro_monat[monat_key] == 0:
+                self.offen_pro_monat[monat_key] = -1
+                termine = self.termine_pro_monat[monat_key]
+                termine.sort(key=termin_schluessel)
+                if self.bei_monat_fertig:
+                    self.bei_monat_fertig(monat_key[0], monat_key[1], termine,
+                                          sorted(set(self.fehler_pro_monat[monat_key])))
+
+    def fehler_staedte(self) -> list[str]:
+        """Fehlgeschlagene Städtenamen (ohne Duplikate, sortiert)."""
+        return sorted({stadt for staedte in self.fehler_pro_monat.values() for stadt in staedte})
@@ -0,0 +1,118 @@
+"""Wiederholung, Zeitbudget und Hedging für einzelne Requests der Scraper."""
+
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import requests
+
+try:
+    import httpx
+except ImportError:  # Optional, nur für die asyncio-Engine nötig
+    httpx = None
+
+from .drossel import HostDrossel, LATENZ_FAKTOR
+
+
+# Antworten, nach denen sich ein erneuter Versuch lohnt
+VORUEBERGEHENDE_STATUS = frozenset({429, 500, 502, 503, 504})
+# Fehler, nach denen sich ein erneuter Versuch lohnt (requests und httpx)
+VORUEBERGEHENDE_FEHLER = (requests.ConnectionError, requests.Timeout) + (
+    (httpx.TransportError,) if httpx is not None else ())
+# Kein Hedging für Hosts, bei denen mehr als dieser Anteil der Abrufe scheitert
+# (ein zweiter Request würde einen überlasteten Host nur weiter belasten)
+HEDGE_MAX_FEHLERQUOTE = 0.2
+
+# Ende des Zeitbudgets der laufenden Aufgabe (time.monotonic()); pro Thread
+# bzw. asyncio-Task getrennt wie die Messung
+_frist: ContextVar[float | None] = ContextVar('frist', default=None)
+
+
+class FristAbgelaufen(TimeoutError):
+    """Das Zeitbudget einer Aufgabe ist aufgebraucht."""
+
+
+def wiederholung_pause(versuch: int, basis: float) -> float:
+    """Pause vor der Wiederholung Nr. versuch (ab 1): exponentiell mit Jitter."""
+    return basis * 2 ** (versuch - 1) * random.uniform(0.5, 1.0)
+
+
+@contextmanager
+def zeitbudget(sekunden: float | None):
+    """Begrenzt alle Requests und Pausen im Block auf insgesamt sekunden (None = unbegrenzt)."""
+    token = _frist.set(None if sekunden is None else time.monotonic() + sekunden)
+    try:
+        yield
+    finally:
+        _frist.reset(token)
+
+
+def restzeit() -> float | None:
+    """Verbleibende Sekunden im Zeitbudget der laufenden Aufgabe (None = unbegrenzt)."""
+    frist = _frist.get()
+    return None if frist is None else frist - time.monotonic()
+
+
+@dataclass
+class AbrufPolitik:
+    """Wie BaseScraper einzelne GET-Requests wiederholt, begrenzt und absichert.
+
+    Verbindungsfehler, Timeouts, 429 und 5xx werden bis zu versuche-mal
+    mit exponentiell wachsender Pause (ab pause Sekunden, mit Jitter)
+    wiederholt; ein Retry-After verlängert die Pause. Alle Requests und
+    Pausen einer Aufgabe teilen sich ein Zeitbudget von frist Sekunden pro
+    Monat: Timeouts werden auf den Rest gekürzt, und eine Pause, die nicht
+    mehr hineinpasst, beendet die Wiederholungen.
+
+    Mit hedge_ab (Standard: aus) startet ein zweiter, identischer
+    Request, wenn die Antwort-Header länger als hedge_ab Sekunden
+    (mindestens das Dreifache der üblichen Latenz des Hosts) ausbleiben;
+    die schnellere Antwort gewinnt. Nur für idempotente GETs, nicht bei
+    Hosts mit vielen Fehlern und nur, solange die Drossel des Hosts einen
+    Platz frei hat.
+    """
+    versuche: int = 3
+    pause: float = 0.5
+    frist: float | None = 45.0
+    hedge_ab: float | None = None
+
+    def timeout(self, timeout: float) -> float:
+        """Kürzt den Timeout eines Requests auf das verbleibende Zeitbudget.
+
+        Raises:
+            FristAbgelaufen: wenn kein Budget mehr übrig ist
+        """
+        rest = restzeit()
+        if rest is None:
+            return timeout
+        if rest <= 0:
+            raise FristAbgelaufen("Zeitbudget der Aufgabe überschritten")
+        return min(timeout, rest)
+
+    def naechste_pause(self, versuch: int, retry_after: str | None = None) -> float | None:
+        """Pause vor dem nächsten Versuch nach dem fehlgeschlagenen Versuch Nr. versuch (ab 1).
+
+        Returns:
+            Sekunden oder None, wenn keine Versuche mehr übrig sind oder die
+            Pause das Zeitbudget übersteigt
+        """
+        if versuch >= self.versuche:
+            return None
+        pause = wiederholung_pause(versuch, self.pause)
+        if retry_after and retry_after.strip().isdigit():
+            pause = max(pause, float(retry_after))
+        rest = restzeit()
+        if rest is not None and pause >= rest:
+            return None
+        return pause
+
+    def hedge_verzoegerung(self, drossel: HostDrossel | None) -> float | None:
+        """Sekunden ohne Antwort, nach denen ein zweiter Request startet (None = kein Hedging).
+
+        Solange vom Host noch keine Latenz bekannt ist, gilt hedge_ab.
+        """
+        if self.hedge_ab is None or drossel is None or drossel.fehlerquote > HEDGE_MAX_FEHLERQUOTE:
+            return None
+        return max(self.hedge_ab, LATENZ_FAKTOR * (drossel.latenz or 0.0))
@@ -1,10 +1,16 @@
 """Scraper für Ratsinfomanagement.net-Systeme (via iCal-Export)."""
 
 import re
-import requests
 from datetime import datetime
+from typing import Iterable
 from urllib.parse import urlparse
-from .base import BaseScraper, Termin
+from .base import BaseScraper, Termin, monate_im_bereich
+
+
+# Ausgewertete Event-Eigenschaften (alle anderen werden beim Lesen verworfen)
+ICAL_FELDER = frozenset(('DTSTART', 'SUMMARY', 'LOCATION', 'URL', 'DESCRIPTION'))
+DTSTART_MUSTER = re.compile(r'\d{8}T\d{6}')
+LINK_MUSTER = re.compile(r'https?://[^\s<>"\\]+')
 
 
 class RatsinfoScraper(BaseScraper):
@@ -18,6 +24,11 @@ class RatsinfoScraper(BaseScraper):
         'Connection': 'keep-alive',
     }
 
+    BEREICHSABRUF = True
+
+    # 2: Zeilenweiser iCal-Parser, 3: eingebettete Komponenten (VALARM) überspringen
+    PARSER_VERSION = 3
+
     def __init__(self, stadt_name: str, base_url: str):
         super().__init__(stadt_name, base_url)
         # Basis-URL ermitteln
@@ -27,74 +38,146 @@ class RatsinfoScraper(BaseScraper):
 
     def hole_termine(self, jahr: int, monat: int) -> list[Termin]:
         """Holt alle Termine für einen bestimmten Monat aus dem iCal-Feed."""
-        response = requests.get(self.ical_url, headers=self.HEADERS, timeout=30)
+        return self.hole_termine_bereich((jahr, monat), (jahr, monat))[(jahr, monat)]
+
+    def hole_termine_bereich(self, start: tuple[int, int],
+                             ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Holt alle Termine von start bis ende mit einem einzigen Abruf des iCal-Feeds.
+
+        Der Feed wird zeilenweise aus der Antwort (bzw. der Datei im
+        HTTP-Cache) gelesen, ohne ihn komplett zu laden.
+        """
+        response = self._get(self.ical_url, headers=self.HEADERS, timeout=30, stream=True)
         response.raise_for_status()
         response.encoding = 'utf-8'
+        return self._parse_gestreamt(self.ical_url, response, self._parse_ical_zeilen, start, ende)
 
-        return self._parse_ical(response.text, jahr, monat)
+    async def hole_termine_async(self, client, jahr: int, monat: int) -> list[Termin]:
+        """Holt alle Termine eines Monats über den httpx.AsyncClient."""
+        return (await self.hole_termine_bereich_async(client, (jahr, monat), (jahr, monat)))[(jahr, monat)]
+
+    async def hole_termine_bereich_async(self, client, start: tuple[int, int],
+                                         ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Holt alle Termine von start bis ende mit einem Abruf über den httpx.AsyncClient."""
+        response = await self._get_async(client, self.ical_url, headers=self.HEADERS, timeout=30, stream=True)
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        return await self._parse_gestreamt_async(self.ical_url, response, self._parse_ical_zeilen, start, ende)
 
     def _parse_ical(self, ical_text: str, jahr: int, monat: int) -> list[Termin]:
         """Parst den iCal-Text und extrahiert Termine für den angegebenen Monat."""
-        termine = []
+        return self._parse_ical_bereich(ical_text, (jahr, monat), (jahr, monat))[(jahr, monat)]
+
+    def _parse_ical_bereich(self, ical_text: str, start: tuple[int, int],
+                            ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Parst den iCal-Text und ordnet die Termine von start bis ende ihren Monaten zu."""
+        return self._parse_ical_zeilen(ical_text.splitlines(), start, ende)
+
+    def _parse_ical_zeilen(self, zeilen: Iterable[str], start: tuple[int, int],
+                           ende: tuple[int, int]) -> dict[tuple[int, int], list[Termin]]:
+        """Liest iCal-Zeilen einzeln und ordnet die Termine von start bis ende ihren Monaten zu.
+
+        Fortsetzungszeilen werden beim Lesen entfaltet. Sobald DTSTART eines
+        Events außerhalb des Zeitraums liegt, wird der Rest des Events
+        übersprungen; es wird immer nur ein Event gleichzeitig gehalten.
+        Eingebettete Komponenten (z.B. VALARM mit eigenem SUMMARY und
+        DESCRIPTION) werden übersprungen.
+        """
+        termine_pro_monat = {m: [] for m in monate_im_bereich(start, ende)}
+        felder = None      # Eigenschaften des aktuellen Events (None = außerhalb/übersprungen)
+        letztes_feld = None
+        tiefe = 0          # Verschachtelung eingebetteter Komponenten im aktuellen Event
+
+        for zeile in zeilen:
+            zeile = zeile.rstrip('\r\n')
+            if not zeile:
+                continue
 
-        # iCal in Events aufteilen
-        events = re.split(r'BEGIN:VEVENT', ical_text)
+            # Fortsetzungszeile: an das vorige Feld anhängen
+            if zeile[0] in ' \t':
+                if felder is not None and letztes_feld:
+                    felder[letztes_feld] += zeile[1:]
+                continue
 
-        for event in events[1:]:  # Erstes Element ist Header
-            if 'END:VEVENT' not in event:
+            if zeile == 'BEGIN:VEVENT':
+                felder = {}
+                letztes_feld = None
+                tiefe = 0
+                continue
+            if zeile == 'END:VEVENT':
+                if felder is not None:
+                    termin = self._termin_aus_feldern(felder)
+                    if termin:
+                        termine_pro_monat[(termin.datum.year, termin.datum.month)].append(termin)
+                felder = None
+                continue
+            if felder is None:
                 continue
 
-            termin = self._parse_event(event, jahr, monat)
-            if termin:
-                termine.append(termin)
+            if zeile.startswith('BEGIN:'):
+                tiefe += 1
+                letztes_feld = None
+                continue
+            if zeile.startswith('END:'):
+                tiefe = max(0, tiefe - 1)
+                continue
+            if tiefe:
+                continue
 
-        return termine
+            name, _, wert = zeile.partition(':')
+            name = name.split(';', 1)[0].upper()
+            if name not in ICAL_FELDER:
+                letztes_feld = None
+                continue
 
-    def _parse_event(self, event_text: str, jahr: int, monat: int) -> Termin | None:
-        """Parst ein einzelnes iCal-Event."""
-        # DTSTART extrahieren
-        dtstart_match = re.search(r'DTSTART[^:]*:(\d{8}T\d{6})', event_text)
-        if not dtstart_match:
+            if name == 'DTSTART':
+                datum = self._parse_dtstart(wert, start, ende)
+                if datum is None:
+                    # Außerhalb des Zeitraums oder ungültig: Rest des Events überspringen
+                    felder = None
+                    continue
+                felder['DTSTART'] = datum
+                letztes_feld = None
+            else:
+                felder[name] = wert
+                letztes_feld = name
+
+        return termine_pro_monat
+
+    @staticmethod
+    def _parse_dtstart(wert: str, start: tuple[int, int], ende: tuple[int, int]) -> datetime | None:
+        """Parst DTSTART (20260205T160000[Z]), None falls ungültig oder außerhalb des Zeitraums."""
+        if not DTSTART_MUSTER.match(wert):
+            return None
+        # Zeitraum zuerst anhand von Jahr/Monat prüfen, bevor vollständig geparst wird
+        if not start <= (int(wert[0:4]), int(wert[4:6])) <= ende:
             return None
-
         try:
-            # Format: 20260205T160000 oder 20260205T160000Z
-            dt_str = dtstart_match.group(1)
-            datum = datetime.strptime(dt_str[:15], '%Y%m%dT%H%M%S')
+            return datetime.strptime(wert[:15], '%Y%m%dT%H%M%S')
         except ValueError:
             return None
 
-        # Nur Termine im gewünschten Monat
-        if datum.year != jahr or datum.month != monat:
+    def _termin_aus_feldern(self, felder: dict) -> Termin | None:
+        """Baut aus den Eigenschaften eines Events einen Termin."""
+        datum = felder.get('DTSTART')
+        if datum is None:
             return None
 
         uhrzeit = datum.strftime('%H:%M Uhr')
 
-        # SUMMARY (Gremium) extrahieren
-        summary_match = re.search(r'SUMMARY:(.+?)(?:\r?\n(?! )|\r?\nEND)', event_text, re.DOTALL)
-        gremium = 'Unbekannt'
-        if summary_match:
-            gremium = self._unfold_ical_line(summary_match.group(1))
-
-        # LOCATION extrahieren
-        location_match = re.search(r'LOCATION:(.+?)(?:\r?\n(?! )|\r?\nEND)', event_text, re.DOTALL)
-        ort = ''
-        if location_match:
-            ort = self._unfold_ical_line(location_match.group(1))
+        # SUMMARY (Gremium) und LOCATION
+        gremium = self._dekodiere_ical_wert(felder['SUMMARY']) if 'SUMMARY' in felder else 'Unbekannt'
+        ort = self._dekodiere_ical_wert(felder.get('LOCATION', ''))
 
-        # URL oder DESCRIPTION mit Link extrahieren
-        url_match = re.search(r'URL:(.+?)(?:\r?\n(?! )|\r?\nEND)', event_text, re.DOTALL)
+        # URL oder DESCRIPTION mit Link
         link = ''
-        if url_match:
-            link = self._unfold_ical_line(url_match.group(1))
-        else:
-            # Versuche Link aus DESCRIPTION zu extrahieren
-            desc_match = re.search(r'DESCRIPTION:(.+?)(?:\r?\nEND|\r?\n[A-Z]+:)', event_text, re.DOTALL)
-            if desc_match:
-                desc = self._unfold_ical_line(desc_match.group(1))
-                link_in_desc = re.search(r'https?://[^\s<>"\\]+', desc)
-                if link_in_desc:
-                    link = link_in_desc.group(0)
+        if 'URL' in felder:
+            link = self._dekodiere_ical_wert(felder['URL'])
+        elif 'DESCRIPTION' in felder:
+            desc = self._dekodiere_ical_wert(felder['DESCRIPTION'])
+            link_in_desc = LINK_MUSTER.search(desc)
+            if link_in_desc:
+                link = link_in_desc.group(0)
 
         # Falls kein Link gefunden, verwende Terminseite
         if not link:
@@ -109,12 +192,8 @@ class RatsinfoScraper(BaseScraper):
             link=link
         )
 
-    def _unfold_ical_line(self, text: str) -> str:
-        """Entfaltet iCal-Zeilen (Fortsetzungszeilen beginnen mit Leerzeichen/Tab)."""
-        # Entferne Zeilenumbrüche mit Fortsetzung
-        text = re.sub(r'\r?\n[ \t]', '', text)
-        # Entferne übrige Zeilenumbrüche
-        text = re.sub(r'\r?\n.*', '', text)
-        # Dekodiere escaped characters
+    @staticmethod
+    def _dekodiere_ical_wert(text: str) -> str:
+        """Dekodiert escaped characters eines (bereits entfalteten) iCal-Werts."""
         text = text.replace('\\n', ' ').replace('\\,', ',').replace('\\;', ';')
         return text.strip()
@@ -1,10 +1,22 @@
 """Scraper für SessionNet-Systeme (si0046.asp/php)."""
 
 import re
-import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
-from .base import BaseScraper, Termin
+import lxml.html
+from lxml import etree
+from .base import BaseScraper, Termin, hat_klasse, text_aus_element
+
+
+DATUM_MUSTER = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})')
+ZEIT_MUSTER = re.compile(r'(\d{1,2}):(\d{2})')
+WOCHENTAG_DATUM_MUSTER = re.compile(r'(Mo|Di|Mi|Do|Fr|Sa|So)\s+(\d{2})\.(\d{2})\.(\d{4})')
+ZEIT_UHR_MUSTER = re.compile(r'(\d{1,2}):(\d{2})\s*(?:Uhr)?')
+ZK_KLASSE = re.compile(r'zk|smc|si')
+
+# Block-Elemente für das textbasierte Layout
+BLOCK_TAGS = frozenset(('div', 'p', 'tr', 'li'))
+TEXTBLOCK_TAGS = BLOCK_TAGS | {'span'}
+IGNORIERTE_TAGS = frozenset(('script', 'style'))
 
 
 class SessionNetScraper(BaseScraper):
@@ -18,6 +30,9 @@ class SessionNetScraper(BaseScraper):
         'Connection': 'keep-alive',
     }
 
+    # 2: Single-Pass-Parser auf lxml-Basis
+    PARSER_VERSION = 2
+
     def __init__(self, stadt_name: str, base_url: str):
         super().__init__(stadt_name, base_url)
         # Basis-URL für Termine ermitteln
@@ -28,81 +43,120 @@ class SessionNetScraper(BaseScraper):
 
     def hole_termine(self, jahr: int, monat: int) -> list[Termin]:
         """Holt alle Termine für einen bestimmten Monat."""
-        url = f"{self.termine_url}?__cjahr={jahr}&__cmonat={monat}"
-
-        response = requests.get(url, headers=self.HEADERS, timeout=15)
+        url = self._monats_url(jahr, monat)
+        response = self._get(url, headers=self.HEADERS, timeout=15)
+        return self._verarbeite_antwort(url, response, jahr, monat)
+
+    async def hole_termine_async(self, client, jahr: int, monat: int) -> list[Termin]:
+        """Holt alle Termine eines Monats über den httpx.AsyncClient."""
+        url = self._monats_url(jahr, monat)
+        response = await self._get_async(client, url, headers=self.HEADERS, timeout=15)
         response.raise_for_status()
         response.encoding = 'utf-8'
+        return await self._parse_gecacht_async(url, response.text, self._parse_html, jahr, monat)
 
-        return self._parse_html(response.text, jahr, monat)
+    def _monats_url(self, jahr: int, monat: int) -> str:
+        return f"{self.termine_url}?__cjahr={jahr}&__cmonat={monat}"
+
+    def _verarbeite_antwort(self, url: str, response, jahr: int, monat: int) -> list[Termin]:
+        """Prüft die Antwort und parst sie."""
+        response.raise_for_status()
+        response.encoding = 'utf-8'
+        return self._parse_gecacht(url, response.text, self._parse_html, jahr, monat)
 
     def _parse_html(self, html: str, jahr: int, monat: int) -> list[Termin]:
-        """Parst die HTML-Seite und extrahiert Termine."""
-        soup = BeautifulSoup(html, 'lxml')
-        termine = []
+        """Parst die HTML-Seite und extrahiert Termine.
 
-        # Verschiedene Parsing-Strategien versuchen
-        termine = self._parse_tabelle(soup, jahr, monat)
+        Das Dokument wird nur einmal aufgebaut und in einem Durchlauf nach
+        Kandidaten für alle drei Layouts durchsucht (smc-Tabellenzeilen,
+        zk-Struktur, Textblöcke). Ausgewertet wird das erste Layout, das
+        Termine liefert.
+        """
+        try:
+            root = lxml.html.document_fromstring(html)
+        except ValueError:
+            # Unicode-Strings mit XML-Deklaration lehnt lxml ab
+            root = lxml.html.document_fromstring(html.encode('utf-8'))
+        except etree.ParserError:
+            return []
+
+        zeilen, zk_elemente, bloecke = [], [], []
+        self._sammle_kandidaten(root, zeilen, zk_elemente, bloecke)
+
+        termine = self._parse_tabelle(zeilen)
         if not termine:
-            termine = self._parse_zk_struktur(soup, jahr, monat)
+            termine = self._parse_zk_struktur(zk_elemente)
         if not termine:
-            termine = self._parse_text_basiert(soup, jahr, monat)
+            termine = self._parse_text_basiert(bloecke)
 
         return termine
 
-    def _parse_tabelle(self, soup: BeautifulSoup, jahr: int, monat: int) -> list[Termin]:
-        """Versucht, Termine aus Tabellen zu extrahieren."""
+    def _sammle_kandidaten(self, elem, zeilen: list, zk_elemente: list, bloecke: list) -> bool:
+        """Sammelt in einem Durchlauf die Kandidaten aller Layouts in Dokumentreihenfolge.
+
+        - zeilen: alle <tr> (Tabellen-Layout)
+        - zk_elemente: div/span/p mit zk-, smc- oder si-Klasse (zk-Struktur)
+        - bloecke: innerste Textblöcke für das textbasierte Layout, d.h.
+          div/p/tr/li ohne weitere solche Blöcke darin sowie <span> außerhalb
+          solcher Blöcke
+
+        Returns:
+            True, wenn elem einen Block (div/p/tr/li) enthält oder selbst einer ist
+        """
+        tag = elem.tag
+        if tag == 'tr':
+            zeilen.append(elem)
+        elif tag in ('div', 'span', 'p') and ZK_KLASSE.search(elem.get('class', '')):
+            zk_elemente.append(elem)
+
+        start = len(bloecke)
+        enthaelt_block = False
+        for kind in elem:
+            if isinstance(kind.tag, str) and kind.tag not in IGNORIERTE_TAGS:
+                enthaelt_block |= self._sammle_kandidaten(kind, zeilen, zk_elemente, bloecke)
+
+        if tag in TEXTBLOCK_TAGS and not enthaelt_block:
+            # Innerster Block: ersetzt die darin gefundenen <span>-Blöcke
+            del bloecke[start:]
+            bloecke.append(elem)
+        return enthaelt_block or tag in BLOCK_TAGS
+
+    def _parse_tabelle(self, zeilen: list) -> list[Termin]:
+        """Extrahiert Termine aus Tabellenzeilen mit mindestens drei Zellen."""
         termine = []
 
-        # Suche nach Tabellen mit Sitzungsdaten
-        for table in soup.find_all('table'):
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 3:
-                    text = ' '.join(c.get_text(strip=True) for c in cells)
-                    termin = self._extrahiere_termin_aus_text(text, row, jahr, monat)
-                    if termin:
-                        termine.append(termin)
+        for row in zeilen:
+            cells = [c for c in row.iter('td', 'th')]
+            if len(cells) >= 3:
+                text = ' '.join(text_aus_element(c) for c in cells)
+                termin = self._extrahiere_termin_aus_text(text, row)
+                if termin:
+                    termine.append(termin)
 
         return termine
 
-    def _parse_zk_struktur(self, soup: BeautifulSoup, jahr: int, monat: int) -> list[Termin]:
+    def _parse_zk_struktur(self, zk_elemente: list) -> list[Termin]:
         """Parst die zk-Struktur (SessionNet-spezifisch)."""
         termine = []
 
-        # Suche nach zk-Elementen (SessionNet-spezifisch)
-        for elem in soup.find_all(['div', 'span', 'p'], class_=re.compile(r'zk|smc|si')):
-            text = elem.get_text(strip=True)
-            link_elem = elem.find('a')
-            link = link_elem.get('href', '') if link_elem else ''
-
-            termin = self._extrahiere_termin_aus_text(text, elem, jahr, monat)
+        for elem in zk_elemente:
+            text = text_aus_element(elem)
+            termin = self._extrahiere_termin_aus_text(text, elem)
             if termin:
                 termine.append(termin)
 
         return termine
 
-    def _parse_text_basiert(self, soup: BeautifulSoup, jahr: int, monat: int) -> list[Termin]:
+    def _parse_text_basiert(self, bloecke: list) -> list[Termin]:
         """Parst Termine basierend auf Textmustern."""
         termine = []
         aktuelles_datum = None
 
-        # Hole den gesamten Text-Inhalt
-        content = soup.find('body')
-        if not content:
-            return termine
-
-        # Suche nach Datumsmustern und sammle Termine
-        datum_pattern = re.compile(r'(Mo|Di|Mi|Do|Fr|Sa|So)\s+(\d{2})\.(\d{2})\.(\d{4})')
-        zeit_pattern = re.compile(r'(\d{1,2}):(\d{2})\s*(?:Uhr)?')
-
-        # Iteriere durch alle Textblöcke
-        for elem in content.find_all(['div', 'p', 'span', 'tr', 'li']):
-            text = elem.get_text(' ', strip=True)
+        for elem in bloecke:
+            text = text_aus_element(elem, ' ')
 
             # Prüfe auf Datum
-            datum_match = datum_pattern.search(text)
+            datum_match = WOCHENTAG_DATUM_MUSTER.search(text)
             if datum_match:
                 tag = int(datum_match.group(2))
                 monat_parsed = int(datum_match.group(3))
@@ -113,7 +167,7 @@ class SessionNetScraper(BaseScraper):
                     continue
 
             # Prüfe auf Uhrzeit (= Termin)
-            zeit_match = zeit_pattern.search(text)
+            zeit_match = ZEIT_UHR_MUSTER.search(text)
             if zeit_match and aktuelles_datum:
                 uhrzeit = f"{zeit_match.group(1)}:{zeit_match.group(2)} Uhr"
 
@@ -121,27 +175,20 @@ class SessionNetScraper(BaseScraper):
                 text_nach_zeit = text[zeit_match.end():].strip()
 
                 # Suche nach Sitzungslink (bevorzugt smc_datatype_si)
-                link_elem = elem.find('a', class_='smc_datatype_si')
-                if not link_elem:
+                links = list(elem.iter('a'))
+                link_elem = next((a for a in links if hat_klasse(a, 'smc_datatype_si')), None)
+                if link_elem is None:
                     # Fallback: Erster Link mit si00-URL
-                    for a in elem.find_all('a'):
-                        href = a.get('href', '')
-                        if href and 'si00' in href:
-                            link_elem = a
-                            break
-                if not link_elem:
-                    link_elem = elem.find('a', href=True)
+                    link_elem = next((a for a in links if 'si00' in a.get('href', '')), None)
+                if link_elem is None:
+                    link_elem = next((a for a in links if a.get('href') is not None), None)
 
                 link = ''
                 gremium = text_nach_zeit[:100] if text_nach_zeit else 'Unbekannt'
 
-                if link_elem:
-                    link = link_elem.get('href', '')
-                    if link and not link.startswith('http'):
-                        # Relativen Link in absoluten umwandeln
-                        base = '/'.join(self.termine_url.split('/')[:-1])
-                        link = f"{base}/{link}"
-                    gremium = link_elem.get_text(strip=True) or gremium
+                if link_elem is not None:
+                    link = self._absoluter_link(link_elem.get('href', ''))
+                    gremium = text_aus_element(link_elem) or gremium
 
                 # Fallback: Link zur Terminübersicht des Monats
                 if not link:
@@ -163,16 +210,14 @@ class SessionNetScraper(BaseScraper):
 
         return termine
 
-    def _extrahiere_termin_aus_text(self, text: str, elem, jahr: int, monat: int) -> Termin | None:
+    def _extrahiere_termin_aus_text(self, text: str, elem) -> Termin | None:
         """Versucht, einen Termin aus einem Textblock zu extrahieren."""
         # Datum-Pattern: "Mo 02.02.2026" oder "02.02.2026"
-        datum_pattern = re.compile(r'(\d{2})\.(\d{2})\.(\d{4})')
-        zeit_pattern = re.compile(r'(\d{1,2}):(\d{2})')
-
-        datum_match = datum_pattern.search(text)
-        zeit_match = zeit_pattern.search(text)
-
-        if not datum_match or not zeit_match:
+        datum_match = DATUM_MUSTER.search(text)
+        if not datum_match:
+            return None
+        zeit_match = ZEIT_MUSTER.search(text)
+        if not zeit_match:
             return None
 
         try:
@@ -189,33 +234,26 @@ class SessionNetScraper(BaseScraper):
         link = ''
         gremium = 'Unbekannt'
 
-        if hasattr(elem, 'find'):
-            # Bevorzugt: SessionNet-Sitzungslink (class="smc_datatype_si")
-            link_elem = elem.find('a', class_='smc_datatype_si')
-            # Alternativ: Link in der Sitzungszelle (class="silink")
-            silink_td = elem.find('td', class_='silink')
-            if not link_elem and silink_td:
-                link_elem = silink_td.find('a', href=True)
-            # Fallback: Erster Link mit nicht-leerem href
-            if not link_elem:
-                for a in elem.find_all('a'):
-                    href = a.get('href', '')
-                    if href and 'si00' in href:
-                        link_elem = a
-                        break
-
-            if link_elem:
-                link = link_elem.get('href', '')
-                gremium = link_elem.get_text(strip=True) or gremium
-                if link and not link.startswith('http'):
-                    base = '/'.join(self.termine_url.split('/')[:-1])
-                    link = f"{base}/{link}"
-
-            # Gremiumsname aus smc-el-h extrahieren, auch wenn kein Link vorhanden
-            if gremium == 'Unbekannt':
-                el_h = silink_td.find('div', class_='smc-el-h') if silink_td else None
-                if el_h:
-                    gremium = el_h.get_text(strip=True) or gremium
+        links = list(elem.iter('a'))
+        # Bevorzugt: SessionNet-Sitzungslink (class="smc_datatype_si")
+        link_elem = next((a for a in links if hat_klasse(a, 'smc_datatype_si')), None)
+        # Alternativ: Link in der Sitzungszelle (class="silink")
+        silink_td = next((td for td in elem.iter('td') if hat_klasse(td, 'silink')), None)
+        if link_elem is None and silink_td is not None:
+            link_elem = next((a for a in silink_td.iter('a') if a.get('href') is not None), None)
+        # Fallback: Erster Link mit si00-URL
+        if link_elem is None:
+            link_elem = next((a for a in links if 'si00' in a.get('href', '')), None)
+
+        if link_elem is not None:
+            link = self._absoluter_link(link_elem.get('href', ''))
+            gremium = text_aus_element(link_elem) or gremium
+
+        # Gremiumsname aus smc-el-h extrahieren, auch wenn kein Link vorhanden
+        if gremium == 'Unbekannt' and silink_td is not None:
+            el_h = next((d for d in silink_td.iter('div') if hat_klasse(d, 'smc-el-h')), None)
+            if el_h is not None:
+                gremium = text_aus_element(el_h) or gremium
 
         # Fallback: Link zur Terminübersicht des Monats
         if not link:
@@ -229,3 +267,11 @@ class SessionNetScraper(BaseScraper):
             ort='',
             link=link
         )
+
+    def _absoluter_link(self, href: str) -> str:
+        """Wandelt einen relativen Sitzungslink in einen absoluten um."""
+        if href and not href.startswith('http'):
+            base = '/'.join(self.termine_url.split('/')[:-1])
+            return f"{base}/{href}"
+        return href
+
@@ -0,0 +1,141 @@
+"""Lokaler SQLite-Speicher aller abgerufenen Termine mit Verlauf."""
+
+import sqlite3
+from datetime import datetime
+from .base import Termin
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS termine (
+    stadt TEXT NOT NULL,
+    datum TEXT NOT NULL,
+    gremium TEXT NOT NULL,
+    link TEXT NOT NULL,
+    uhrzeit TEXT NOT NULL,
+    ort TEXT NOT NULL,
+    abgesagt INTEGER NOT NULL DEFAULT 0,
+    erstmals_gesehen TEXT NOT NULL,
+    zuletzt_gesehen TEXT NOT NULL,
+    PRIMARY KEY (stadt, datum, gremium, link)
+);
+CREATE INDEX IF NOT EXISTS termine_datum ON termine (datum);
+
+-- Letzter erfolgreicher Abruf je Stadt und Monat
+CREATE TABLE IF NOT EXISTS abrufe (
+    stadt TEXT NOT NULL,
+    jahr INTEGER NOT NULL,
+    monat INTEGER NOT NULL,
+    zeitpunkt TEXT NOT NULL,
+    PRIMARY KEY (stadt, jahr, monat)
+);
+"""
+
+ABGESAGT = '[ABGESAGT]'
+
+
+class TerminSpeicher:
+    """Speichert alle abgerufenen Termine in SQLite.
+
+    Ein Termin ist über (stadt, datum, gremium, link) eindeutig; bei jedem
+    erfolgreichen Abruf wird er eingefügt oder aktualisiert (Uhrzeit, Ort,
+    Absage-Status, zuletzt gesehen). Das "[ABGESAGT]"-Präfix wird als Status
+    gespeichert, damit eine Absage denselben Termin aktualisiert.
+
+    Pro Stadt und Monat wird der Zeitpunkt des letzten erfolgreichen Abrufs
+    festgehalten. Die Termine mit genau diesem Zeitpunkt bilden den letzten
+    bekannten Stand, mit dem ein Monat bei einem Ausfall der Quelle
+    gerendert werden kann.
+
+    Nicht threadsicher: nur aus dem koordinierenden Thread verwenden.
+    """
+
+    def __init__(self, pfad: str):
+        self.pfad = pfad
+        self.verbindung = sqlite3.connect(pfad)
+        self.verbindung.executescript(SCHEMA)
+
+    def schliesse(self):
+        self.verbindung.close()
+
+    def speichere_monat(self, jahr: int, monat: int, termine_pro_stadt: dict[str, list[Termin]],
+                        zeitpunkt: datetime | None = None):
+        """Übernimmt die erfolgreichen Abrufe eines Monats (eine Transaktion für alle Städte).
+
+        Args:
+            termine_pro_stadt: Termine jeder erfolgreich abgerufenen Stadt (auch leere Listen)
+        """
+        stand = (zeitpunkt or datetime.now()).isoformat(timespec='seconds')
+        zeilen = []
+        for termine in termine_pro_stadt.values():
+            for t in termine:
+                abgesagt = ABGESAGT in t.gremium
+                gremium = t.gremium.replace(ABGESAGT, '').strip() if abgesagt else t.gremium
+                zeilen.append((t.stadt, t.datum.isoformat(), gremium, t.link, t.uhrzeit, t.ort,
+                               int(abgesagt), stand, stand))
+
+        with self.verbindung:
+            self.verbindung.executemany("""
+                INSERT INTO termine (stadt, datum, gremium, link, uhrzeit, ort, abgesagt,
+                                     erstmals_gesehen, zuletzt_gesehen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (stadt, datum, gremium, link) DO UPDATE SET
+                    uhrzeit = excluded.uhrzeit,
+                    ort = excluded.ort,
+                    abgesagt = excluded.abgesagt,
+                    zuletzt_gesehen = excluded.zuletzt_gesehen
+            """, zeilen)
+            self.verbindung.executemany("""
+                INSERT INTO abrufe (stadt, jahr, monat, zeitpunkt) VALUES (?, ?, ?, ?)
+                ON CONFLICT (stadt, jahr, monat) DO UPDATE SET zeitpunkt = excluded.zeitpunkt
+            """, [(stadt, jahr, monat, stand) for stadt in termine_pro_stadt])
+
+    def letzter_abruf(self, stadt: str, jahr: int, monat: int) -> datetime | None:
+        """Zeitpunkt des letzten erfolgreichen Abrufs (None, falls es keinen gab)."""
+        zeile = self.verbindung.execute(
+            "SELECT zeitpunkt FROM abrufe WHERE stadt = ? AND jahr = ? AND monat = ?",
+            (stadt, jahr, monat)).fetchone()
+        return datetime.fromisoformat(zeile[0]) if zeile else None
+
+    def letzter_stand(self, stadt: str, jahr: int, monat: int) -> list[Termin] | None:
+        """Termine einer Stadt im Monat aus dem letzten erfolgreichen Abruf.
+
+        Returns:
+            Termine (ggf. leer) oder None, falls der Monat nie erfolgreich abgerufen wurde
+        """
+        zeitpunkt = self.letzter_abruf(stadt, jahr, monat)
+        if zeitpunkt is None:
+            return None
+        von, bis = _monatsgrenzen(jahr, monat)
+        return self._termine("""
+            SELECT stadt, datum, uhrzeit, gremium, ort, link, abgesagt FROM termine
+            WHERE stadt = ? AND datum >= ? AND datum < ? AND zuletzt_gesehen = ?
+            ORDER BY datum
+        """, (stadt, von, bis, zeitpunkt.isoformat(timespec='seconds')))
+
+    def abfrage(self, von: datetime, bis: datetime, staedte: list[str] | None = None) -> list[Termin]:
+        """Alle gespeicherten Termine mit von <= datum < bis, optional nur für bestimmte Städte.
+
+        Beispiel: alle Sitzungen im Kreis Warendorf im zweiten Quartal
+            speicher.abfrage(datetime(2026, 4, 1), datetime(2026, 7, 1),
+                             [s.name for s in STAEDTE if s.kreis == Kreis.WARENDORF])
+        """
+        sql = """SELECT stadt, datum, uhrzeit, gremium, ort, link, abgesagt FROM termine
+                 WHERE datum >= ? AND datum < ?"""
+        parameter = [von.isoformat(), bis.isoformat()]
+        if staedte is not None:
+            sql += f" AND stadt IN ({', '.join('?' * len(staedte))})"
+            parameter.extend(staedte)
+        return self._termine(sql + " ORDER BY datum", parameter)
+
+    def _termine(self, sql: str, parameter) -> list[Termin]:
+        return [
+            Termin(stadt=stadt, datum=datetime.fromisoformat(datum), uhrzeit=uhrzeit,
+                   gremium=f"{ABGESAGT} {gremium}" if abgesagt else gremium, ort=ort, link=link)
+            for stadt, datum, uhrzeit, gremium, ort, link, abgesagt in self.verbindung.execute(sql, parameter)
+        ]
+
+
+def _monatsgrenzen(jahr: int, monat: int) -> tuple[str, str]:
+    """ISO-Grenzen [von, bis) eines Monats für Vergleiche in SQL."""
+    bis = (jahr + 1, 1) if monat == 12 else (jahr, monat + 1)
+    return datetime(jahr, monat, 1).isoformat(), datetime(*bis, 1).isoformat()
@@ -0,0 +1,188 @@
+"""Statischer Suchindex über alle Monate (Gremium, Stadt, Ort) für die Suche im Browser (suche.js)."""
+
+import json
+import os
+import re
+
+from .cache import _schreibe_atomar
+
+
+# Erhöhen, wenn sich Aufbau oder Wortzerlegung ändern; der Index wird dann neu aufgebaut
+VERSION = 1
+
+# Wörter aus Buchstaben und Ziffern (wie /[\p{L}\p{N}]+/u in suche.js)
+WORT_MUSTER = re.compile(r'[^\W_]+')
+# Zu häufig, um bei der Suche zu helfen; suche.js ignoriert dieselben Wörter
+STOPPWOERTER = frozenset({
+    'am', 'an', 'auf', 'bzw', 'das', 'dem', 'den', 'der', 'des', 'die', 'für',
+    'im', 'in', 'mit', 'und', 'vom', 'von', 'zu', 'zum', 'zur',
+})
+ABGESAGT = '[ABGESAGT]'
+# Dateirechte der Shards: werden wie die Seiten veröffentlicht
+DATEI_MODUS = 0o644
+# Spätestens nach so vielen vorgemerkten Monaten werden die Shards geschrieben
+# (begrenzt den Speicher bei --archiv)
+MAX_VORGEMERKT = 12
+
+
+def woerter(text: str) -> set[str]:
+    """Die indizierten Wörter eines Feldes: klein geschrieben, ab zwei Zeichen, ohne Stoppwörter."""
+    return {w for w in WORT_MUSTER.findall(text.replace(ABGESAGT, '').lower())
+            if len(w) >= 2 and w not in STOPPWOERTER}
+
+
+def trigramme(wort: str) -> set[str]:
+    return {wort[i:i + 3] for i in range(len(wort) - 2)}
+
+
+def shard_name(wort: str, laenge: int) -> str:
+    """Dateiname-sicherer Shard-Schlüssel aus den ersten laenge Zeichen (Umlaute z.B. als _fc)."""
+    return ''.join(c if c.isascii() and c.isalnum() else f'_{ord(c):x}' for c in wort[:laenge])
+
+
+class SuchIndex:
+    """Invertierter Index über Gremium, Stadt und Ort aller Termine, als statische JSON-Shards.
+
+    Zwei Arten von Shards liegen im Verzeichnis:
+
+    - w_XX.json: Wörter mit den ersten zwei Zeichen XX → {Monat: [Positionen]},
+      Positionen im termine_JJJJ_MM.json des Monats (JSON-Export)
+    - n_X.json: Trigramme mit erstem Zeichen X → [Wörter], für die Suche nach
+      Wortteilen ("ausschuss" findet "Bauausschuss")
+
+    Der Browser lädt pro Suchbegriff nur die passenden Shards. index.json
+    hält pro Monat den Fingerprint seines JSON-Exports und die Wort-Shards,
+    in denen er vorkommt; neu indiziert werden nur Monate, deren Fingerprint
+    sich geändert hat, und geschrieben nur die davon betroffenen Shards.
+
+    Nicht threadsicher: nur aus dem koordinierenden Thread verwenden.
+
+    Args:
+        verzeichnis: Ablage der Shards (neben den Seiten, z.B. suche/)
+    """
+
+    def __init__(self, verzeichnis: str):
+        self.verzeichnis = verzeichnis
+        os.makedirs(verzeichnis, exist_ok=True)
+        self.manifest = self._lade('index.json')
+        if self.manifest.get('version') != VERSION:
+            # Neuaufbau: Shards einer anderen Version enthalten alle Monate
+            for name in os.listdir(verzeichnis):
+                if name.startswith(('w_', 'n_')):
+                    self._entferne(name)
+            self.manifest = {'version': VERSION, 'monate': {}}
+        # Monat → (Fingerprint, {Wort: [Positionen]}), bis zum nächsten schreibe()
+        self._vorgemerkt: dict[str, tuple[str, dict[str, list[int]]]] = {}
+        self.neu_indiziert = 0
+        self.geschrieben: list[str] = []
+
+    def aktualisiere(self, jahr: int, monat: int, fingerprint: str, zeilen: list[tuple[str, ...]]) -> bool:
+        """Merkt einen Monat zur Neuindizierung vor, falls sich sein Fingerprint geändert hat.
+
+        Args:
+            fingerprint: Fingerprint des JSON-Exports des Monats
+            zeilen: (gremium, stadt, ort) jedes Termins, in der Reihenfolge des JSON-Exports
+
+        Returns:
+            True, wenn der Monat neu indiziert wird
+        """
+        schluessel = f"{jahr}_{monat:02d}"
+        if schluessel in self._vorgemerkt:
+            bisher = self._vorgemerkt[schluessel][0]
+        else:
+            bisher = self.manifest['monate'].get(schluessel, {}).get('fingerprint')
+        if bisher == fingerprint:
+            return False
+
+        positionen: dict[str, list[int]] = {}
+        for i, felder in enumerate(zeilen):
+            for wort in set().union(*map(woerter, felder)):
+                positionen.setdefault(wort, []).append(i)
+        self._vorgemerkt[schluessel] = (fingerprint, positionen)
+        self.neu_indiziert += 1
+        if len(self._vorgemerkt) >= MAX_VORGEMERKT:
+            self.schreibe()
+        return True
+
+    def schreibe(self):
+        """Überträgt alle vorgemerkten Monate in die betroffenen Shards und das Manifest."""
+        if not self._vorgemerkt:
+            return
+        monate = self._vorgemerkt
+        self._vorgemerkt = {}
+
+        # Neue Einträge pro Wort-Shard; betroffen sind auch die Shards, in
+        # denen die Monate bisher vorkamen (dort werden sie entfernt)
+        neu: dict[str, dict[str, dict[str, list[int]]]] = {}
+        betroffen = set()
+        for schluessel, (_, positionen) in monate.items():
+            betroffen.update(self.manifest['monate'].get(schluessel, {}).get('shards', []))
+            for wort, liste in positionen.items():
+                neu.setdefault(shard_name(wort, 2), {}).setdefault(wort, {})[schluessel] = liste
+        betroffen.update(neu)
+
+        hinzu, weg = set(), set()
+        for shard in sorted(betroffen):
+            daten = self._lade(f'w_{shard}.json')
+            vorher = set(daten)
+            for wort in vorher:
+                eintraege = daten[wort]
+                for schluessel in monate:
+                    eintraege.pop(schluessel, None)
+                if not eintraege:
+                    del daten[wort]
+            for wort, eintraege in neu.get(shard, {}).items():
+                daten.setdefault(wort, {}).update(eintraege)
+            hinzu |= daten.keys() - vorher
+            weg |= vorher - daten.keys()
+            self._speichere(f'w_{shard}.json', {wort: dict(sorted(daten[wort].items())) for wort in sorted(daten)})
+
+        # Trigramm-Shards nur für Wörter, die neu im Index sind oder ganz herausfallen
+        aenderungen: dict[str, list[tuple[str, str, bool]]] = {}
+        for wort, dazu in [(w, True) for w in hinzu] + [(w, False) for w in weg]:
+            for gramm in trigramme(wort):
+                aenderungen.setdefault(shard_name(gramm, 1), []).append((gramm, wort, dazu))
+        for shard, eintraege in sorted(aenderungen.items()):
+            daten = {gramm: set(liste) for gramm, liste in self._lade(f'n_{shard}.json').items()}
+            for gramm, wort, dazu in eintraege:
+                if dazu:
+                    daten.setdefault(gramm, set()).add(wort)
+                else:
+                    daten.get(gramm, set()).discard(wort)
+            self._speichere(f'n_{shard}.json', {gramm: sorted(daten[gramm]) for gramm in sorted(daten) if daten[gramm]})
+
+        for schluessel, (fingerprint, positionen) in monate.items():
+            self.manifest['monate'][schluessel] = {
+                'fingerprint': fingerprint,
+                'shards': sorted({shard_name(wort, 2) for wort in positionen}),
+            }
+        self.manifest['monate'] = dict(sorted(self.manifest['monate'].items()))
+        self._speichere('index.json', self.manifest)
+
+    def _lade(self, name: str) -> dict:
+        try:
+            with open(os.path.join(self.verzeichnis, name), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _speichere(self, name: str, daten: dict):
+        """Schreibt einen Shard (ein leerer wird gelöscht, samt .gz/.br von --komprimiert)."""
+        if not daten:
+            self._entferne(name)
+            return
+        pfad = os.path.join(self.verzeichnis, name)
+        _schreibe_atomar(pfad, json.dumps(daten, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                         DATEI_MODUS)
+        if pfad not in self.geschrieben:
+            self.geschrieben.append(pfad)
+
+    def _entferne(self, name: str):
+        pfad = os.path.join(self.verzeichnis, name)
+        for datei in (pfad, pfad + '.gz', pfad + '.br'):
+            try:
+                os.remove(datei)
+            except FileNotFoundError:
+                pass
+        if pfad in self.geschrieben:
+            self.geschrieben.remove(pfad)
@@ -0,0 +1,61 @@
+function filterTermine() {
+    // Alle ausgewählten Städte aus allen Dropdowns sammeln
+    const selects = document.querySelectorAll('.kreis-filter');
+    const gewaehlteStaedte = [];
+
+    selects.forEach(select => {
+        if (select.value) {
+            gewaehlteStaedte.push(select.value);
+        }
+    });
+
+    // Termine filtern
+    const termine = document.querySelectorAll('.termin');
+    let sichtbar = 0;
+
+    termine.forEach(t => {
+        const zeigen = gewaehlteStaedte.length === 0 ||
+                       gewaehlteStaedte.includes(t.dataset.stadt);
+        t.classList.toggle('hidden', !zeigen);
+        if (zeigen) sichtbar++;
+    });
+
+    document.getElementById('termine-count').textContent = sichtbar;
+
+    // Leere Datum-Gruppen ausblenden
+    document.querySelectorAll('.datum-gruppe').forEach(g => {
+        const sichtbareTermine = g.querySelectorAll('.termin:not(.hidden)');
+        g.classList.toggle('hidden', sichtbareTermine.length === 0);
+    });
+
+    // Aktive Filter als Tags anzeigen
+    updateFilterTags(gewaehlteStaedte);
+}
+
+function updateFilterTags(staedte) {
+    const container = document.getElementById('active-filters');
+    if (staedte.length === 0) {
+        container.innerHTML = '';
+        return;
+    }
+    container.innerHTML = staedte.map(stadt =>
+        `<span class="filter-tag">${stadt}<button onclick="removeFilter('${stadt}')">&times;</button></span>`
+    ).join('');
+}
+
+function removeFilter(stadt) {
+    // Finde das Dropdown mit dieser Stadt und setze es zurück
+    document.querySelectorAll('.kreis-filter').forEach(select => {
+        if (select.value === stadt) {
+            select.value = '';
+        }
+    });
+    filterTermine();
+}
+
+function resetFilter() {
+    document.querySelectorAll('.kreis-filter').forEach(select => {
+        select.value = '';
+    });
+    filterTermine();
+}
@@ -0,0 +1,111 @@
+// Client-seitiges Rendern (app.py --client): Die Termine kommen aus
+// termine_JJJJ_MM.json und werden aus einem Index pro Stadt gerendert.
+// Ersetzt filterTermine() aus app.js; die übrigen Filter-Funktionen bleiben.
+
+const WOCHENTAGE = ['So', 'Mo', 'Di', 'Mi', 'Do', 'Fr', 'Sa'];
+
+let daten = null;   // {staedte: [...], termine: [[datum, uhrzeit, stadt, gremium, ort, link], ...]}
+let index = null;   // Map: Stadt → Positionen in daten.termine (aufsteigend)
+
+function escapeHtml(text) {
+    return text.replace(/[&<>"']/g, c => ({
+        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+    })[c]);
+}
+
+function datumFormatiert(datum) {
+    const [jahr, monat, tag] = datum.split('-');
+    const wt = WOCHENTAGE[new Date(jahr, monat - 1, tag).getDay()];
+    return `${wt}, ${tag}.${monat}.${jahr}`;
+}
+
+function terminHtml(t, kiUrl) {
+    const [, uhrzeit, stadtIndex, gremium, ort, link] = t;
+    const stadt = escapeHtml(daten.staedte[stadtIndex]);
+    const abgesagt = gremium.includes('[ABGESAGT]');
+    const gremiumClean = escapeHtml(gremium.replace('[ABGESAGT]', '').trim());
+    const kiButton = link.trim()
+        ? ` <a href="${kiUrl}${encodeURIComponent(link).replace(/%2F/g, '/')}" class="ki-btn" title="Dokumente mit KI analysieren" target="_blank">🔍</a>`
+        : '';
+    const ortHtml = ort ? `<div class="termin-ort">${escapeHtml(ort)}</div>` : '';
+    return `<div class="termin${abgesagt ? ' abgesagt' : ''}" data-stadt="${stadt}">` +
+        `<div class="termin-zeit">${escapeHtml(uhrzeit)}</div><div class="termin-info">` +
+        `<div class="termin-gremium"><a href="${escapeHtml(link)}" target="_blank">${gremiumClean}</a>${kiButton}</div>` +
+        `<div class="termin-stadt">${stadt}</div>${ortHtml}</div></div>`;
+}
+
+function renderTermine(positionen) {
+    const container = document.getElementById('termine-container');
+    if (positionen.length === 0) {
+        container.innerHTML = '<div class="keine-termine">Keine Termine gefunden</div>';
+        return;
+    }
+
+    // Positionen sind nach Datum sortiert: Gruppen beim Datumswechsel schließen
+    const kiUrl = container.dataset.kiUrl;
+    const teile = [];
+    let aktuellesDatum = null;
+    for (const i of positionen) {
+        const t = daten.termine[i];
+        if (t[0] !== aktuellesDatum) {
+            if (aktuellesDatum !== null) {
+                teile.push('</div><div class="zurueck-link"><a href="#kalender">↑ Kalender</a></div></div>');
+            }
+            aktuellesDatum = t[0];
+            teile.push(`<div class="datum-gruppe" id="datum-${t[0]}">` +
+                `<div class="datum-header">${datumFormatiert(t[0])}</div><div class="termine-liste">`);
+        }
+        teile.push(terminHtml(t, kiUrl));
+    }
+    teile.push('</div><div class="zurueck-link"><a href="#kalender">↑ Kalender</a></div></div>');
+    container.innerHTML = teile.join('');
+}
+
+function filterTermine() {
+    const gewaehlteStaedte = Array.from(document.querySelectorAll('.kreis-filter'))
+        .map(select => select.value)
+        .filter(Boolean);
+    if (!daten) {
+        return;
+    }
+
+    let positionen;
+    if (gewaehlteStaedte.length === 0) {
+        positionen = daten.termine.map((_, i) => i);
+    } else {
+        positionen = gewaehlteStaedte.flatMap(stadt => index.get(stadt) || []);
+        positionen.sort((a, b) => a - b);
+    }
+
+    renderTermine(positionen);
+    document.getElementById('termine-count').textContent = positionen.length;
+    updateFilterTags(gewaehlteStaedte);
+}
+
+async function ladeTermine() {
+    const container = document.getElementById('termine-container');
+    try {
+        const antwort = await fetch(container.dataset.quelle);
+        daten = await antwort.json();
+    } catch (e) {
+        container.innerHTML = '<div class="keine-termine">Termine konnten nicht geladen werden</div>';
+        return;
+    }
+
+    index = new Map();
+    daten.termine.forEach((t, i) => {
+        const stadt = daten.staedte[t[2]];
+        if (!index.has(stadt)) {
+            index.set(stadt, []);
+        }
+        index.get(stadt).push(i);
+    });
+    filterTermine();
+
+    // Sprung zum Datum aus dem Kalender erst nach dem Rendern möglich
+    if (location.hash) {
+        document.getElementById(location.hash.slice(1))?.scrollIntoView();
+    }
+}
+
+document.addEventListener('DOMContentLoaded', ladeTermine);
@@ -0,0 +1,161 @@
+// Suche über alle Monate (app.py --suche): Der Index liegt als statische
+// Shards in suche/ (siehe scraper/suchindex.py). Pro Suchbegriff werden nur
+// die passenden Shards geladen, danach die termine_JJJJ_MM.json der Monate
+// mit Treffern.
+
+// Wie STOPPWOERTER in scraper/suchindex.py
+const SUCHE_STOPPWOERTER = new Set([
+    'am', 'an', 'auf', 'bzw', 'das', 'dem', 'den', 'der', 'des', 'die', 'für',
+    'im', 'in', 'mit', 'und', 'vom', 'von', 'zu', 'zum', 'zur',
+]);
+const SUCHE_MAX_TREFFER = 50;
+
+const sucheDateien = new Map();   // URL → Promise des JSON-Inhalts ({} wenn nicht vorhanden)
+
+function ladeJson(url) {
+    if (!sucheDateien.has(url)) {
+        // no-cache: Shards und Monate ändern sich mit jedem Lauf, der sie neu schreibt
+        sucheDateien.set(url, fetch(url, {cache: 'no-cache'})
+            .then(antwort => antwort.ok ? antwort.json() : {})
+            .catch(() => ({})));
+    }
+    return sucheDateien.get(url);
+}
+
+// Wie woerter() in scraper/suchindex.py
+function sucheWoerter(text) {
+    return (text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [])
+        .filter(w => w.length >= 2 && !SUCHE_STOPPWOERTER.has(w));
+}
+
+// Wie shard_name() in scraper/suchindex.py
+function shardName(wort, laenge) {
+    return Array.from(wort).slice(0, laenge)
+        .map(c => /^[a-z0-9]$/.test(c) ? c : '_' + c.codePointAt(0).toString(16))
+        .join('');
+}
+
+// Indizierte Wörter, die den Begriff enthalten: ab drei Zeichen über die
+// Trigramme (auch mitten im Wort), sonst als Wortanfang
+async function passendeWoerter(basis, begriff) {
+    const zeichen = Array.from(begriff);
+    if (zeichen.length < 3) {
+        const shard = await ladeJson(`${basis}w_${shardName(begriff, 2)}.json`);
+        return Object.keys(shard).filter(w => w.startsWith(begriff));
+    }
+    const gramme = new Set();
+    for (let i = 0; i + 3 <= zeichen.length; i++) {
+        gramme.add(zeichen.slice(i, i + 3).join(''));
+    }
+    const listen = await Promise.all([...gramme].map(async g =>
+        new Set((await ladeJson(`${basis}n_${shardName(g, 1)}.json`))[g] || [])));
+    listen.sort((a, b) => a.size - b.size);
+    return [...listen[0]].filter(w => w.includes(begriff) && listen.every(l => l.has(w)));
+}
+
+// Treffer eines Begriffs: Map Monat (JJJJ_MM) → Set der Positionen im JSON des Monats
+async function trefferFuer(basis, begriff) {
+    const woerter = await passendeWoerter(basis, begriff);
+    const shards = await Promise.all(woerter.map(w => ladeJson(`${basis}w_${shardName(w, 2)}.json`)));
+    const treffer = new Map();
+    woerter.forEach((wort, i) => {
+        for (const [monat, positionen] of Object.entries(shards[i][wort] || {})) {
+            if (!treffer.has(monat)) {
+                treffer.set(monat, new Set());
+            }
+            positionen.forEach(p => treffer.get(monat).add(p));
+        }
+    });
+    return treffer;
+}
+
+// Termine, in denen alle Begriffe vorkommen (Gremium, Kommune oder Ort),
+// neueste Monate zuerst; null, wenn der Text keinen Suchbegriff enthält
+async function sucheTermine(basis, text) {
+    const begriffe = [...new Set(sucheWoerter(text))];
+    if (begriffe.length === 0) {
+        return null;
+    }
+    const [erste, ...rest] = await Promise.all(begriffe.map(b => trefferFuer(basis, b)));
+
+    const treffer = [];
+    let anzahl = 0;
+    for (const monat of [...erste.keys()].sort().reverse()) {
+        const positionen = [...erste.get(monat)]
+            .filter(p => rest.every(t => t.get(monat)?.has(p)))
+            .sort((a, b) => a - b);
+        anzahl += positionen.length;
+        if (positionen.length === 0 || treffer.length >= SUCHE_MAX_TREFFER) {
+            continue;
+        }
+        const daten = await ladeJson(`termine_${monat}.json`);
+        for (const p of positionen.slice(0, SUCHE_MAX_TREFFER - treffer.length)) {
+            const termin = daten.termine?.[p];
+            if (termin) {
+                treffer.push({monat, stadt: daten.staedte[termin[2]], termin});
+            }
+        }
+    }
+    return {treffer, anzahl};
+}
+
+function sucheSpan(klasse, text) {
+    const span = document.createElement('span');
+    span.className = klasse;
+    span.textContent = text;
+    return span;
+}
+
+function zeigeSuchergebnis(container, ergebnis) {
+    container.replaceChildren();
+    if (ergebnis === null) {
+        return;
+    }
+    const {treffer, anzahl} = ergebnis;
+    for (const {monat, stadt, termin} of treffer) {
+        const [datum, uhrzeit, , gremium, ort] = termin;
+        const [jahr, mon, tag] = datum.split('-');
+        const link = document.createElement('a');
+        link.className = 'suche-treffer';
+        link.href = `termine_${monat}.html#datum-${datum}`;
+        link.append(sucheSpan('suche-datum', `${tag}.${mon}.${jahr} ${uhrzeit}`),
+                    sucheSpan('suche-gremium', gremium),
+                    sucheSpan('suche-stadt', ort ? `${stadt}, ${ort}` : stadt));
+        container.append(link);
+    }
+    if (anzahl === 0) {
+        container.append(sucheSpan('suche-hinweis', 'Keine Treffer'));
+    } else if (anzahl > treffer.length) {
+        container.append(sucheSpan('suche-hinweis', `${anzahl} Treffer, die neuesten ${treffer.length} angezeigt`));
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    const eingabe = document.getElementById('suche-eingabe');
+    if (!eingabe) {
+        return;
+    }
+    const basis = eingabe.closest('.suche-container').dataset.index;
+    const container = document.getElementById('suche-ergebnisse');
+    let timer = null;
+    let nummer = 0;
+
+    eingabe.addEventListener('input', () => {
+        clearTimeout(timer);
+        timer = setTimeout(async () => {
+            // Antworten älterer Eingaben verwerfen
+            const aktuell = ++nummer;
+            const ergebnis = await sucheTermine(basis, eingabe.value);
+            if (aktuell === nummer) {
+                zeigeSuchergebnis(container, ergebnis);
+            }
+        }, 200);
+    });
+    eingabe.addEventListener('keydown', e => {
+        if (e.key === 'Escape') {
+            eingabe.value = '';
+            nummer++;
+            container.replaceChildren();
+        }
+    });
+});